@@ -40,9 +40,14 @@ class Settings:
     REDIS_PASSWORD: str = os.getenv("REDIS_PASSWORD", "")
     REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
     
+    # Database Pool Sizing (defaults scale with CPU cores)
+    DB_POOL_MIN: int = int(os.getenv("DB_POOL_MIN", str(max(5, os.cpu_count() or 1))))
+    DB_POOL_MAX: int = int(os.getenv("DB_POOL_MAX", str(max(20, 4 * (os.cpu_count() or 1)))))
+    
     # Performance Settings
     MAX_CONCURRENT_DOWNLOADS: int = int(os.getenv("MAX_CONCURRENT_DOWNLOADS", "5"))
     MAX_CONCURRENT_UPLOADS: int = int(os.getenv("MAX_CONCURRENT_UPLOADS", "5"))  # Increased for faster throughput
+    MAX_CONCURRENT_PIPELINES: int = int(os.getenv("MAX_CONCURRENT_PIPELINES", "4"))  # Download+upload jobs in flight
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "524288"))  # 512KB (max allowed by Telethon)
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "2147483648"))  # 2GB
     
@@ -9,7 +9,7 @@ import time
 from typing import Dict, Any, Optional
 from telegram import Update
 from telegram.ext import (
-    Application, CommandHandler, MessageHandler, CallbackQueryHandler,
+    Application, MessageHandler, CallbackQueryHandler,
     filters, ContextTypes
 )
 
@@ -25,7 +25,7 @@ from handlers.callbacks import CallbackHandlers
 from handlers.messages import MessageHandlers
 from middlewares.auth import AuthMiddleware
 from middlewares.rate_limit import RateLimitMiddleware
-from utils.helpers import create_error_message
+from utils.helpers import create_error_message, close_http_session, get_system_stats
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +45,7 @@ class VideoDownloaderBot:
         self.command_handlers: Optional[CommandHandlers] = None
         self.callback_handlers: Optional[CallbackHandlers] = None
         self.message_handlers: Optional[MessageHandlers] = None
+        self._command_table: Dict[str, Any] = {}
         
         # Middleware
         self.auth_middleware: Optional[AuthMiddleware] = None
@@ -54,6 +55,10 @@ class VideoDownloaderBot:
         self.active_downloads: Dict[str, Any] = {}
         self.active_uploads: Dict[str, Any] = {}
         
+        # Periodic system_stats sampling (buffered and flushed by the database manager)
+        self._stats_task: Optional[asyncio.Task] = None
+        self.stats_sample_interval = 30
+        
     async def initialize(self):
         """Initialize all bot components"""
         logger.info("🔧 Initializing bot components...")
@@ -129,7 +134,8 @@ class VideoDownloaderBot:
         self.message_handlers = MessageHandlers(
             self.downloader,
             self.cache_manager,
-            self.progress_tracker
+            self.progress_tracker,
+            preview_sink=self.callback_handlers.remember_video_info
         )
         
         logger.info("✅ Handlers initialized")
@@ -167,24 +173,17 @@ class VideoDownloaderBot:
     
     async def _register_handlers(self):
         """Register all bot handlers with middleware"""
-        # Command handlers
-        self.application.add_handler(
-            CommandHandler("start", self._with_middleware(self.command_handlers.start_command))
-        )
-        self.application.add_handler(
-            CommandHandler("help", self._with_middleware(self.command_handlers.help_command))
-        )
-        self.application.add_handler(
-            CommandHandler("stats", self._with_middleware(self.command_handlers.stats_command))
-        )
-        self.application.add_handler(
-            CommandHandler("status", self._with_middleware(self.command_handlers.status_command))
-        )
-        self.application.add_handler(
-            CommandHandler("cancel", self._with_middleware(self.command_handlers.cancel_command))
-        )
+        # Command handlers: one handler parses the command once and dispatches via table
+        self._command_table = {
+            "start": self._with_middleware(self.command_handlers.start_command),
+            "help": self._with_middleware(self.command_handlers.help_command),
+            "stats": self._with_middleware(self.command_handlers.stats_command),
+            "status": self._with_middleware(self.command_handlers.status_command),
+            "cancel": self._with_middleware(self.command_handlers.cancel_command),
+            "settings": self._with_middleware(self.command_handlers.settings_command),
+        }
         self.application.add_handler(
-            CommandHandler("settings", self._with_middleware(self.command_handlers.settings_command))
+            MessageHandler(filters.COMMAND, self._dispatch_command)
         )
         
         # Message handlers  
@@ -204,6 +203,22 @@ class VideoDownloaderBot:
         
         logger.info("✅ All handlers registered")
     
+    async def _dispatch_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Route a /command to its handler with a single parse and dict lookup"""
+        message = update.effective_message
+        if not message or not message.text:
+            return
+        
+        parts = message.text.split()
+        command, _, bot_name = parts[0][1:].partition('@')
+        if bot_name and bot_name.lower() != (context.bot.username or '').lower():
+            return
+        
+        handler = self._command_table.get(command.lower())
+        if handler:
+            context.args = parts[1:]
+            await handler(update, context)
+    
     def _with_middleware(self, handler):
         """Ultra-fast middleware wrapper"""
         async def wrapped_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -283,6 +298,8 @@ class VideoDownloaderBot:
             
             logger.info("✅ Bot is now running and ready to receive messages!")
             
+            self._stats_task = asyncio.create_task(self._system_stats_loop())
+            
             # Keep the bot running
             try:
                 # In Replit, we don't want to block, just keep alive
@@ -302,6 +319,15 @@ class VideoDownloaderBot:
         if self.application:
             await self.application.shutdown()
         
+        if self._stats_task:
+            self._stats_task.cancel()
+            await asyncio.gather(self._stats_task, return_exceptions=True)
+            self._stats_task = None
+        
+        # Cancel in-flight download pipelines before closing their services
+        if self.callback_handlers:
+            await self.callback_handlers.stop()
+        
         # Cleanup services
         if self.telethon_manager:
             await self.telethon_manager.disconnect()
@@ -312,8 +338,29 @@ class VideoDownloaderBot:
         if self.cache_manager:
             await self.cache_manager.close()
         
+        await close_http_session()
+        
         logger.info("✅ Bot stopped successfully")
     
+    async def _system_stats_loop(self):
+        """Periodically sample host and pipeline metrics into system_stats"""
+        while True:
+            await asyncio.sleep(self.stats_sample_interval)
+            try:
+                # get_system_stats blocks for a second measuring CPU, so keep it off the event loop
+                system_stats = await asyncio.to_thread(get_system_stats)
+                self.db_manager.record_system_stats(
+                    cpu_usage=system_stats.get('cpu_percent'),
+                    memory_usage=system_stats.get('memory_percent'),
+                    disk_usage=system_stats.get('disk_percent'),
+                    database_connected=self.db_manager.is_initialized,
+                    redis_connected=self.cache_manager.is_connected,
+                    telethon_connected=self.telethon_manager.is_connected,
+                    **self.callback_handlers.get_pipeline_stats()
+                )
+            except Exception as e:
+                logger.error(f"❌ Failed to sample system stats: {e}")
+    
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get current performance statistics"""
         return {
@@ -25,6 +25,12 @@ class TelethonManager:
         self.upload_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_UPLOADS)
         self.fast_telethon_available = False
         
+        # Upload limits resolved once (settings never change at runtime)
+        self._max_upload_bytes = settings.MAX_FILE_SIZE
+        self._max_upload_size_str = format_file_size(self._max_upload_bytes)
+        self._upload_workers = getattr(settings, 'UPLOAD_WORKERS', 16)
+        self._use_fast_telethon = settings.USE_FAST_TELETHON
+        
         # Performance tracking
         self.upload_stats: Dict[str, Any] = {}
         
@@ -48,7 +54,7 @@ class TelethonManager:
             logger.info("✅ Telethon client initialized successfully")
             
         except Exception as e:
-            logger.error(f"❌ Telethon initialization failed: {e}", exc_info=True)
+            logger.error("❌ Telethon initialization failed: %s", e, exc_info=True)
             raise
     
     async def _check_fast_telethon(self):
@@ -71,7 +77,7 @@ class TelethonManager:
                 self.fast_telethon_available = True
                 logger.info("🚀 FastTelethon enabled for enhanced performance")
         except Exception as e:
-            logger.warning(f"⚠️ FastTelethon check failed: {e}, using optimized standard Telethon")
+            logger.warning("⚠️ FastTelethon check failed: %s, using optimized standard Telethon", e)
             self.fast_telethon_available = False
     
     async def _create_client(self):
@@ -98,6 +104,9 @@ class TelethonManager:
             sequential_updates=False,  # Allow parallel updates
             receive_updates=False  # Disable updates for upload-only client
         )
+        
+        # Captions are always HTML; resolve the parser once instead of per send_file call
+        self.client.parse_mode = 'html'
     
     async def _connect_and_auth(self):
         """Connect and authenticate the client"""
@@ -113,7 +122,7 @@ class TelethonManager:
         
         # Get client info
         me = await self.client.get_me()
-        logger.info(f"✅ Connected as: {me.first_name} (@{me.username})")
+        logger.info("✅ Connected as: %s (@%s)", me.first_name, me.username)
         
         self.is_connected = True
     
@@ -123,7 +132,7 @@ class TelethonManager:
         async def raw_handler(event):
             # Monitor for connection issues
             if hasattr(event, 'error'):
-                logger.warning(f"Telethon event error: {event.error}")
+                logger.warning("Telethon event error: %s", event.error)
     
     async def upload_file(
         self,
@@ -143,10 +152,10 @@ class TelethonManager:
                     raise FileNotFoundError(f"File not found: {file_path}")
                 
                 file_size = os.path.getsize(file_path)
-                if file_size > settings.MAX_FILE_SIZE:
-                    raise ValueError(f"File too large: {format_file_size(file_size)}")
+                if file_size > self._max_upload_bytes:
+                    raise ValueError(f"File too large: {format_file_size(file_size)} > {self._max_upload_size_str}")
                 
-                logger.info(f"📤 Starting upload: {os.path.basename(file_path)} ({format_file_size(file_size)})")
+                logger.info("📤 Starting upload: %s (%s)", os.path.basename(file_path), format_file_size(file_size))
                 
                 # Prepare upload attributes
                 attributes = await self._prepare_attributes(file_path, video_metadata)
@@ -167,15 +176,14 @@ class TelethonManager:
                     caption=caption,
                     attributes=attributes,
                     thumb=thumbnail,
-                    force_document=False,  # Always send as video/media, not as document
-                    parse_mode='HTML'
+                    force_document=False  # Always send as video/media, not as document
                 )
                 
-                logger.info(f"✅ Upload completed: {os.path.basename(file_path)}")
+                logger.info("✅ Upload completed: %s", os.path.basename(file_path))
                 return message
                 
             except Exception as e:
-                logger.error(f"❌ Upload failed for {file_path}: {e}", exc_info=True)
+                logger.error("❌ Upload failed for %s: %s", file_path, e, exc_info=True)
                 raise
     
     async def _upload_with_progress(
@@ -186,13 +194,13 @@ class TelethonManager:
     ):
         """Upload file with progress tracking and optimization"""
         
-        if self.fast_telethon_available and settings.USE_FAST_TELETHON:
+        if self.fast_telethon_available and self._use_fast_telethon:
             # Use FastTelethon with ultra-optimized settings
             return await fast_upload(
                 self.client,
                 file_path,
                 progress_callback=progress_callback,
-                workers=getattr(settings, 'UPLOAD_WORKERS', 16),  # More workers for speed
+                workers=self._upload_workers,  # More workers for speed
                 part_size_kb=512  # 512KB parts (max allowed)
             )
         else:
@@ -233,7 +241,7 @@ class TelethonManager:
         High-performance media download
         """
         try:
-            logger.info(f"📥 Starting download to: {file_path}")
+            logger.info("📥 Starting download to: %s", file_path)
             
             if self.fast_telethon_available:
                 # Use FastTelethon for enhanced download speed
@@ -252,7 +260,7 @@ class TelethonManager:
                 )
                 
         except Exception as e:
-            logger.error(f"❌ Download failed: {e}", exc_info=True)
+            logger.error("❌ Download failed: %s", e, exc_info=True)
             raise
     
     async def get_chat_info(self, chat_id: int):
@@ -260,7 +268,7 @@ class TelethonManager:
         try:
             return await self.client.get_entity(chat_id)
         except Exception as e:
-            logger.error(f"❌ Failed to get chat info for {chat_id}: {e}")
+            logger.error("❌ Failed to get chat info for %s: %s", chat_id, e)
             return None
     
     async def send_message(self, chat_id: int, message: str, **kwargs):
@@ -268,7 +276,7 @@ class TelethonManager:
         try:
             return await self.client.send_message(chat_id, message, **kwargs)
         except Exception as e:
-            logger.error(f"❌ Failed to send message: {e}")
+            logger.error("❌ Failed to send message: %s", e)
             raise
     
     def create_progress_callback(self, task_id: str, total_size: int):
@@ -5,20 +5,393 @@ Handles connection pooling, migrations, and database operations
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Union
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple, Union
 from contextlib import asynccontextmanager
 
 import asyncpg
+import orjson
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.sql import text
-from sqlalchemy import func
 
 from config.settings import settings
-from database.models import Base, User, Download, UserAnalytics, SystemStats, Platform, ErrorLog
+from database.models import (
+    DEFAULT_USER_SETTINGS, DEFAULT_USER_SETTINGS_SQL, DOWNLOAD_STATUSES, ERROR_SEVERITIES, SUCCESS_RATE_SQL,
+    Base, User, Download, UserAnalytics, SystemStats, Platform, ErrorLog
+)
 
 logger = logging.getLogger(__name__)
 
+# orjson options for JSON columns: naive datetimes are UTC, unknown types fall back to str
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def _json_dumps(value: Any) -> bytes:
+    """Encode a JSON column value with orjson"""
+    return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS)
+
+
+# Hot statements prepared once per pooled connection (see DatabaseManager._init_connection)
+_PREPARED_SQL: Dict[str, str] = {
+    'upsert_user': """
+        INSERT INTO users (user_id, username, first_name, last_name, chat_id)
+        VALUES ($1, $2, $3, $4, $5)
+        ON CONFLICT (user_id) DO UPDATE
+        SET username = EXCLUDED.username, first_name = EXCLUDED.first_name,
+            last_name = EXCLUDED.last_name, chat_id = EXCLUDED.chat_id,
+            last_active = now(), updated_at = now()
+        RETURNING *
+    """,
+    'user_settings': "SELECT settings FROM users WHERE user_id = $1",
+    'create_download': """
+        INSERT INTO downloads 
+        (task_id, user_id, original_url, video_title, video_id, platform, uploader, 
+         duration, view_count, upload_date, format_id, quality, file_extension, 
+         file_size, is_audio_only, status, video_metadata)
+        VALUES 
+        ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, 'pending', $16)
+        RETURNING id
+    """,
+    'merge_user_settings': """
+        UPDATE users
+        SET settings = COALESCE(settings, $2::jsonb) || $1::jsonb,
+            updated_at = now()
+        WHERE user_id = $3
+        RETURNING settings
+    """,
+    'update_download_progress': """
+        UPDATE downloads
+        SET status = $2,
+            download_time = COALESCE($3, download_time),
+            upload_time = COALESCE($4, upload_time),
+            download_speed = COALESCE($5, download_speed),
+            upload_speed = COALESCE($6, upload_speed),
+            error_message = COALESCE($7, error_message),
+            telegram_message_id = COALESCE($8, telegram_message_id),
+            telegram_chat_id = COALESCE($9, telegram_chat_id),
+            completed_at = CASE WHEN $2 IN ('completed', 'failed', 'cancelled') THEN now() ELSE completed_at END,
+            started_at = CASE WHEN $2 = 'downloading' THEN now() ELSE started_at END
+        WHERE task_id = $1
+    """,
+    'user_stats': """
+        WITH u AS (
+            SELECT total_downloads, successful_downloads, failed_downloads, success_rate,
+                   total_bytes_downloaded, total_bytes_uploaded, created_at, last_active
+            FROM users
+            WHERE user_id = $1
+        ), d AS (
+            SELECT
+                COALESCE(AVG(download_speed), 0) as avg_download_speed,
+                COALESCE(AVG(upload_speed), 0) as avg_upload_speed,
+                COALESCE(MAX(download_speed), 0) as fastest_download_speed,
+                COALESCE(AVG(download_time + upload_time), 0) as avg_processing_time,
+                COALESCE(SUM(download_time), 0) as total_download_time,
+                COALESCE(SUM(upload_time), 0) as total_upload_time,
+                COALESCE(AVG(file_size), 0) as avg_file_size
+            FROM downloads
+            WHERE user_id = $1 AND status = 'completed'
+        )
+        SELECT u.*, d.* FROM u CROSS JOIN d
+    """,
+    'log_error': """
+        INSERT INTO error_logs
+        (error_type, error_message, error_traceback, user_id, url, platform,
+         task_id, severity, request_data)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+    """,
+}
+
+# Optional update_download_progress fields, in statement parameter order ($3..$9)
+_PROGRESS_FIELDS = (
+    'download_time', 'upload_time', 'download_speed', 'upload_speed',
+    'error_message', 'telegram_message_id', 'telegram_chat_id'
+)
+# Column order for bulk download inserts (create_download_records)
+_DOWNLOAD_COPY_COLUMNS = [
+    'task_id', 'user_id', 'original_url', 'video_title', 'video_id', 'platform', 'uploader',
+    'duration', 'view_count', 'upload_date', 'format_id', 'quality', 'file_extension',
+    'file_size', 'is_audio_only', 'video_metadata'
+]
+# Column order for historical imports (import_download_records): everything but the id
+_DOWNLOAD_IMPORT_COLUMNS = _DOWNLOAD_COPY_COLUMNS + [
+    'download_time', 'upload_time', 'download_speed', 'upload_speed', 'status', 'error_message',
+    'telegram_message_id', 'telegram_chat_id', 'created_at', 'started_at', 'completed_at'
+]
+_DOWNLOAD_TIMESTAMP_COLUMNS = frozenset(('created_at', 'started_at', 'completed_at'))
+_TERMINAL_STATUSES = frozenset(('completed', 'failed', 'cancelled'))
+# Column order for queued error_logs rows (log_error / _flush_error_queue)
+_ERROR_LOG_COLUMNS = [
+    'error_type', 'error_message', 'error_traceback', 'user_id', 'url', 'platform',
+    'task_id', 'severity', 'request_data'
+]
+# Column order for buffered system_stats samples (record_system_stats); timestamp is the sample time
+_SYSTEM_STATS_COLUMNS = [
+    'timestamp', 'cpu_usage', 'memory_usage', 'disk_usage', 'active_users', 'active_downloads',
+    'active_uploads', 'queue_size', 'database_connected', 'redis_connected', 'telethon_connected',
+    'avg_response_time', 'requests_per_minute', 'error_rate', 'custom_metrics'
+]
+# Row count at which _bulk_insert switches from executemany to COPY
+_COPY_THRESHOLD = 100
+
+# One cleanup_old_records batch: delete up to $2 expired rows per table, return the three counts
+_CLEANUP_BATCH_SQL = """
+    WITH d AS (
+        DELETE FROM downloads WHERE id IN (
+            SELECT id FROM downloads
+            WHERE status IN ('completed', 'failed', 'cancelled')
+              AND completed_at < now() - make_interval(days => $1)
+            LIMIT $2
+        ) RETURNING 1
+    ), s AS (
+        DELETE FROM system_stats WHERE id IN (
+            SELECT id FROM system_stats
+            WHERE timestamp < now() - make_interval(days => $1)
+            LIMIT $2
+        ) RETURNING 1
+    ), e AS (
+        DELETE FROM error_logs WHERE id IN (
+            SELECT id FROM error_logs
+            WHERE created_at < now() - make_interval(days => $1) AND resolved = true
+            LIMIT $2
+        ) RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM d), (SELECT COUNT(*) FROM s), (SELECT COUNT(*) FROM e)
+"""
+
+# Append-only tables declared PARTITION BY RANGE in the models: table -> partition key column
+_PARTITIONED_TABLES: Dict[str, str] = {
+    'error_logs': 'created_at',
+    'system_stats': 'timestamp',
+}
+
+
+def _month_start(moment: datetime, offset: int = 0) -> datetime:
+    """First instant (UTC) of the month ``offset`` months away from ``moment``"""
+    month_index = moment.year * 12 + moment.month - 1 + offset
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+# Index migrations for existing tables (create_all only builds indexes for new tables).
+# Run one statement at a time: CONCURRENTLY is not allowed inside a transaction block.
+# Entries are (table, index, statement); partitioned parents reject CONCURRENTLY and run the plain form.
+_INDEX_MIGRATIONS: List[Tuple[str, str, str]] = [
+    # Append-only time columns: BRIN replaces the much larger btree indexes used by cleanup scans
+    ('downloads', 'idx_downloads_created_at_brin', "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_downloads_created_at_brin ON downloads USING brin (created_at)"),
+    ('system_stats', 'idx_system_stats_timestamp_brin', "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_system_stats_timestamp_brin ON system_stats USING brin (timestamp)"),
+    ('error_logs', 'idx_errors_created_at_brin', "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_errors_created_at_brin ON error_logs USING brin (created_at)"),
+    ('downloads', 'idx_downloads_created_at', "DROP INDEX CONCURRENTLY IF EXISTS idx_downloads_created_at"),
+    ('system_stats', 'idx_system_stats_timestamp', "DROP INDEX CONCURRENTLY IF EXISTS idx_system_stats_timestamp"),
+    ('system_stats', 'ix_system_stats_timestamp', "DROP INDEX CONCURRENTLY IF EXISTS ix_system_stats_timestamp"),
+    ('error_logs', 'ix_error_logs_created_at', "DROP INDEX CONCURRENTLY IF EXISTS ix_error_logs_created_at"),
+    # Duplicates of unique indexes, or covered by a composite index with the same leading column
+    ('users', 'idx_users_user_id', "DROP INDEX CONCURRENTLY IF EXISTS idx_users_user_id"),
+    ('downloads', 'ix_downloads_user_id', "DROP INDEX CONCURRENTLY IF EXISTS ix_downloads_user_id"),
+    ('downloads', 'ix_downloads_platform', "DROP INDEX CONCURRENTLY IF EXISTS ix_downloads_platform"),
+    ('downloads', 'ix_downloads_status', "DROP INDEX CONCURRENTLY IF EXISTS ix_downloads_status"),
+    ('downloads', 'idx_downloads_status', "DROP INDEX CONCURRENTLY IF EXISTS idx_downloads_status"),
+    ('user_analytics', 'ix_user_analytics_user_id', "DROP INDEX CONCURRENTLY IF EXISTS ix_user_analytics_user_id"),
+    ('user_analytics', 'ix_user_analytics_date', "DROP INDEX CONCURRENTLY IF EXISTS ix_user_analytics_date"),
+    ('platforms', 'idx_platforms_name', "DROP INDEX CONCURRENTLY IF EXISTS idx_platforms_name"),
+    ('error_logs', 'ix_error_logs_error_type', "DROP INDEX CONCURRENTLY IF EXISTS ix_error_logs_error_type"),
+    ('error_logs', 'ix_error_logs_user_id', "DROP INDEX CONCURRENTLY IF EXISTS ix_error_logs_user_id"),
+    ('error_logs', 'ix_error_logs_severity', "DROP INDEX CONCURRENTLY IF EXISTS ix_error_logs_severity"),
+]
+
+# Widen SERIAL ids created before the models moved to BIGINT identity columns (no-op once widened)
+_WIDEN_ID_COLUMNS_SQL = """
+    DO $$
+    DECLARE
+        tbl text;
+        seq text;
+    BEGIN
+        FOREACH tbl IN ARRAY ARRAY['downloads', 'error_logs', 'system_stats', 'user_analytics'] LOOP
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = tbl
+                  AND column_name = 'id' AND data_type = 'integer'
+            ) THEN
+                EXECUTE format('ALTER TABLE %I ALTER COLUMN id TYPE bigint', tbl);
+                seq := pg_get_serial_sequence(tbl, 'id');
+                IF seq IS NOT NULL THEN
+                    EXECUTE format('ALTER SEQUENCE %s AS bigint', seq);
+                END IF;
+            END IF;
+        END LOOP;
+    END
+    $$;
+"""
+
+# Generated success_rate columns for tables created before they were added to the models
+_COMPUTED_COLUMNS_SQL = f"""
+    ALTER TABLE users ADD COLUMN IF NOT EXISTS success_rate double precision
+        GENERATED ALWAYS AS ({SUCCESS_RATE_SQL}) STORED;
+    ALTER TABLE platforms ADD COLUMN IF NOT EXISTS success_rate double precision
+        GENERATED ALWAYS AS ({SUCCESS_RATE_SQL}) STORED;
+"""
+
+# Narrow Telegram name columns created before the models were tightened (no-op once applied)
+_USER_NAME_COLUMNS_SQL = """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'users'
+              AND column_name = 'username' AND data_type <> 'USER-DEFINED'
+        ) THEN
+            ALTER TABLE users
+                ALTER COLUMN username TYPE citext,
+                ALTER COLUMN first_name TYPE varchar(64) USING left(first_name, 64),
+                ALTER COLUMN last_name TYPE varchar(64) USING left(last_name, 64);
+        END IF;
+    END
+    $$;
+"""
+
+# Recreate user foreign keys that lack ON DELETE CASCADE (no-op once applied).
+# NOT VALID + VALIDATE avoids holding a strong lock while existing rows are checked.
+_CASCADE_FOREIGN_KEYS_SQL = """
+    DO $$
+    DECLARE
+        fk record;
+    BEGIN
+        FOR fk IN
+            SELECT c.conname, t.relname AS table_name
+            FROM pg_constraint c
+            JOIN pg_class t ON t.oid = c.conrelid
+            WHERE c.contype = 'f' AND c.confrelid = 'users'::regclass
+              AND t.relname IN ('downloads', 'user_analytics') AND c.confdeltype <> 'c'
+        LOOP
+            EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', fk.table_name, fk.conname);
+            EXECUTE format(
+                'ALTER TABLE %I ADD CONSTRAINT %I FOREIGN KEY (user_id) '
+                'REFERENCES users (user_id) ON DELETE CASCADE NOT VALID',
+                fk.table_name, fk.conname
+            );
+            EXECUTE format('ALTER TABLE %I VALIDATE CONSTRAINT %I', fk.table_name, fk.conname);
+        END LOOP;
+    END
+    $$;
+"""
+
+def _enum_labels(values) -> str:
+    """Render ENUM labels as a SQL list"""
+    return ', '.join(f"'{value}'" for value in values)
+
+
+# Convert varchar status/severity columns created before the models moved to ENUM types
+# (no-op once converted; create_all creates the types for new databases)
+_ENUM_COLUMNS_SQL = f"""
+    DO $$
+    BEGIN
+        IF to_regtype('download_status_t') IS NULL THEN
+            CREATE TYPE download_status_t AS ENUM ({_enum_labels(DOWNLOAD_STATUSES)});
+        END IF;
+        IF to_regtype('severity_t') IS NULL THEN
+            CREATE TYPE severity_t AS ENUM ({_enum_labels(ERROR_SEVERITIES)});
+        END IF;
+
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'downloads'
+              AND column_name = 'status' AND data_type <> 'USER-DEFINED'
+        ) THEN
+            ALTER TABLE downloads
+                ALTER COLUMN status TYPE download_status_t USING status::download_status_t;
+        END IF;
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'error_logs'
+              AND column_name = 'severity' AND data_type <> 'USER-DEFINED'
+        ) THEN
+            ALTER TABLE error_logs
+                ALTER COLUMN severity TYPE severity_t USING severity::severity_t;
+        END IF;
+    END
+    $$;
+"""
+
+# Convert json columns created before the models moved to JSONB (no-op once converted).
+# The old json default is dropped first; _SERVER_DEFAULTS_SQL re-adds it as jsonb.
+_JSONB_COLUMNS_SQL = """
+    DO $$
+    DECLARE
+        col record;
+    BEGIN
+        FOR col IN
+            SELECT table_name, column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND data_type = 'json'
+              AND (table_name, column_name) IN (
+                  ('users', 'settings'), ('downloads', 'video_metadata'),
+                  ('user_analytics', 'platform_stats'), ('user_analytics', 'quality_stats'),
+                  ('system_stats', 'custom_metrics'), ('platforms', 'settings'),
+                  ('error_logs', 'request_data')
+              )
+        LOOP
+            EXECUTE format(
+                'ALTER TABLE %I ALTER COLUMN %I DROP DEFAULT, ALTER COLUMN %I TYPE jsonb USING %I::jsonb',
+                col.table_name, col.column_name, col.column_name, col.column_name
+            );
+        END LOOP;
+    END
+    $$;
+"""
+
+# Server-side column defaults, so inserts (and COPY) never ship client-side "now" values or settings
+_SERVER_DEFAULTS_SQL = f"""
+    ALTER TABLE users
+        ALTER COLUMN settings SET DEFAULT {DEFAULT_USER_SETTINGS_SQL},
+        ALTER COLUMN created_at SET DEFAULT now(),
+        ALTER COLUMN updated_at SET DEFAULT now(),
+        ALTER COLUMN last_active SET DEFAULT now();
+    ALTER TABLE downloads ALTER COLUMN created_at SET DEFAULT now();
+    ALTER TABLE user_analytics ALTER COLUMN date SET DEFAULT now();
+    ALTER TABLE system_stats ALTER COLUMN timestamp SET DEFAULT now();
+    ALTER TABLE platforms
+        ALTER COLUMN created_at SET DEFAULT now(),
+        ALTER COLUMN updated_at SET DEFAULT now();
+    ALTER TABLE error_logs ALTER COLUMN created_at SET DEFAULT now();
+"""
+
+# Denormalized users.* download counters, maintained by PostgreSQL instead of the application
+_USER_COUNTER_TRIGGER_SQL = """
+    CREATE OR REPLACE FUNCTION users_bump_counters() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE users SET
+                total_downloads = COALESCE(total_downloads, 0) + 1,
+                successful_downloads = COALESCE(successful_downloads, 0)
+                    + (NEW.status = 'completed')::int,
+                failed_downloads = COALESCE(failed_downloads, 0)
+                    + (NEW.status = 'failed')::int,
+                total_bytes_downloaded = COALESCE(total_bytes_downloaded, 0)
+                    + CASE WHEN NEW.status = 'completed' THEN COALESCE(NEW.file_size, 0) ELSE 0 END
+            WHERE user_id = NEW.user_id;
+        ELSIF NEW.status = 'completed' THEN
+            UPDATE users SET
+                successful_downloads = COALESCE(successful_downloads, 0) + 1,
+                total_bytes_downloaded = COALESCE(total_bytes_downloaded, 0) + COALESCE(NEW.file_size, 0)
+            WHERE user_id = NEW.user_id;
+        ELSIF NEW.status = 'failed' THEN
+            UPDATE users SET failed_downloads = COALESCE(failed_downloads, 0) + 1
+            WHERE user_id = NEW.user_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS downloads_bump_counters_insert ON downloads;
+    CREATE TRIGGER downloads_bump_counters_insert
+        AFTER INSERT ON downloads
+        FOR EACH ROW EXECUTE FUNCTION users_bump_counters();
+
+    DROP TRIGGER IF EXISTS downloads_bump_counters_status ON downloads;
+    CREATE TRIGGER downloads_bump_counters_status
+        AFTER UPDATE OF status ON downloads
+        FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status)
+        EXECUTE FUNCTION users_bump_counters();
+"""
+
 class DatabaseManager:
     """Ultra high-performance database manager with connection pooling"""
 
@@ -27,18 +400,58 @@ class DatabaseManager:
         self.session_factory: Optional[async_sessionmaker] = None
         self.connection_pool: Optional[asyncpg.Pool] = None
         self.is_initialized = False
+        # Prepared statements per backend connection, keyed by server PID
+        self._prepared: Dict[int, Dict[str, Any]] = {}
+        # Coalesced non-terminal progress updates, flushed in batches by _flush_progress_loop
+        self._progress_buffer: Dict[str, Dict[str, Any]] = {}
+        self._progress_lock = asyncio.Lock()
+        self._progress_flush_task: Optional[asyncio.Task] = None
+        self.progress_flush_interval = 0.05  # 50ms
+        # In-process TTL/LRU cache for get_user_settings: user_id -> (expires_at, settings)
+        self._settings_cache: OrderedDict = OrderedDict()
+        self.settings_cache_ttl = 60
+        self.settings_cache_size = 10000
+        # get_database_stats cache: (expires_at, stats), kept warm by _db_stats_refresh_loop
+        self._db_stats_cache: Tuple[float, Optional[Dict[str, Any]]] = (0.0, None)
+        self._db_stats_task: Optional[asyncio.Task] = None
+        # Single in-flight refresh shared by every caller (each one holds two pooled connections)
+        self._db_stats_refresh: Optional[asyncio.Task] = None
+        self.db_stats_ttl = 60
+        self.db_stats_refresh_interval = 45  # below db_stats_ttl so the cache never expires between refreshes
+        # Queued error_logs rows, drained in batches by _flush_error_loop
+        self._error_queue: asyncio.Queue = asyncio.Queue()
+        self._error_flusher_task: Optional[asyncio.Task] = None
+        self.error_flush_timeout = 0.2  # 200ms
+        self.error_batch_size = 1000
+        # In-memory ring buffer of system_stats samples, flushed in one batch by _flush_stats_loop
+        self._stats_buffer: deque = deque(maxlen=10000)
+        self._flush_stats_task: Optional[asyncio.Task] = None
+        self.stats_flush_interval = 60
+        # Set by close_all_connections; log_error stops queueing once it is set
+        self._shutting_down = asyncio.Event()
+        # health_check only round-trips every deep_check_interval seconds
+        self._cached_health: Dict[str, Any] = {'healthy': True, 'connected': True}
+        self._last_deep_check = 0.0
+        self.deep_check_interval = 30
+        self.cleanup_batch_size = 5000
+        # Tables that are actually partitioned in this database (older deployments may not be)
+        self._partitioned_tables: set = set()
+        self._partition_task: Optional[asyncio.Task] = None
+        self.partition_check_interval = 6 * 3600  # 6 hours
+        self.partitions_ahead = 2  # current month plus this many future months
         # Assume cache_manager is available and initialized elsewhere
         # self.cache_manager = CacheManager() 
 
         # Connection pool settings
-        self.min_connections = 5
-        self.max_connections = 20
+        self.min_connections = settings.DB_POOL_MIN
+        self.max_connections = max(settings.DB_POOL_MAX, self.min_connections)
         self.pool_timeout = 30
 
     async def initialize(self):
         """Initialize database connections and create tables"""
         try:
             logger.info("🔧 Initializing database connections...")
+            self._shutting_down.clear()
 
             # Create async engine with optimized settings
             # Remove any SSL parameters that might conflict
@@ -54,6 +467,9 @@ class DatabaseManager:
                 pool_pre_ping=True,
                 pool_recycle=3600,  # Recycle connections every hour
                 echo=False,  # Set to True for SQL debugging
+                # ORM JSON columns use the same orjson encoding as the raw pool
+                json_serializer=lambda value: _json_dumps(value).decode(),
+                json_deserializer=orjson.loads,
             )
 
             # Create session factory
@@ -69,12 +485,35 @@ class DatabaseManager:
             # Create tables if they don't exist
             await self._create_tables()
 
-            # Mark as initialized before calling methods that use get_session()
+            # Partitions must exist before anything is inserted into partitioned tables
+            await self._ensure_partitions()
+
+            # Statements prepared before the migrations may have a stale result type (e.g. RETURNING *
+            # after success_rate was added); drop them and have the pool reconnect and re-prepare
+            self._prepared.clear()
+            await self.connection_pool.expire_connections()
+
+            # Mark as initialized before seeding default data
             self.is_initialized = True
 
             # Initialize default data
             await self._initialize_default_data()
 
+            # Start batched progress writer
+            self._progress_flush_task = asyncio.create_task(self._flush_progress_loop())
+
+            # Keep size/count statistics warm off the request path
+            self._db_stats_task = asyncio.create_task(self._db_stats_refresh_loop())
+
+            # Start batched error log writer
+            self._error_flusher_task = asyncio.create_task(self._flush_error_loop())
+
+            # Start batched system stats writer
+            self._flush_stats_task = asyncio.create_task(self._flush_stats_loop())
+
+            # Keep monthly partitions created ahead of time
+            self._partition_task = asyncio.create_task(self._partition_maintenance_loop())
+
             logger.info("✅ Database initialized successfully")
 
         except Exception as e:
@@ -93,17 +532,21 @@ class DatabaseManager:
             # Create AsyncPG connection pool with ultra-fast settings
             self.connection_pool = await asyncpg.create_pool(
                 dsn=db_url,  # Use dsn directly
-                min_size=5,  # Fewer minimum connections for faster startup
-                max_size=20,  # Reasonable maximum
-                max_queries=5000,  # More queries per connection
-                max_inactive_connection_lifetime=120,  # 2 minutes only
+                min_size=self.min_connections,
+                max_size=self.max_connections,
+                max_queries=50000,  # Rotate long-lived connections
+                max_inactive_connection_lifetime=600,  # 10 minutes
                 timeout=5,  # Fast connection timeout
                 command_timeout=10,  # Fast command timeout
+                statement_cache_size=1024,  # Cover every hot query text per connection
+                max_cached_statement_lifetime=0,  # Never expire cached statements
+                init=self._init_connection,  # Prepare hot statements once per connection
                 server_settings={
+                    # Session-level only: server-wide settings (max_connections,
+                    # shared_preload_libraries) belong in postgresql.conf
                     'jit': 'off',  # Disable JIT for faster simple queries
                     'application_name': 'video_downloader_bot',
-                    'shared_preload_libraries': '',
-                    'max_connections': '200'
+                    'synchronous_commit': 'on'  # Durable by default; relaxed per transaction where safe
                 }
             )
 
@@ -113,84 +556,224 @@ class DatabaseManager:
             logger.error(f"❌ Failed to create connection pool: {e}")
             raise
 
+    async def _init_connection(self, conn):
+        """Register JSON codecs and prepare hot statements on each new pooled connection"""
+        # Decode/encode json and jsonb with orjson instead of returning raw strings
+        await conn.set_type_codec(
+            'json', schema='pg_catalog', format='binary',
+            encoder=_json_dumps, decoder=orjson.loads
+        )
+        await conn.set_type_codec(
+            'jsonb', schema='pg_catalog', format='binary',
+            encoder=lambda value: b'\x01' + _json_dumps(value),  # jsonb binary format version 1
+            decoder=lambda data: orjson.loads(data[1:])
+        )
+
+        pid = conn.get_server_pid()
+        statements = self._prepared[pid] = {}
+        conn.add_termination_listener(lambda _conn: self._prepared.pop(pid, None))
+
+        for name, sql in _PREPARED_SQL.items():
+            try:
+                statements[name] = await conn.prepare(sql)
+            except asyncpg.PostgresError as e:
+                # Tables may not exist yet on first start; _statement() prepares lazily
+                logger.debug(f"Deferred preparing statement {name}: {e}")
+
+    async def _statement(self, conn, name: str):
+        """Get a prepared statement for this connection, preparing it if missing"""
+        statements = self._prepared.setdefault(conn.get_server_pid(), {})
+        stmt = statements.get(name)
+        if stmt is None:
+            stmt = statements[name] = await conn.prepare(_PREPARED_SQL[name])
+        return stmt
+
+    async def _run_statement(self, conn, name: str, method: str, *args):
+        """Run a prepared statement, re-preparing it once if a schema change invalidated its cached plan"""
+        stmt = await self._statement(conn, name)
+        try:
+            return await getattr(stmt, method)(*args)
+        except asyncpg.InvalidCachedStatementError:
+            # Drop the stale statement; inside a transaction the failure has aborted it, so only the next call recovers
+            self._prepared.get(conn.get_server_pid(), {}).pop(name, None)
+            if conn.is_in_transaction():
+                raise
+            logger.info(f"🔄 Re-preparing statement {name} after a schema change")
+            stmt = await self._statement(conn, name)
+            return await getattr(stmt, method)(*args)
+
     async def _create_tables(self):
         """Create database tables if they don't exist"""
         try:
             if self.engine is None:
                 raise RuntimeError("Database engine not initialized")
+            # users.username is CITEXT, so the extension must exist before create_all
+            if self.connection_pool is not None:
+                await self.connection_pool.execute("CREATE EXTENSION IF NOT EXISTS citext")
+
             async with self.engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
 
+            # Migrate existing tables: id widths, JSONB, column defaults, counter triggers and indexes
+            if self.connection_pool is not None:
+                async with self.connection_pool.acquire() as conn:
+                    await conn.execute(_WIDEN_ID_COLUMNS_SQL)
+                    await conn.execute(_JSONB_COLUMNS_SQL)
+                    await conn.execute(_USER_NAME_COLUMNS_SQL)
+                    await conn.execute(_CASCADE_FOREIGN_KEYS_SQL)
+                    await conn.execute(_ENUM_COLUMNS_SQL)
+                    await conn.execute(_SERVER_DEFAULTS_SQL)
+                    await conn.execute(_COMPUTED_COLUMNS_SQL)
+                    await conn.execute(_USER_COUNTER_TRIGGER_SQL)
+                    partitioned = await self._fetch_partitioned_tables(conn)
+                    for table, index, statement in _INDEX_MIGRATIONS:
+                        await self._run_index_migration(conn, index, statement, table in partitioned)
+
             logger.info("✅ Database tables created/verified")
 
         except Exception as e:
             logger.error(f"❌ Failed to create tables: {e}")
             raise
 
+    async def _fetch_partitioned_tables(self, conn) -> set:
+        """Names of the _PARTITIONED_TABLES that are actually partitioned in this database"""
+        rows = await conn.fetch("""
+            SELECT c.relname FROM pg_partitioned_table p
+            JOIN pg_class c ON c.oid = p.partrelid
+            WHERE c.relname = ANY($1::text[])
+        """, list(_PARTITIONED_TABLES))
+        return {row['relname'] for row in rows}
+
+    async def _run_index_migration(self, conn, index: str, statement: str, partitioned: bool):
+        """Run one index migration, clearing a leftover invalid index from an interrupted build first"""
+        if partitioned:
+            # Partitioned parents reject CONCURRENTLY; the plain form recurses into the partitions
+            logger.debug(f"Running index migration for {index} without CONCURRENTLY (partitioned table)")
+            statement = statement.replace(" CONCURRENTLY", "", 1)
+        try:
+            invalid = await conn.fetchval("""
+                SELECT 1 FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = $1 AND NOT i.indisvalid
+            """, index)
+            if invalid:
+                # A failed CONCURRENTLY build leaves an invalid index that IF NOT EXISTS would keep forever
+                logger.warning(f"⚠️ Dropping invalid index {index} before retrying its migration")
+                await conn.execute(f"DROP INDEX {'' if partitioned else 'CONCURRENTLY '}IF EXISTS {index}")
+            await conn.execute(statement)
+        except asyncpg.PostgresError as e:
+            logger.warning(f"⚠️ Index migration failed for {index}: {e}")
+
+    async def _ensure_partitions(self):
+        """Create the DEFAULT partition and monthly partitions for the current and upcoming months"""
+        if self.connection_pool is None:
+            return
+
+        try:
+            async with self.connection_pool.acquire() as conn:
+                self._partitioned_tables = await self._fetch_partitioned_tables(conn)
+
+                now = datetime.now(timezone.utc)
+                for table in self._partitioned_tables:
+                    # Catch-all so inserts never fail if maintenance falls behind the lookahead
+                    await conn.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+                    for offset in range(self.partitions_ahead + 1):
+                        await self._create_month_partition(conn, table, _month_start(now, offset))
+
+        except Exception as e:
+            logger.error(f"❌ Failed to create partitions: {e}")
+
+    async def _create_month_partition(self, conn, table: str, start: datetime):
+        """Create one monthly partition, moving any rows the DEFAULT partition caught for that month into it"""
+        name = f"{table}_{start:%Y_%m}"
+        if await conn.fetchval("SELECT to_regclass($1)", name) is not None:
+            return
+
+        key = _PARTITIONED_TABLES[table]
+        bounds = f"{key} >= '{start.isoformat()}' AND {key} < '{_month_start(start, 1).isoformat()}'"
+        async with conn.transaction():
+            # PostgreSQL refuses to add a partition while the DEFAULT partition holds rows in its range
+            await conn.execute(f"""
+                CREATE TEMP TABLE _partition_rows ON COMMIT DROP AS
+                SELECT * FROM {table}_default WHERE {bounds}
+            """)
+            await conn.execute(f"DELETE FROM {table}_default WHERE {bounds}")
+            await conn.execute(f"""
+                CREATE TABLE {name}
+                PARTITION OF {table}
+                FOR VALUES FROM ('{start.isoformat()}') TO ('{_month_start(start, 1).isoformat()}')
+            """)
+            await conn.execute(f"INSERT INTO {table} OVERRIDING SYSTEM VALUE SELECT * FROM _partition_rows")
+
+    async def _partition_maintenance_loop(self):
+        """Periodically create upcoming monthly partitions"""
+        while True:
+            await asyncio.sleep(self.partition_check_interval)
+            await self._ensure_partitions()
+
+    async def _drop_expired_partitions(self, days: int) -> int:
+        """Drop monthly partitions that lie entirely before the retention cutoff, keeping unresolved errors"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+
+        async def drop_table_partitions(table: str) -> int:
+            # One pooled connection per parent table, so the tables are handled in parallel
+            dropped = 0
+            async with self.connection_pool.acquire() as conn:
+                partitions = await conn.fetch("""
+                    SELECT c.relname FROM pg_inherits i
+                    JOIN pg_class c ON c.oid = i.inhrelid
+                    WHERE i.inhparent = $1::regclass
+                """, table)
+                for row in partitions:
+                    name = row['relname']
+                    try:
+                        start = datetime.strptime(name[len(table) + 1:], '%Y_%m').replace(tzinfo=timezone.utc)
+                    except ValueError:
+                        continue
+                    if _month_start(start, 1) <= cutoff:
+                        async with conn.transaction():
+                            await conn.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+                            if table == 'error_logs':
+                                # Unresolved errors are kept past retention, as the row-level cleanup does;
+                                # with their month gone they land in the DEFAULT partition
+                                await conn.execute(f"""
+                                    INSERT INTO error_logs OVERRIDING SYSTEM VALUE
+                                    SELECT * FROM {name} WHERE resolved IS NOT TRUE
+                                """)
+                            await conn.execute(f"DROP TABLE {name}")
+                        dropped += 1
+            return dropped
+
+        results = await asyncio.gather(*(drop_table_partitions(table) for table in self._partitioned_tables))
+        return sum(results)
+
     async def _initialize_default_data(self):
         """Initialize default platform data"""
         try:
-            async with self.get_session() as session:
-                # Check if platforms already exist
-                result = await session.execute(text("SELECT COUNT(*) FROM platforms"))
-                count = result.scalar()
-
-                if count == 0:
-                    # Insert default platforms
-                    default_platforms = [
-                        {
-                            'name': 'youtube',
-                            'display_name': 'YouTube',
-                            'base_url': 'https://www.youtube.com',
-                            'supports_video': True,
-                            'supports_audio': True,
-                            'supports_playlists': True,
-                            'max_quality': '4K'
-                        },
-                        {
-                            'name': 'tiktok',
-                            'display_name': 'TikTok',
-                            'base_url': 'https://www.tiktok.com',
-                            'supports_video': True,
-                            'supports_audio': True,
-                            'supports_playlists': False,
-                            'max_quality': '1080p'
-                        },
-                        {
-                            'name': 'instagram',
-                            'display_name': 'Instagram',
-                            'base_url': 'https://www.instagram.com',
-                            'supports_video': True,
-                            'supports_audio': True,
-                            'supports_playlists': False,
-                            'max_quality': '1080p'
-                        },
-                        {
-                            'name': 'facebook',
-                            'display_name': 'Facebook',
-                            'base_url': 'https://www.facebook.com',
-                            'supports_video': True,
-                            'supports_audio': True,
-                            'supports_playlists': False,
-                            'max_quality': '1080p'
-                        },
-                        {
-                            'name': 'twitter',
-                            'display_name': 'Twitter/X',
-                            'base_url': 'https://twitter.com',
-                            'supports_video': True,
-                            'supports_audio': True,
-                            'supports_playlists': False,
-                            'max_quality': '1080p'
-                        }
-                    ]
-
-                    for platform_data in default_platforms:
-                        platform = Platform(**platform_data)
-                        session.add(platform)
-
-                    await session.commit()
-                    logger.info("✅ Default platforms initialized")
+            if self.connection_pool is None:
+                raise RuntimeError("Connection pool not initialized")
+
+            # (name, display_name, base_url, supports_video, supports_audio, supports_playlists, max_quality)
+            default_platforms = [
+                ('youtube', 'YouTube', 'https://www.youtube.com', True, True, True, '4K'),
+                ('tiktok', 'TikTok', 'https://www.tiktok.com', True, True, False, '1080p'),
+                ('instagram', 'Instagram', 'https://www.instagram.com', True, True, False, '1080p'),
+                ('facebook', 'Facebook', 'https://www.facebook.com', True, True, False, '1080p'),
+                ('twitter', 'Twitter/X', 'https://twitter.com', True, True, False, '1080p'),
+            ]
+
+            # One batched round trip; existing platforms are left untouched
+            async with self.transaction() as conn:
+                await conn.executemany("""
+                    INSERT INTO platforms
+                    (name, display_name, base_url, supports_video, supports_audio,
+                     supports_playlists, max_quality, total_downloads, successful_downloads,
+                     failed_downloads, is_active)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, 0, 0, 0, true)
+                    ON CONFLICT (name) DO NOTHING
+                """, default_platforms)
+
+            logger.info("✅ Default platforms initialized")
 
         except Exception as e:
             logger.error(f"❌ Failed to initialize default data: {e}")
@@ -211,6 +794,48 @@ class DatabaseManager:
             finally:
                 await session.close()
 
+    @asynccontextmanager
+    async def transaction(self):
+        """Acquire a pooled connection inside an asyncpg transaction (multi-statement writes)"""
+        if self.connection_pool is None:
+            raise RuntimeError("Connection pool not initialized")
+
+        async with self.connection_pool.acquire() as conn:
+            async with conn.transaction():
+                yield conn
+
+    async def _bulk_insert(
+        self,
+        table: str,
+        columns: List[str],
+        rows: List[tuple],
+        statement: Optional[str] = None,
+        synchronous_commit: bool = True
+    ):
+        """Insert rows (tuples in column order) with COPY for large batches, executemany otherwise
+
+        ``statement`` names a _PREPARED_SQL entry to reuse for the executemany path.
+        ``synchronous_commit=False`` skips waiting for the WAL flush (for losable data).
+        """
+        if not rows:
+            return
+        if self.connection_pool is None:
+            raise RuntimeError("Connection pool not initialized")
+
+        async with self.connection_pool.acquire() as conn, conn.transaction():
+            if not synchronous_commit:
+                await conn.execute("SET LOCAL synchronous_commit TO OFF")
+
+            if len(rows) >= _COPY_THRESHOLD:
+                await conn.copy_records_to_table(table, records=rows, columns=columns)
+            elif statement is not None:
+                await self._run_statement(conn, statement, 'executemany', rows)
+            else:
+                placeholders = ', '.join(f'${i}' for i in range(1, len(columns) + 1))
+                await conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows
+                )
+
     async def get_connection(self):
         """Get a connection from the asyncpg pool"""
         if self.connection_pool is None:
@@ -227,89 +852,22 @@ class DatabaseManager:
     ) -> Dict[str, Any]:
         """Create or update user in database"""
         try:
-            async with self.get_session() as session:
-                # Try to get existing user
-                result = await session.execute(
-                    text("SELECT * FROM users WHERE user_id = :user_id"),
-                    {"user_id": user_id}
+            if self.connection_pool is None:
+                raise RuntimeError("Connection pool not initialized")
+            async with self.connection_pool.acquire() as conn:
+                # Single round trip: insert or update, then return the resulting row
+                user_data = await self._run_statement(
+                    conn, 'upsert_user', 'fetchrow', user_id, username, first_name, last_name, chat_id
                 )
-                user_data = result.fetchone()
-
-                if user_data:
-                    # Update existing user
-                    await session.execute(
-                        text("""
-                            UPDATE users 
-                            SET username = :username, first_name = :first_name, 
-                                last_name = :last_name, chat_id = :chat_id, 
-                                last_active = :now, updated_at = :now
-                            WHERE user_id = :user_id
-                        """),
-                        {
-                            "user_id": user_id,
-                            "username": username,
-                            "first_name": first_name,
-                            "last_name": last_name,
-                            "chat_id": chat_id,
-                            "now": datetime.utcnow()
-                        }
-                    )
 
-                    # Fetch updated user
-                    result = await session.execute(
-                        text("SELECT * FROM users WHERE user_id = :user_id"),
-                        {"user_id": user_id}
-                    )
-                    user_data = result.fetchone()
-                else:
-                    # Create new user
-                    await session.execute(
-                        text("""
-                            INSERT INTO users (user_id, username, first_name, last_name, chat_id, created_at, last_active)
-                            VALUES (:user_id, :username, :first_name, :last_name, :chat_id, :now, :now)
-                        """),
-                        {
-                            "user_id": user_id,
-                            "username": username,
-                            "first_name": first_name,
-                            "last_name": last_name,
-                            "chat_id": chat_id,
-                            "now": datetime.utcnow()
-                        }
-                    )
+            if not user_data:
+                return {}
 
-                    # Fetch created user
-                    result = await session.execute(
-                        text("SELECT * FROM users WHERE user_id = :user_id"),
-                        {"user_id": user_id}
-                    )
-                    user_data = result.fetchone()
-
-                await session.commit()
-
-                # Convert asyncpg Row to dict properly
-                if user_data:
-                    return {
-                        'id': user_data[0] if len(user_data) > 0 else None,
-                        'user_id': user_data[1] if len(user_data) > 1 else None,
-                        'username': user_data[2] if len(user_data) > 2 else None,
-                        'first_name': user_data[3] if len(user_data) > 3 else None,
-                        'last_name': user_data[4] if len(user_data) > 4 else None,
-                        'chat_id': user_data[5] if len(user_data) > 5 else None,
-                        'settings': user_data[6] if len(user_data) > 6 else {},
-                        'total_downloads': user_data[7] if len(user_data) > 7 else 0,
-                        'successful_downloads': user_data[8] if len(user_data) > 8 else 0,
-                        'failed_downloads': user_data[9] if len(user_data) > 9 else 0,
-                        'total_bytes_downloaded': user_data[10] if len(user_data) > 10 else 0,
-                        'total_bytes_uploaded': user_data[11] if len(user_data) > 11 else 0,
-                        'created_at': user_data[12] if len(user_data) > 12 else None,
-                        'updated_at': user_data[13] if len(user_data) > 13 else None,
-                        'last_active': user_data[14] if len(user_data) > 14 else None,
-                        'is_premium': user_data[15] if len(user_data) > 15 else False,
-                        'premium_expires': user_data[16] if len(user_data) > 16 else None
-                    }
-                else:
-                    return {}
+            # The RETURNING * post-image already has the settings; prime the cache with them
+            self._cache_user_settings(user_id, user_data['settings'] or dict(DEFAULT_USER_SETTINGS))
+
+            # asyncpg Records are name-indexed; convert directly
+            return dict(user_data)
 
         except Exception as e:
             logger.error(f"❌ Failed to create/update user {user_id}: {e}")
@@ -325,49 +883,32 @@ class DatabaseManager:
     ) -> int:
         """Create download record in database"""
         try:
-            async with self.get_session() as session:
-                download_data = {
-                    "task_id": task_id,
-                    "user_id": user_id,
-                    "original_url": original_url,
-                    "video_title": video_info.get('title'),
-                    "video_id": video_info.get('id'),
-                    "platform": video_info.get('platform'),
-                    "uploader": video_info.get('uploader'),
-                    "duration": video_info.get('duration'),
-                    "view_count": video_info.get('view_count'),
-                    "upload_date": video_info.get('upload_date'),
-                    "format_id": format_info.get('format_id'),
-                    "quality": format_info.get('quality'),
-                    "file_extension": format_info.get('ext'),
-                    "file_size": format_info.get('file_size'),
-                    "is_audio_only": format_info.get('ext') == 'mp3',
-                    "status": 'pending',
-                    "video_metadata": {
+            if self.connection_pool is None:
+                raise RuntimeError("Connection pool not initialized")
+            async with self.connection_pool.acquire() as conn:
+                download_id = await self._run_statement(
+                    conn, 'create_download', 'fetchval',
+                    task_id,
+                    user_id,
+                    original_url,
+                    video_info.get('title'),
+                    video_info.get('id'),
+                    video_info.get('platform'),
+                    video_info.get('uploader'),
+                    int(video_info['duration']) if video_info.get('duration') else None,
+                    video_info.get('view_count'),
+                    video_info.get('upload_date'),
+                    format_info.get('format_id'),
+                    format_info.get('quality'),
+                    format_info.get('ext'),
+                    format_info.get('file_size'),
+                    format_info.get('ext') == 'mp3',
+                    {
                         "video_info": video_info,
                         "format_info": format_info
-                    },
-                    "created_at": datetime.utcnow()
-                }
-
-                result = await session.execute(
-                    text("""
-                        INSERT INTO downloads 
-                        (task_id, user_id, original_url, video_title, video_id, platform, uploader, 
-                         duration, view_count, upload_date, format_id, quality, file_extension, 
-                         file_size, is_audio_only, status, video_metadata, created_at)
-                        VALUES 
-                        (:task_id, :user_id, :original_url, :video_title, :video_id, :platform, 
-                         :uploader, :duration, :view_count, :upload_date, :format_id, :quality, 
-                         :file_extension, :file_size, :is_audio_only, :status, :video_metadata, :created_at)
-                        RETURNING id
-                    """),
-                    download_data
+                    }
                 )
 
-                download_id = result.scalar()
-                await session.commit()
-
                 logger.info(f"✅ Created download record {download_id} for task {task_id}")
                 return int(download_id) if download_id else 0
 
@@ -375,6 +916,118 @@ class DatabaseManager:
             logger.error(f"❌ Failed to create download record: {e}")
             raise
 
+    async def create_download_records(self, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Bulk-create download records (e.g. playlists) via COPY; returns task_id -> id"""
+        if not records:
+            return {}
+
+        try:
+            if self.connection_pool is None:
+                raise RuntimeError("Connection pool not initialized")
+
+            rows = []
+            for record in records:
+                video_info = record['video_info']
+                format_info = record['format_info']
+                rows.append((
+                    record['task_id'],
+                    record['user_id'],
+                    record['original_url'],
+                    video_info.get('title'),
+                    video_info.get('id'),
+                    video_info.get('platform'),
+                    video_info.get('uploader'),
+                    int(video_info['duration']) if video_info.get('duration') else None,
+                    video_info.get('view_count'),
+                    video_info.get('upload_date'),
+                    format_info.get('format_id'),
+                    format_info.get('quality'),
+                    format_info.get('ext'),
+                    format_info.get('file_size'),
+                    format_info.get('ext') == 'mp3',
+                    {
+                        "video_info": video_info,
+                        "format_info": format_info
+                    }
+                ))
+
+            async with self.transaction() as conn:
+                # COPY into a constraint-free staging table, then one INSERT ... SELECT
+                await conn.execute(f"""
+                    CREATE TEMP TABLE download_staging ON COMMIT DROP AS
+                    SELECT {', '.join(_DOWNLOAD_COPY_COLUMNS)} FROM downloads WITH NO DATA
+                """)
+                await conn.copy_records_to_table(
+                    'download_staging',
+                    records=rows,
+                    columns=_DOWNLOAD_COPY_COLUMNS,
+                    timeout=30
+                )
+                inserted = await conn.fetch(f"""
+                    INSERT INTO downloads ({', '.join(_DOWNLOAD_COPY_COLUMNS)}, status)
+                    SELECT {', '.join(_DOWNLOAD_COPY_COLUMNS)}, 'pending'
+                    FROM download_staging
+                    RETURNING task_id, id
+                """)
+
+            logger.info(f"✅ Created {len(inserted)} download records")
+            return {row['task_id']: row['id'] for row in inserted}
+
+        except Exception as e:
+            logger.error(f"❌ Failed to create download records: {e}")
+            raise
+
+    async def import_download_records(self, records: List[Dict[str, Any]]) -> int:
+        """Bulk-load historical download rows (e.g. Download.to_dict() dumps) via binary COPY
+
+        Rows whose task_id already exists are skipped, so re-syncing the same dump is safe.
+        Returns the number of rows inserted.
+        """
+        if not records:
+            return 0
+
+        try:
+            if self.connection_pool is None:
+                raise RuntimeError("Connection pool not initialized")
+
+            # Tuples in column order; video_metadata stays a dict for the binary JSON codec and
+            # timestamps become datetimes so COPY sends them in their native binary form
+            rows = []
+            for record in records:
+                row = []
+                for column in _DOWNLOAD_IMPORT_COLUMNS:
+                    value = record.get(column)
+                    if column in _DOWNLOAD_TIMESTAMP_COLUMNS and isinstance(value, str):
+                        value = datetime.fromisoformat(value)
+                    row.append(value)
+                rows.append(tuple(row))
+
+            columns = ', '.join(_DOWNLOAD_IMPORT_COLUMNS)
+            async with self.transaction() as conn:
+                await conn.execute(f"""
+                    CREATE TEMP TABLE download_import ON COMMIT DROP AS
+                    SELECT {columns} FROM downloads WITH NO DATA
+                """)
+                await conn.copy_records_to_table(
+                    'download_import',
+                    records=rows,
+                    columns=_DOWNLOAD_IMPORT_COLUMNS,
+                    timeout=60
+                )
+                status = await conn.execute(f"""
+                    INSERT INTO downloads ({columns})
+                    SELECT {columns} FROM download_import
+                    ON CONFLICT (task_id) DO NOTHING
+                """)
+
+            inserted = int(status.rsplit(' ', 1)[-1])
+            logger.info(f"✅ Imported {inserted} of {len(rows)} download records")
+            return inserted
+
+        except Exception as e:
+            logger.error(f"❌ Failed to import download records: {e}")
+            raise
+
     async def update_download_progress(
         self,
         task_id: str,
@@ -389,53 +1042,66 @@ class DatabaseManager:
     ):
         """Update download progress in database"""
         try:
-            async with self.get_session() as session:
-                update_data = {
-                    "task_id": task_id,
-                    "status": status,
-                    "updated_at": datetime.utcnow()
-                }
+            fields = {
+                'download_time': download_time,
+                'upload_time': upload_time,
+                'download_speed': download_speed,
+                'upload_speed': upload_speed,
+                'error_message': error_message,
+                'telegram_message_id': telegram_message_id,
+                'telegram_chat_id': telegram_chat_id
+            }
+
+            if status not in _TERMINAL_STATUSES:
+                # Coalesce progress ticks; the flush loop writes them in one batch
+                pending = self._progress_buffer.setdefault(task_id, {})
+                pending['status'] = status
+                for key, value in fields.items():
+                    if value is not None:
+                        pending[key] = value
+                return
 
-                # Add optional fields if provided
-                if download_time is not None:
-                    update_data["download_time"] = download_time
-                if upload_time is not None:
-                    update_data["upload_time"] = upload_time
-                if download_speed is not None:
-                    update_data["download_speed"] = download_speed
-                if upload_speed is not None:
-                    update_data["upload_speed"] = upload_speed
-                if error_message is not None:
-                    update_data["error_message"] = error_message
-                if telegram_message_id is not None:
-                    update_data["telegram_message_id"] = telegram_message_id
-                if telegram_chat_id is not None:
-                    update_data["telegram_chat_id"] = telegram_chat_id
-
-                # Set completion timestamp for final statuses
-                if status in ['completed', 'failed', 'cancelled']:
-                    update_data["completed_at"] = datetime.utcnow()
-                elif status == 'downloading':
-                    update_data["started_at"] = datetime.utcnow()
-
-                # Build dynamic update query
-                set_clauses = []
-                for key in update_data.keys():
-                    if key != "task_id":
-                        set_clauses.append(f"{key} = :{key}")
-
-                query = f"""
-                    UPDATE downloads 
-                    SET {', '.join(set_clauses)}
-                    WHERE task_id = :task_id
-                """
-
-                await session.execute(text(query), update_data)
-                await session.commit()
+            if self.connection_pool is None:
+                raise RuntimeError("Connection pool not initialized")
+
+            # Terminal statuses are written immediately, folding in any buffered tick
+            async with self._progress_lock:
+                pending = self._progress_buffer.pop(task_id, {})
+                row = (task_id, status) + tuple(
+                    fields[key] if fields[key] is not None else pending.get(key)
+                    for key in _PROGRESS_FIELDS
+                )
+                async with self.connection_pool.acquire() as conn:
+                    # Fixed statement: unset (None) fields keep their current column value
+                    await self._run_statement(conn, 'update_download_progress', 'fetch', *row)
 
         except Exception as e:
             logger.error(f"❌ Failed to update download progress for {task_id}: {e}")
 
+    async def _flush_progress_loop(self):
+        """Periodically flush buffered progress updates"""
+        while True:
+            await asyncio.sleep(self.progress_flush_interval)
+            await self._flush_progress_buffer()
+
+    async def _flush_progress_buffer(self):
+        """Write all buffered progress updates with one executemany in a transaction"""
+        if not self._progress_buffer or self.connection_pool is None:
+            return
+
+        async with self._progress_lock:
+            pending, self._progress_buffer = self._progress_buffer, {}
+            rows = [
+                (task_id, update['status']) + tuple(update.get(key) for key in _PROGRESS_FIELDS)
+                for task_id, update in pending.items()
+            ]
+
+            try:
+                async with self.transaction() as conn:
+                    await conn.executemany(_PREPARED_SQL['update_download_progress'], rows)
+            except Exception as e:
+                logger.error(f"❌ Failed to flush {len(rows)} progress updates: {e}")
+
     async def get_user_stats(self, user_id: int) -> Dict[str, Any]:
         """Get comprehensive user statistics with caching (optimized)"""
         try:
@@ -448,56 +1114,21 @@ class DatabaseManager:
                 return cached_stats
 
             # Use a single optimized query instead of multiple queries
-            async with self.get_connection() as conn:
+            if self.connection_pool is None:
+                raise RuntimeError("Connection pool not initialized")
+            async with self.connection_pool.acquire() as conn:
                 # Single comprehensive query
-                result = await conn.fetchrow("""
-                    SELECT 
-                        u.total_downloads, u.successful_downloads, u.failed_downloads,
-                        u.total_bytes_downloaded, u.total_bytes_uploaded, u.created_at, u.last_active,
-                        COALESCE(AVG(d.download_speed), 0) as avg_download_speed,
-                        COALESCE(AVG(d.upload_speed), 0) as avg_upload_speed,
-                        COALESCE(MAX(d.download_speed), 0) as fastest_download_speed,
-                        COALESCE(AVG(d.download_time + d.upload_time), 0) as avg_processing_time,
-                        COALESCE(SUM(d.download_time), 0) as total_download_time,
-                        COALESCE(SUM(d.upload_time), 0) as total_upload_time,
-                        COALESCE(AVG(d.file_size), 0) as avg_file_size
-                    FROM users u
-                    LEFT JOIN downloads d ON u.user_id = d.user_id AND d.status = 'completed'
-                    WHERE u.user_id = $1
-                    GROUP BY u.user_id, u.total_downloads, u.successful_downloads, u.failed_downloads,
-                             u.total_bytes_downloaded, u.total_bytes_uploaded, u.created_at, u.last_active
-                """, user_id)
+                result = await self._run_statement(conn, 'user_stats', 'fetchrow', user_id)
 
                 if not result:
                     return {}
 
-                # Convert asyncpg Row to dict properly and handle nulls
-                stats = {
-                    'total_downloads': result['total_downloads'] if result['total_downloads'] is not None else 0,
-                    'successful_downloads': result['successful_downloads'] if result['successful_downloads'] is not None else 0,
-                    'failed_downloads': result['failed_downloads'] if result['failed_downloads'] is not None else 0,
-                    'total_bytes_downloaded': result['total_bytes_downloaded'] if result['total_bytes_downloaded'] is not None else 0,
-                    'total_bytes_uploaded': result['total_bytes_uploaded'] if result['total_bytes_uploaded'] is not None else 0,
-                    'created_at': result['created_at'],
-                    'last_active': result['last_active'],
-                    'avg_download_speed': result['avg_download_speed'],
-                    'avg_upload_speed': result['avg_upload_speed'],
-                    'fastest_download_speed': result['fastest_download_speed'],
-                    'avg_processing_time': result['avg_processing_time'],
-                    'total_download_time': result['total_download_time'],
-                    'total_upload_time': result['total_upload_time'],
-                    'avg_file_size': result['avg_file_size']
-                }
-
-                # Calculate success rate (handle null values)
-                success_rate = 0
-                total_downloads = stats['total_downloads']
-                successful_downloads = stats['successful_downloads']
-
-                if total_downloads > 0:
-                    success_rate = (successful_downloads / total_downloads) * 100
-
-                stats['success_rate'] = success_rate
+                # Convert asyncpg Row to dict and handle nulls in the user counters
+                stats = dict(result)
+                for key in ('total_downloads', 'successful_downloads', 'failed_downloads',
+                            'total_bytes_downloaded', 'total_bytes_uploaded', 'success_rate'):
+                    if stats[key] is None:
+                        stats[key] = 0
 
                 # Format timestamps
                 if stats.get('created_at'):
@@ -515,57 +1146,59 @@ class DatabaseManager:
             return {}
 
     async def get_user_settings(self, user_id: int) -> Dict[str, Any]:
-        """Get user settings"""
+        """Get user settings (served from a short-lived in-process cache)"""
         try:
+            cached = self._settings_cache.get(user_id)
+            if cached and cached[0] > time.monotonic():
+                self._settings_cache.move_to_end(user_id)
+                return dict(cached[1])
+
             if self.connection_pool is None:
                 raise RuntimeError("Connection pool not initialized")
             async with self.connection_pool.acquire() as conn:
-                result = await conn.fetchrow(
-                    "SELECT settings FROM users WHERE user_id = $1",
-                    user_id
-                )
+                stored_settings = await self._run_statement(conn, 'user_settings', 'fetchval', user_id)
 
-                if result and result['settings']:
-                    return result['settings']
-                else:
-                    # Return default settings
-                    return {
-                        'default_quality': 'best',
-                        'default_format': 'mp4',
-                        'progress_notifications': True,
-                        'completion_notifications': True,
-                        'error_notifications': True,
-                        'auto_cleanup': True,
-                        'fast_mode': True,
-                        'generate_thumbnails': True
-                    }
+            if stored_settings:
+                user_settings = stored_settings
+            else:
+                # Return default settings
+                user_settings = dict(DEFAULT_USER_SETTINGS)
+
+            self._cache_user_settings(user_id, user_settings)
+            return dict(user_settings)
 
         except Exception as e:
             logger.error(f"❌ Failed to get user settings for {user_id}: {e}")
             return {}
 
+    def _cache_user_settings(self, user_id: int, user_settings: Dict[str, Any]):
+        """Store settings in the TTL/LRU cache, evicting the oldest entry when full"""
+        self._settings_cache[user_id] = (time.monotonic() + self.settings_cache_ttl, user_settings)
+        self._settings_cache.move_to_end(user_id)
+        if len(self._settings_cache) > self.settings_cache_size:
+            self._settings_cache.popitem(last=False)
+
     async def update_user_settings(self, user_id: int, settings_update: Dict[str, Any]):
         """Update user settings"""
         try:
             if self.connection_pool is None:
                 raise RuntimeError("Connection pool not initialized")
             async with self.connection_pool.acquire() as conn:
-                # Get current settings
-                current_settings = await self.get_user_settings(user_id)
-
-                # Merge with updates
-                current_settings.update(settings_update)
+                # Merge server-side in one statement (defaults fill in a NULL settings column)
+                merged = await self._run_statement(
+                    conn, 'merge_user_settings', 'fetchval', settings_update, dict(DEFAULT_USER_SETTINGS), user_id
+                )
 
-                # Update in database
-                await conn.execute("""
-                    UPDATE users 
-                    SET settings = $1, updated_at = $2
-                    WHERE user_id = $3
-                """, current_settings, datetime.utcnow(), user_id)
+            # Keep the settings cache coherent with what was just written
+            if merged is not None:
+                self._cache_user_settings(user_id, merged)
+            else:
+                self._settings_cache.pop(user_id, None)
 
-                logger.info(f"✅ Updated settings for user {user_id}")
+            logger.info(f"✅ Updated settings for user {user_id}")
 
         except Exception as e:
+            self._settings_cache.pop(user_id, None)
             logger.error(f"❌ Failed to update user settings for {user_id}: {e}")
 
     async def get_global_stats(self) -> Dict[str, Any]:
@@ -574,31 +1207,23 @@ class DatabaseManager:
             if self.connection_pool is None:
                 raise RuntimeError("Connection pool not initialized")
             async with self.connection_pool.acquire() as conn:
-                # Get user statistics
-                user_stats = await conn.fetchrow("""
-                    SELECT 
-                        COUNT(*) as total_users,
-                        COUNT(CASE WHEN last_active > NOW() - INTERVAL '1 day' THEN 1 END) as active_today,
-                        COUNT(CASE WHEN created_at > NOW() - INTERVAL '1 day' THEN 1 END) as new_users_24h
-                    FROM users
-                """)
-
-                # Get download statistics
-                download_stats = await conn.fetchrow("""
+                # Users and downloads aggregates in a single round trip
+                row = await conn.fetchrow("""
                     SELECT 
+                        (SELECT COUNT(*) FROM users) as total_users,
+                        (SELECT COUNT(*) FROM users WHERE last_active > NOW() - INTERVAL '1 day') as active_today,
+                        (SELECT COUNT(*) FROM users WHERE created_at > NOW() - INTERVAL '1 day') as new_users_24h,
                         COUNT(*) as total_downloads,
-                        COUNT(CASE WHEN status = 'completed' THEN 1 END) as successful_downloads,
-                        COUNT(CASE WHEN status = 'failed' THEN 1 END) as failed_downloads,
-                        SUM(CASE WHEN status = 'completed' THEN file_size ELSE 0 END) as total_data_processed,
-                        SUM(CASE WHEN status = 'completed' AND created_at > NOW() - INTERVAL '1 day' THEN file_size ELSE 0 END) as data_today,
-                        AVG(CASE WHEN status = 'completed' THEN download_speed END) as avg_speed,
-                        MAX(CASE WHEN status = 'completed' THEN download_speed END) as peak_speed
+                        COUNT(*) FILTER (WHERE status = 'completed') as successful_downloads,
+                        COUNT(*) FILTER (WHERE status = 'failed') as failed_downloads,
+                        COALESCE(SUM(file_size) FILTER (WHERE status = 'completed'), 0) as total_data_processed,
+                        COALESCE(SUM(file_size) FILTER (WHERE status = 'completed' AND created_at > NOW() - INTERVAL '1 day'), 0) as data_today,
+                        AVG(download_speed) FILTER (WHERE status = 'completed') as avg_speed,
+                        MAX(download_speed) FILTER (WHERE status = 'completed') as peak_speed
                     FROM downloads
                 """)
 
-                # Calculate additional metrics
-                stats = dict(user_stats)
-                stats.update(dict(download_stats))
+                stats = dict(row)
 
                 # Calculate success rate
                 if stats['total_downloads'] > 0:
@@ -619,36 +1244,67 @@ class DatabaseManager:
             return {}
 
     async def get_database_stats(self) -> Dict[str, Any]:
-        """Get database performance statistics"""
+        """Get database performance statistics (cached, refreshed in the background)"""
+        expires_at, cached_stats = self._db_stats_cache
+        if cached_stats is not None and time.monotonic() < expires_at:
+            return cached_stats
+
+        # Shield so a cancelled caller does not abort a refresh other callers rely on
+        return await asyncio.shield(self._start_db_stats_refresh())
+
+    def _start_db_stats_refresh(self) -> asyncio.Task:
+        """Return the in-flight stats refresh, starting one if none is running"""
+        if self._db_stats_refresh is None or self._db_stats_refresh.done():
+            self._db_stats_refresh = asyncio.create_task(
+                self._refresh_database_stats(), name="db-stats-refresh"
+            )
+        return self._db_stats_refresh
+
+    async def _refresh_database_stats(self) -> Dict[str, Any]:
+        """Collect database statistics and store them in the cache"""
+        stats = await self._collect_database_stats()
+        if stats.get('connected'):
+            self._db_stats_cache = (time.monotonic() + self.db_stats_ttl, stats)
+        return stats
+
+    async def _db_stats_refresh_loop(self):
+        """Keep the database statistics cache warm"""
+        while True:
+            await asyncio.shield(self._start_db_stats_refresh())
+            await asyncio.sleep(self.db_stats_refresh_interval)
+
+    async def _collect_database_stats(self) -> Dict[str, Any]:
+        """Query database size, table sizes and row counts"""
         try:
             if self.connection_pool is None:
                 raise RuntimeError("Connection pool not initialized")
-            async with self.connection_pool.acquire() as conn:
-                # Check connection
-                await conn.fetchval("SELECT 1")
+            # Independent queries overlapped across two connections (acquire proves connectivity)
+            async with self.connection_pool.acquire() as conn, self.connection_pool.acquire() as conn2:
+                summary, table_sizes = await asyncio.gather(
+                    # Get database size plus user and download counts
+                    conn.fetchrow("""
+                        SELECT 
+                            pg_size_pretty(pg_database_size(current_database())) as db_size,
+                            (SELECT COUNT(*) FROM users) as total_users,
+                            (SELECT COUNT(*) FROM downloads) as total_downloads
+                    """),
+                    # Get table sizes
+                    conn2.fetch("""
+                        SELECT 
+                            schemaname as schema,
+                            tablename as table,
+                            pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename)) as size,
+                            pg_total_relation_size(schemaname||'.'||tablename) as bytes
+                        FROM pg_tables 
+                        WHERE schemaname = 'public'
+                        ORDER BY pg_total_relation_size(schemaname||'.'||tablename) DESC
+                        LIMIT 10
+                    """)
+                )
                 connected = True
-
-                # Get database size
-                db_size = await conn.fetchval("""
-                    SELECT pg_size_pretty(pg_database_size(current_database()))
-                """)
-
-                # Get table sizes
-                table_sizes = await conn.fetch("""
-                    SELECT 
-                        schemaname as schema,
-                        tablename as table,
-                        pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename)) as size,
-                        pg_total_relation_size(schemaname||'.'||tablename) as bytes
-                    FROM pg_tables 
-                    WHERE schemaname = 'public'
-                    ORDER BY pg_total_relation_size(schemaname||'.'||tablename) DESC
-                    LIMIT 10
-                """)
-
-                # Get user and download counts
-                total_users = await conn.fetchval("SELECT COUNT(*) FROM users")
-                total_downloads = await conn.fetchval("SELECT COUNT(*) FROM downloads")
+                db_size = summary['db_size']
+                total_users = summary['total_users']
+                total_downloads = summary['total_downloads']
 
                 return {
                     'connected': connected,
@@ -668,32 +1324,29 @@ class DatabaseManager:
         try:
             if self.connection_pool is None:
                 raise RuntimeError("Connection pool not initialized")
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
 
+            # Whole expired months go in O(1); the batched DELETE below trims the boundary month
+            dropped_partitions = await self._drop_expired_partitions(days)
+            if dropped_partitions:
+                logger.info(f"🗑️ Dropped {dropped_partitions} expired partitions")
+
+            deleted_downloads = deleted_stats = deleted_errors = 0
             async with self.connection_pool.acquire() as conn:
-                # Clean up old completed downloads
-                deleted_downloads = await conn.fetchval("""
-                    DELETE FROM downloads 
-                    WHERE status IN ('completed', 'failed', 'cancelled') 
-                    AND completed_at < $1
-                    RETURNING COUNT(*)
-                """, cutoff_date)
-
-                # Clean up old system stats
-                deleted_stats = await conn.fetchval("""
-                    DELETE FROM system_stats 
-                    WHERE timestamp < $1
-                    RETURNING COUNT(*)
-                """, cutoff_date)
-
-                # Clean up old error logs
-                deleted_errors = await conn.fetchval("""
-                    DELETE FROM error_logs 
-                    WHERE created_at < $1 AND resolved = true
-                    RETURNING COUNT(*)
-                """, cutoff_date)
-
-                logger.info(f"🗑️ Cleaned up {deleted_downloads} downloads, {deleted_stats} stats, {deleted_errors} errors")
+                # One round trip per batch across all three tables; short batches keep row locks brief
+                while True:
+                    downloads, stats, errors = await conn.fetchrow(
+                        _CLEANUP_BATCH_SQL, days, self.cleanup_batch_size
+                    )
+                    deleted_downloads += downloads
+                    deleted_stats += stats
+                    deleted_errors += errors
+                    if max(downloads, stats, errors) < self.cleanup_batch_size:
+                        break
+
+                    # Let concurrent writers in between batches
+                    await asyncio.sleep(0.05)
+
+            logger.info(f"🗑️ Cleaned up {deleted_downloads} downloads, {deleted_stats} stats, {deleted_errors} errors")
 
         except Exception as e:
             logger.error(f"❌ Failed to cleanup old records: {e}")
@@ -710,25 +1363,119 @@ class DatabaseManager:
         severity: str = 'error',
         request_data: Optional[Dict[str, Any]] = None
     ):
-        """Log error to database"""
-        try:
-            if self.connection_pool is None:
-                raise RuntimeError("Connection pool not initialized")
-            async with self.connection_pool.acquire() as conn:
-                await conn.execute("""
-                    INSERT INTO error_logs 
-                    (error_type, error_message, error_traceback, user_id, url, platform, 
-                     task_id, severity, request_data, created_at)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                """, error_type, error_message, error_traceback, user_id, url, platform,
-                   task_id, severity, request_data, datetime.utcnow())
+        """Queue an error for the background error_logs writer"""
+        pool = self.connection_pool
+        if self._shutting_down.is_set() or pool is None or pool.is_closing():
+            # Never hold up shutdown on the database; keep the error in the application log
+            logger.error(f"❌ [{severity}] {error_type}: {error_message} (not stored: database unavailable)")
+            return
+
+        if severity not in ERROR_SEVERITIES:
+            severity = 'error'  # One bad label would otherwise fail the whole batch on the ENUM cast
+        self._error_queue.put_nowait((
+            error_type, error_message, error_traceback, user_id, url, platform,
+            task_id, severity, request_data
+        ))
+
+    async def _flush_error_loop(self):
+        """Drain queued errors into error_logs in batches"""
+        while True:
+            rows = [await self._error_queue.get()]
+            try:
+                # Give a burst of failures time to coalesce into one INSERT
+                await asyncio.sleep(self.error_flush_timeout)
+            except asyncio.CancelledError:
+                for row in rows:
+                    self._error_queue.put_nowait(row)
+                raise
+            await self._flush_error_queue(rows)
+
+    async def _flush_error_queue(self, rows: Optional[List[tuple]] = None):
+        """Write queued errors in one batch (COPY or executemany)"""
+        if rows is None:
+            rows = []
+        while len(rows) < self.error_batch_size and not self._error_queue.empty():
+            rows.append(self._error_queue.get_nowait())
+        if not rows or self.connection_pool is None:
+            return
 
+        try:
+            await self._bulk_insert(
+                'error_logs', _ERROR_LOG_COLUMNS, rows,
+                statement='log_error', synchronous_commit=False  # Error logs may be lost on a crash
+            )
         except Exception as e:
-            logger.error(f"❌ Failed to log error: {e}")
+            logger.error(f"❌ Failed to log {len(rows)} errors: {e}")
+
+    def record_system_stats(self, **metrics):
+        """Buffer a system_stats sample; unknown metric names go into custom_metrics"""
+        custom_metrics = metrics.pop('custom_metrics', None) or {}
+        known = _SYSTEM_STATS_COLUMNS[1:-1]
+        for name in list(metrics):
+            if name not in known:
+                custom_metrics[name] = metrics.pop(name)
+
+        self._stats_buffer.append(
+            (datetime.now(timezone.utc),)
+            + tuple(metrics.get(name) for name in known)
+            + (custom_metrics or None,)
+        )
+
+    async def _flush_stats_loop(self):
+        """Periodically write buffered system stats"""
+        while True:
+            await asyncio.sleep(self.stats_flush_interval)
+            await self._flush_stats_buffer()
+
+    async def _flush_stats_buffer(self):
+        """Write all buffered system stats samples in one batch"""
+        if not self._stats_buffer or self.connection_pool is None:
+            return
+
+        rows = list(self._stats_buffer)
+        self._stats_buffer.clear()
+        try:
+            await self._bulk_insert('system_stats', _SYSTEM_STATS_COLUMNS, rows, synchronous_commit=False)
+        except Exception as e:
+            logger.error(f"❌ Failed to flush {len(rows)} system stats samples: {e}")
 
     async def close_all_connections(self):
         """Close all database connections"""
+        self._shutting_down.set()
         try:
+            if self._db_stats_task:
+                self._db_stats_task.cancel()
+                await asyncio.gather(self._db_stats_task, return_exceptions=True)
+                self._db_stats_task = None
+            if self._db_stats_refresh:
+                self._db_stats_refresh.cancel()
+                await asyncio.gather(self._db_stats_refresh, return_exceptions=True)
+                self._db_stats_refresh = None
+
+            if self._progress_flush_task:
+                self._progress_flush_task.cancel()
+                await asyncio.gather(self._progress_flush_task, return_exceptions=True)
+                self._progress_flush_task = None
+                await self._flush_progress_buffer()
+
+            if self._flush_stats_task:
+                self._flush_stats_task.cancel()
+                await asyncio.gather(self._flush_stats_task, return_exceptions=True)
+                self._flush_stats_task = None
+                await self._flush_stats_buffer()
+
+            if self._partition_task:
+                self._partition_task.cancel()
+                await asyncio.gather(self._partition_task, return_exceptions=True)
+                self._partition_task = None
+
+            if self._error_flusher_task:
+                self._error_flusher_task.cancel()
+                await asyncio.gather(self._error_flusher_task, return_exceptions=True)
+                self._error_flusher_task = None
+                while not self._error_queue.empty():
+                    await self._flush_error_queue()
+
             if self.connection_pool:
                 await self.connection_pool.close()
                 self.connection_pool = None
@@ -745,20 +1492,25 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"❌ Error closing database connections: {e}")
 
-    async def health_check(self) -> Dict[str, Any]:
-        """Perform database health check"""
-        try:
-            if not self.connection_pool:
-                return {'healthy': False, 'error': 'Connection pool not initialized'}
+    async def health_check(self, deep: bool = False) -> Dict[str, Any]:
+        """Perform database health check (pool state, with a periodic SELECT 1)"""
+        pool = self.connection_pool
+        if pool is None or pool.is_closing():
+            return {'healthy': False, 'error': 'Connection pool not initialized'}
 
-            async with self.connection_pool.acquire() as conn:
-                # Test basic query
-                result = await conn.fetchval("SELECT 1")
+        status = {'healthy': True, 'connected': True, 'size': pool.get_size(), 'idle': pool.get_idle_size()}
 
+        # Only hit the server when asked or when the last round trip is stale
+        if deep or time.monotonic() - self._last_deep_check > self.deep_check_interval:
+            self._last_deep_check = time.monotonic()
+            try:
+                result = await pool.fetchval("SELECT 1")
                 if result == 1:
-                    return {'healthy': True, 'connected': True}
+                    self._cached_health = {'healthy': True, 'connected': True}
                 else:
-                    return {'healthy': False, 'error': 'Unexpected query result'}
+                    self._cached_health = {'healthy': False, 'error': 'Unexpected query result'}
+            except Exception as e:
+                self._cached_health = {'healthy': False, 'error': str(e), 'connected': False}
 
-        except Exception as e:
-            return {'healthy': False, 'error': str(e), 'connected': False}
\ No newline at end of file
+        status.update(self._cached_health)
+        return status
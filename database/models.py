@@ -4,18 +4,51 @@ Defines all database tables and relationships using SQLAlchemy
 """
 
 import asyncio
+import json
 from datetime import datetime, timezone
+from types import MappingProxyType
 from typing import Optional, Dict, Any, List
 from sqlalchemy import (
     Column, Integer, String, BigInteger, DateTime, Boolean, 
-    Text, Float, JSON, Index, ForeignKey
+    Text, Float, Index, ForeignKey, Identity, Computed, Enum as SAEnum
 )
+from sqlalchemy.dialects.postgresql import CITEXT, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 Base = declarative_base()
 
+# Settings for users that have none stored yet (read-only; copy before mutating)
+DEFAULT_USER_SETTINGS = MappingProxyType({
+    'default_quality': 'best',
+    'default_format': 'mp4',
+    'progress_notifications': True,
+    'completion_notifications': True,
+    'error_notifications': True,
+    'auto_cleanup': True,
+    'fast_mode': True,
+    'generate_thumbnails': True
+})
+# Server-side column default, so inserts never build the settings dict in Python
+DEFAULT_USER_SETTINGS_SQL = "'{}'::jsonb".format(json.dumps(dict(DEFAULT_USER_SETTINGS)))
+
+# Stored success percentage, computed by PostgreSQL whenever the counters change
+SUCCESS_RATE_SQL = (
+    "CASE WHEN COALESCE(total_downloads, 0) = 0 THEN 0 "
+    "ELSE COALESCE(successful_downloads, 0)::float8 / total_downloads * 100 END"
+)
+
+# Closed value sets stored as PostgreSQL ENUM types (4 bytes per row instead of a varchar)
+DOWNLOAD_STATUSES = ('pending', 'downloading', 'uploading', 'completed', 'failed', 'cancelled')
+ERROR_SEVERITIES = ('debug', 'info', 'warning', 'error', 'critical')
+download_status_enum = SAEnum(*DOWNLOAD_STATUSES, name='download_status_t')
+severity_enum = SAEnum(*ERROR_SEVERITIES, name='severity_t')
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    """Serialize an optional datetime for to_dict()"""
+    return value.isoformat() if value is not None else None
+
 class User(Base):
     """User model for storing user information and statistics"""
     __tablename__ = 'users'
@@ -25,24 +58,16 @@ class User(Base):
     
     # Telegram user information
     user_id = Column(BigInteger, unique=True, nullable=False, index=True)
-    username = Column(String(255), nullable=True)
-    first_name = Column(String(255), nullable=True)
-    last_name = Column(String(255), nullable=True)
+    # Telegram limits: usernames 32 chars (case-insensitive), names 64 chars
+    username = Column(CITEXT, nullable=True)
+    first_name = Column(String(64), nullable=True)
+    last_name = Column(String(64), nullable=True)
     
     # Chat information
     chat_id = Column(BigInteger, nullable=True)
     
-    # User settings (stored as JSON)
-    settings = Column(JSON, default=lambda: {
-        'default_quality': 'best',
-        'default_format': 'mp4',
-        'progress_notifications': True,
-        'completion_notifications': True,
-        'error_notifications': True,
-        'auto_cleanup': True,
-        'fast_mode': True,
-        'generate_thumbnails': True
-    })
+    # User settings (stored as JSONB)
+    settings = Column(JSONB, nullable=False, server_default=text(DEFAULT_USER_SETTINGS_SQL))
     
     # Statistics
     total_downloads = Column(Integer, default=0)
@@ -50,75 +75,65 @@ class User(Base):
     failed_downloads = Column(Integer, default=0)
     total_bytes_downloaded = Column(BigInteger, default=0)
     total_bytes_uploaded = Column(BigInteger, default=0)
+    success_rate = Column(Float, Computed(SUCCESS_RATE_SQL, persisted=True))
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), default=func.now())
-    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
-    last_active = Column(DateTime(timezone=True), default=func.now())
+    created_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now(), onupdate=func.now())
+    last_active = Column(DateTime(timezone=True), default=func.now(), server_default=func.now())
     
     # Premium features
     is_premium = Column(Boolean, default=False)
     premium_expires = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
-    downloads = relationship("Download", back_populates="user", cascade="all, delete-orphan")
-    user_analytics = relationship("UserAnalytics", back_populates="user", cascade="all, delete-orphan")
+    # Rows are removed by the ON DELETE CASCADE foreign keys, not loaded and deleted one by one
+    downloads = relationship("Download", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    user_analytics = relationship("UserAnalytics", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
     
     # Indexes
     __table_args__ = (
-        Index('idx_users_user_id', 'user_id'),
         Index('idx_users_username', 'username'),
         Index('idx_users_created_at', 'created_at'),
         Index('idx_users_last_active', 'last_active'),
     )
     
+    # (attribute, converter) pairs emitted by to_dict
+    _DICT_FIELDS = (
+        ('id', None), ('user_id', None), ('username', None), ('first_name', None),
+        ('last_name', None), ('chat_id', None), ('settings', None),
+        ('total_downloads', None), ('successful_downloads', None), ('failed_downloads', None),
+        ('total_bytes_downloaded', None), ('total_bytes_uploaded', None), ('success_rate', None),
+        ('created_at', _isoformat), ('updated_at', _isoformat), ('last_active', _isoformat),
+        ('is_premium', None), ('premium_expires', _isoformat)
+    )
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert user to dictionary"""
         return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'username': self.username,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'chat_id': self.chat_id,
-            'settings': self.settings,
-            'total_downloads': self.total_downloads,
-            'successful_downloads': self.successful_downloads,
-            'failed_downloads': self.failed_downloads,
-            'total_bytes_downloaded': self.total_bytes_downloaded,
-            'total_bytes_uploaded': self.total_bytes_uploaded,
-            'created_at': self.created_at.isoformat() if self.created_at is not None else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at is not None else None,
-            'last_active': self.last_active.isoformat() if self.last_active is not None else None,
-            'is_premium': self.is_premium,
-            'premium_expires': self.premium_expires.isoformat() if self.premium_expires is not None else None
+            name: getattr(self, name) if convert is None else convert(getattr(self, name))
+            for name, convert in self._DICT_FIELDS
         }
     
-    @property
-    def success_rate(self) -> float:
-        """Calculate user's download success rate"""
-        if not self.total_downloads or self.total_downloads == 0:
-            return 0.0
-        return float((self.successful_downloads / self.total_downloads) * 100)
 
 class Download(Base):
     """Download model for tracking individual downloads"""
     __tablename__ = 'downloads'
     
     # Primary key
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    id = Column(BigInteger, Identity(always=False), primary_key=True)
     
     # Task tracking
     task_id = Column(String(255), unique=True, nullable=False, index=True)
     
     # User relationship
-    user_id = Column(BigInteger, ForeignKey('users.user_id'), nullable=False, index=True)
+    user_id = Column(BigInteger, ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
     
     # Video information
     original_url = Column(Text, nullable=False)
     video_title = Column(Text, nullable=True)
     video_id = Column(String(255), nullable=True)
-    platform = Column(String(100), nullable=True, index=True)
+    platform = Column(String(100), nullable=True)
     uploader = Column(String(255), nullable=True)
     duration = Column(Integer, nullable=True)  # in seconds
     view_count = Column(BigInteger, nullable=True)
@@ -138,18 +153,18 @@ class Download(Base):
     upload_speed = Column(Float, nullable=True)   # bytes per second
     
     # Status and result
-    status = Column(String(50), default='pending', index=True)  # pending, downloading, uploading, completed, failed, cancelled
+    status = Column(download_status_enum, default='pending')
     error_message = Column(Text, nullable=True)
     
     # Telegram upload info
     telegram_message_id = Column(BigInteger, nullable=True)
     telegram_chat_id = Column(BigInteger, nullable=True)
     
-    # Additional video metadata (stored as JSON)
-    video_metadata = Column(JSON, nullable=True)
+    # Additional video metadata (stored as JSONB)
+    video_metadata = Column(JSONB, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), default=func.now())
+    created_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now())
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
@@ -160,41 +175,26 @@ class Download(Base):
     __table_args__ = (
         Index('idx_downloads_user_downloads', 'user_id', 'created_at'),
         Index('idx_downloads_platform_status', 'platform', 'status'),
-        Index('idx_downloads_created_at', 'created_at'),
-        Index('idx_downloads_status', 'status'),
+        Index('idx_downloads_created_at_brin', 'created_at', postgresql_using='brin'),
     )
     
+    # (attribute, converter) pairs emitted by to_dict
+    _DICT_FIELDS = (
+        ('id', None), ('task_id', None), ('user_id', None), ('original_url', None),
+        ('video_title', None), ('video_id', None), ('platform', None), ('uploader', None),
+        ('duration', None), ('view_count', None), ('upload_date', None), ('format_id', None),
+        ('quality', None), ('file_extension', None), ('file_size', None), ('is_audio_only', None),
+        ('download_time', None), ('upload_time', None), ('download_speed', None),
+        ('upload_speed', None), ('status', None), ('error_message', None),
+        ('telegram_message_id', None), ('telegram_chat_id', None), ('video_metadata', None),
+        ('created_at', _isoformat), ('started_at', _isoformat), ('completed_at', _isoformat)
+    )
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert download to dictionary"""
         return {
-            'id': self.id,
-            'task_id': self.task_id,
-            'user_id': self.user_id,
-            'original_url': self.original_url,
-            'video_title': self.video_title,
-            'video_id': self.video_id,
-            'platform': self.platform,
-            'uploader': self.uploader,
-            'duration': self.duration,
-            'view_count': self.view_count,
-            'upload_date': self.upload_date,
-            'format_id': self.format_id,
-            'quality': self.quality,
-            'file_extension': self.file_extension,
-            'file_size': self.file_size,
-            'is_audio_only': self.is_audio_only,
-            'download_time': self.download_time,
-            'upload_time': self.upload_time,
-            'download_speed': self.download_speed,
-            'upload_speed': self.upload_speed,
-            'status': self.status,
-            'error_message': self.error_message,
-            'telegram_message_id': self.telegram_message_id,
-            'telegram_chat_id': self.telegram_chat_id,
-            'video_metadata': self.video_metadata,
-            'created_at': self.created_at.isoformat() if self.created_at is not None else None,
-            'started_at': self.started_at.isoformat() if self.started_at is not None else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at is not None else None
+            name: getattr(self, name) if convert is None else convert(getattr(self, name))
+            for name, convert in self._DICT_FIELDS
         }
 
 class UserAnalytics(Base):
@@ -202,13 +202,13 @@ class UserAnalytics(Base):
     __tablename__ = 'user_analytics'
     
     # Primary key
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    id = Column(BigInteger, Identity(always=False), primary_key=True)
     
     # User relationship
-    user_id = Column(BigInteger, ForeignKey('users.user_id'), nullable=False, index=True)
+    user_id = Column(BigInteger, ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
     
     # Date for daily analytics
-    date = Column(DateTime(timezone=True), default=func.now(), index=True)
+    date = Column(DateTime(timezone=True), default=func.now(), server_default=func.now())
     
     # Daily statistics
     downloads_count = Column(Integer, default=0)
@@ -218,10 +218,10 @@ class UserAnalytics(Base):
     bytes_uploaded = Column(BigInteger, default=0)
     
     # Platform usage
-    platform_stats = Column(JSON, default=dict)  # {"youtube": 5, "tiktok": 2, etc.}
+    platform_stats = Column(JSONB, default=dict)  # {"youtube": 5, "tiktok": 2, etc.}
     
     # Quality preferences
-    quality_stats = Column(JSON, default=dict)   # {"1080p": 3, "720p": 4, etc.}
+    quality_stats = Column(JSONB, default=dict)   # {"1080p": 3, "720p": 4, etc.}
     
     # Performance metrics
     avg_download_speed = Column(Float, nullable=True)
@@ -241,11 +241,12 @@ class SystemStats(Base):
     """System statistics model for monitoring bot performance"""
     __tablename__ = 'system_stats'
     
-    # Primary key
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    # Primary key (includes the partition key, as PostgreSQL requires)
+    # BIGSERIAL rather than IDENTITY: identity columns on partitioned tables need PostgreSQL 17+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
     
     # Timestamp
-    timestamp = Column(DateTime(timezone=True), default=func.now(), index=True)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, default=func.now(), server_default=func.now())
     
     # System metrics
     cpu_usage = Column(Float, nullable=True)
@@ -268,12 +269,14 @@ class SystemStats(Base):
     requests_per_minute = Column(Float, nullable=True)
     error_rate = Column(Float, nullable=True)
     
-    # Additional metrics (stored as JSON)
-    custom_metrics = Column(JSON, nullable=True)
+    # Additional metrics (stored as JSONB)
+    custom_metrics = Column(JSONB, nullable=True)
     
     # Indexes
     __table_args__ = (
-        Index('idx_system_stats_timestamp', 'timestamp'),
+        Index('idx_system_stats_timestamp_brin', 'timestamp', postgresql_using='brin'),
+        # Monthly partitions, see DatabaseManager._ensure_partitions
+        {'postgresql_partition_by': 'RANGE ("timestamp")'},
     )
 
 class Platform(Base):
@@ -292,6 +295,7 @@ class Platform(Base):
     total_downloads = Column(BigInteger, default=0)
     successful_downloads = Column(BigInteger, default=0)
     failed_downloads = Column(BigInteger, default=0)
+    success_rate = Column(Float, Computed(SUCCESS_RATE_SQL, persisted=True))
     
     # Platform capabilities
     supports_video = Column(Boolean, default=True)
@@ -299,60 +303,53 @@ class Platform(Base):
     supports_playlists = Column(Boolean, default=False)
     max_quality = Column(String(50), nullable=True)
     
-    # Platform-specific settings (stored as JSON)
-    settings = Column(JSON, nullable=True)
+    # Platform-specific settings (stored as JSONB)
+    settings = Column(JSONB, nullable=True)
     
     # Status
     is_active = Column(Boolean, default=True)
     last_successful_download = Column(DateTime(timezone=True), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), default=func.now())
-    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Indexes
     __table_args__ = (
-        Index('idx_platforms_name', 'name'),
         Index('idx_platforms_active', 'is_active'),
     )
-    
-    @property
-    def success_rate(self) -> float:
-        """Calculate platform's success rate"""
-        if not self.total_downloads or self.total_downloads == 0:
-            return 0.0
-        return float((self.successful_downloads / self.total_downloads) * 100)
 
 class ErrorLog(Base):
     """Error log model for tracking and debugging errors"""
     __tablename__ = 'error_logs'
     
-    # Primary key
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    # Primary key (includes the created_at partition key, as PostgreSQL requires)
+    # BIGSERIAL rather than IDENTITY: identity columns on partitioned tables need PostgreSQL 17+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
     
     # Error information
-    error_type = Column(String(100), nullable=False, index=True)
+    error_type = Column(String(100), nullable=False)
     error_message = Column(Text, nullable=False)
     error_traceback = Column(Text, nullable=True)
     
     # Context information
-    user_id = Column(BigInteger, nullable=True, index=True)
+    user_id = Column(BigInteger, nullable=True)
     url = Column(Text, nullable=True)
     platform = Column(String(100), nullable=True)
     task_id = Column(String(255), nullable=True)
     
-    # Request context (stored as JSON)
-    request_data = Column(JSON, nullable=True)
+    # Request context (stored as JSONB)
+    request_data = Column(JSONB, nullable=True)
     
     # Error severity
-    severity = Column(String(20), default='error', index=True)  # debug, info, warning, error, critical
+    severity = Column(severity_enum, default='error')
     
     # Resolution status
     resolved = Column(Boolean, default=False, index=True)
     resolution_notes = Column(Text, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), primary_key=True, default=func.now(), server_default=func.now())
     resolved_at = Column(DateTime(timezone=True), nullable=True)
     
     # Indexes
@@ -360,6 +357,9 @@ class ErrorLog(Base):
         Index('idx_errors_type_created', 'error_type', 'created_at'),
         Index('idx_errors_user_errors', 'user_id', 'created_at'),
         Index('idx_errors_severity_resolved', 'severity', 'resolved'),
+        Index('idx_errors_created_at_brin', 'created_at', postgresql_using='brin'),
+        # Monthly partitions, see DatabaseManager._ensure_partitions
+        {'postgresql_partition_by': 'RANGE (created_at)'},
     )
 
 # Create all indexes and constraints
@@ -4,23 +4,425 @@ Handles button presses and interactive elements
 """
 
 import asyncio
+import functools
 import logging
-from typing import Dict, Any, List, Optional
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, Any, List, Optional, Tuple
+
+import orjson
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
+from telegram.error import BadRequest
 
+from config.settings import settings
 from services.downloader import VideoDownloader
 from services.file_manager import FileManager
 from services.progress_tracker import ProgressTracker
 from database.connection import DatabaseManager
 from services.cache_manager import CacheManager
+from handlers.commands import CommandHandlers
 from utils.formatters import format_file_size, format_duration
-from utils.helpers import create_format_selection_keyboard, create_download_progress_message
+from utils.helpers import (
+    create_format_selection_keyboard, create_download_progress_message, is_message_not_modified, shared_http_session
+)
 from static.icons import Icons
 
+# Icons bound to module globals once, so templates skip the class attribute lookup
+(
+    ADVANCED, BACK, CANCEL, CANCELLED, CLEANUP, DEVELOPER, DOWNLOAD, ERROR, FEATURES,
+    FORMAT, HELP, HISTORY, LINK, NEW_DOWNLOAD, NOTIFICATIONS, PLATFORM, PROGRESS, QUALITY,
+    REASON, REFRESH, RESET, RETRY, ROBOT, SETTINGS, SIZE, SPEED, STAR, SUCCESS, TIME, TIP,
+    UPLOAD, VIDEO, WARNING
+) = (
+    Icons.ADVANCED, Icons.BACK, Icons.CANCEL, Icons.CANCELLED, Icons.CLEANUP,
+    Icons.DEVELOPER, Icons.DOWNLOAD, Icons.ERROR, Icons.FEATURES, Icons.FORMAT, Icons.HELP,
+    Icons.HISTORY, Icons.LINK, Icons.NEW_DOWNLOAD, Icons.NOTIFICATIONS, Icons.PLATFORM,
+    Icons.PROGRESS, Icons.QUALITY, Icons.REASON, Icons.REFRESH, Icons.RESET, Icons.RETRY,
+    Icons.ROBOT, Icons.SETTINGS, Icons.SIZE, Icons.SPEED, Icons.STAR, Icons.SUCCESS,
+    Icons.TIME, Icons.TIP, Icons.UPLOAD, Icons.VIDEO, Icons.WARNING
+)
+
 logger = logging.getLogger(__name__)
 
+# format_ callback payload: {video_id}_{audio|video}_{format_id}; video ids may themselves contain "_"
+_FORMAT_PAYLOAD_RE = re.compile(r"(.+?)_(audio|video)_(.+)")
+
+
+class DownloadStatus(IntEnum):
+    """Pipeline stage of a user's download"""
+    DOWNLOADING = 1
+    UPLOADING = 2
+    COMPLETED = 3
+    FAILED = 4
+
+
+@dataclass(slots=True)
+class UserDownload:
+    """Active download/upload pipeline state for one user"""
+    query: Any
+    video_info: Dict[str, Any]
+    selected_format: Dict[str, Any]
+    is_audio: bool
+    status: DownloadStatus = DownloadStatus.DOWNLOADING
+    download_result: Optional[Dict[str, Any]] = None
+    upload_result: Optional[Dict[str, Any]] = None
+    last_progress_msg: Optional[str] = None
+    task: Optional[asyncio.Task] = None
+
+
+# Static screens, built once at import instead of on every button press
+_ABOUT_TEXT = f'''
+{ROBOT} <b>Ultra Video Downloader Bot</b>
+
+🔗 <b>Version:</b> 2.0.0
+🚀 <b>Performance:</b> Ultra High-Speed
+📱 <b>Platforms:</b> 1500+ Supported
+
+{FEATURES} <b>Key Features:</b>
+• Lightning-fast downloads
+• Up to 2GB file support
+• Real-time progress tracking
+• Multiple quality options
+• Audio extraction (MP3)
+• Batch processing
+
+{DEVELOPER} <b>Developed by:</b> AI Assistant
+📧 <b>Support:</b> Contact admin for help
+
+{STAR} Thank you for using our bot!
+'''
+_ABOUT_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{BACK} Back to Menu", callback_data="start")
+]])
+
+_QUALITY_SETTINGS_TEXT = f'''
+{QUALITY} <b>Default Quality Settings</b>
+
+Select your preferred default quality:
+
+🎬 <b>Video Quality Options:</b>
+• Best Available (Recommended)
+• 4K (2160p) - Ultra HD
+• 1080p - Full HD
+• 720p - HD
+• 480p - Standard
+• Audio Only - MP3 format
+'''
+_QUALITY_SETTINGS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🏆 Best Available", callback_data="quality_best")],
+    [InlineKeyboardButton("🎬 4K (2160p)", callback_data="quality_2160p")],
+    [InlineKeyboardButton("📺 1080p", callback_data="quality_1080p")],
+    [InlineKeyboardButton("📱 720p", callback_data="quality_720p")],
+    [InlineKeyboardButton("📻 Audio Only", callback_data="quality_audio")],
+    [InlineKeyboardButton(f"{BACK} Back", callback_data="settings")]
+])
+
+_FORMAT_SETTINGS_TEXT = f'''
+{FORMAT} <b>Default Format Settings</b>
+
+Select your preferred default format:
+
+📹 <b>Video Formats:</b>
+• MP4 (Recommended) - Best compatibility
+• WEBM - Smaller file size
+• MKV - High quality container
+
+🎵 <b>Audio Formats:</b>
+• MP3 - Universal compatibility
+• M4A - High quality audio
+• OGG - Open source format
+'''
+_FORMAT_SETTINGS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📹 MP4 (Recommended)", callback_data="format_mp4")],
+    [InlineKeyboardButton("🌐 WEBM", callback_data="format_webm")],
+    [InlineKeyboardButton("🎵 MP3 Audio", callback_data="format_mp3")],
+    [InlineKeyboardButton("🎶 M4A Audio", callback_data="format_m4a")],
+    [InlineKeyboardButton(f"{BACK} Back", callback_data="settings")]
+])
+
+_NOTIFICATION_SETTINGS_TEXT = f'''
+{NOTIFICATIONS} <b>Notification Settings</b>
+
+Configure when you want to receive notifications:
+
+📱 <b>Notification Types:</b>
+• Progress Updates - Download/upload progress
+• Completion Alerts - When operations complete
+• Error Notifications - When something goes wrong
+• Daily Summary - Daily usage statistics
+'''
+_NOTIFICATION_SETTINGS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("✅ Enable All Notifications", callback_data="notify_all_on")],
+    [InlineKeyboardButton("❌ Disable All Notifications", callback_data="notify_all_off")],
+    [InlineKeyboardButton("🔧 Custom Settings", callback_data="notify_custom")],
+    [InlineKeyboardButton(f"{BACK} Back", callback_data="settings")]
+])
+
+_ADVANCED_SETTINGS_TEXT = f'''
+{ADVANCED} <b>Advanced Settings</b>
+
+Configure advanced bot behavior:
+
+⚡ <b>Performance Options:</b>
+• Fast Mode - Skip some checks for speed
+• Auto Cleanup - Automatically clean temp files
+• Progress Throttling - Limit progress updates
+• Bandwidth Limiting - Control download speed
+
+🔒 <b>Security Options:</b>
+• File Verification - Verify file integrity
+• Safe Mode - Extra security checks
+'''
+_ADVANCED_SETTINGS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("⚡ Toggle Fast Mode", callback_data="advanced_fast_mode")],
+    [InlineKeyboardButton("🗑️ Toggle Auto Cleanup", callback_data="advanced_auto_cleanup")],
+    [InlineKeyboardButton("🔒 Toggle Safe Mode", callback_data="advanced_safe_mode")],
+    [InlineKeyboardButton(f"{BACK} Back", callback_data="settings")]
+])
+
+_RESET_SETTINGS_TEXT = f'''
+{RESET} <b>Settings Reset</b>
+
+All settings have been reset to default values:
+
+✅ Default Quality: Best Available
+✅ Default Format: MP4
+✅ Notifications: All Enabled
+✅ Fast Mode: Enabled
+✅ Auto Cleanup: Enabled
+✅ Safe Mode: Disabled
+
+Settings applied successfully!
+'''
+_RESET_SETTINGS_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{SETTINGS} Back to Settings", callback_data="settings"),
+    InlineKeyboardButton(f"{BACK} Main Menu", callback_data="start")
+]])
+
+_NEW_DOWNLOAD_TEXT = f'''
+{NEW_DOWNLOAD} <b>Start New Download</b>
+
+Ready for your next download!
+
+🔗 Simply send me a video URL from any of these platforms:
+• YouTube
+• Instagram
+• TikTok
+• Facebook
+• Twitter/X
+• And 1500+ more sites!
+
+💡 <b>Tip:</b> Just paste the URL and I'll handle the rest!
+'''
+_NEW_DOWNLOAD_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{HELP} Help", callback_data="help"),
+    InlineKeyboardButton(f"{BACK} Back", callback_data="start")
+]])
+
+_SHOW_FORMATS_TEXT = f'''
+{FORMAT} <b>Format Selection</b>
+
+To see available formats:
+1. Send a video URL
+2. Wait for video information to load
+3. Choose from available quality options
+
+Each video may have different format options depending on the source platform.
+'''
+_SHOW_FORMATS_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{NEW_DOWNLOAD} New Download", callback_data="new_download"),
+    InlineKeyboardButton(f"{BACK} Back", callback_data="start")
+]])
+
+# Setting confirmation screens depend only on the chosen option, so each variant is rendered once
+_QUALITY_NAMES = {
+    'best': 'Best Available',
+    '2160p': '4K (2160p)',
+    '1080p': '1080p Full HD',
+    '720p': '720p HD',
+    '480p': '480p Standard',
+    'audio': 'Audio Only (MP3)'
+}
+
+_FORMAT_NAMES = {
+    'mp4': 'MP4 (Recommended)',
+    'webm': 'WEBM (Smaller size)',
+    'mkv': 'MKV (High quality)',
+    'mp3': 'MP3 Audio',
+    'm4a': 'M4A Audio (High quality)',
+    'ogg': 'OGG Audio (Open source)'
+}
+
+_ADVANCED_SETTING_NAMES = {
+    'fast_mode': 'Fast Mode',
+    'auto_cleanup': 'Auto Cleanup',
+    'safe_mode': 'Safe Mode',
+    'bandwidth_limit': 'Bandwidth Limiting',
+    'file_verification': 'File Verification'
+}
+
+_ADVANCED_SETTING_DESCRIPTIONS = {
+    'fast_mode': 'Skips some checks for faster processing',
+    'auto_cleanup': 'Automatically cleans temporary files after downloads',
+    'safe_mode': 'Performs extra security checks on all downloads',
+    'bandwidth_limit': 'Limits download speed to preserve bandwidth',
+    'file_verification': 'Verifies file integrity after downloads'
+}
+
+_ADVANCED_BACK_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{ADVANCED} Back to Advanced", callback_data="setting_advanced"),
+    InlineKeyboardButton(f"{SETTINGS} Settings Menu", callback_data="settings")
+]])
+
+# Fixed keyboards reused by every message that shows them instead of rebuilt per call
+_CANCEL_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{CANCEL} Cancel", callback_data="download_cancel")
+]])
+_PROGRESS_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{REFRESH} Refresh", callback_data="download_progress"),
+    InlineKeyboardButton(f"{CANCEL} Cancel", callback_data="download_cancel")
+]])
+_DOWNLOAD_DONE_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{NEW_DOWNLOAD} Download Another", callback_data="new_download")
+]])
+_DOWNLOAD_FAILED_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{RETRY} Try Again", callback_data="download_retry"),
+    InlineKeyboardButton(f"{BACK} Back to Formats", callback_data="show_formats")
+]])
+_HISTORY_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{REFRESH} Refresh", callback_data="download_history"),
+    InlineKeyboardButton(f"{BACK} Back", callback_data="stats")
+]])
+_CLEANUP_DONE_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{BACK} Back to Status", callback_data="refresh_status")
+]])
+_INSTAGRAM_BACK_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{BACK} Back to Instagram Login", callback_data="instagram_login")
+]])
+
+# Download flow message templates: icons are filled in at import, per-download fields by str.format
+_DOWNLOAD_START_TMPL = f'''
+{DOWNLOAD} <b>Starting Download</b>
+
+{VIDEO} <b>Title:</b> {{title}}...
+{PLATFORM} <b>Platform:</b> {{platform}}
+{QUALITY} <b>Quality:</b> {{quality}}
+{FORMAT} <b>Format:</b> {{ext}}
+{SIZE} <b>Size:</b> {{size}}
+
+{PROGRESS} Initializing download...
+'''
+
+_PIPELINE_QUEUED_TMPL = f'''
+{PROGRESS} <b>Queued</b>
+
+{VIDEO} <b>Title:</b> {{title}}...
+{TIME} Position in queue: <b>{{position}}</b>
+
+Your download will start as soon as a slot is free.
+'''
+
+# Files below this size skip the "Upload Starting" edit
+_UPLOAD_BANNER_MIN_BYTES = 5 * 1024 * 1024
+
+_UPLOAD_START_TMPL = f'''
+{UPLOAD} <b>Upload Starting</b>
+
+{VIDEO} <b>Title:</b> {{title}}...
+{SIZE} <b>File Size:</b> {{size}}
+{SPEED} <b>Download Speed:</b> {{download_speed}}/s
+
+{PROGRESS} Uploading to Telegram...
+'''
+
+_DOWNLOAD_DONE_TMPL = f'''
+{SUCCESS} <b>Download Completed!</b>
+
+{VIDEO} <b>Title:</b> {{title}}...
+{PLATFORM} <b>Platform:</b> {{platform}}
+{QUALITY} <b>Quality:</b> {{quality}}
+{SIZE} <b>File Size:</b> {{size}}
+
+{TIME} <b>Processing Time:</b>
+• Download: {{download_time}}
+• Upload: {{upload_time}}
+
+{SPEED} <b>Average Speeds:</b>
+• Download: {{download_speed}}/s
+• Upload: {{upload_speed}}/s
+
+{LINK} <b>File uploaded to:</b> @{{channel}}
+'''
+
+_DOWNLOAD_FAILED_TMPL = f'''
+{ERROR} <b>Download Failed</b>
+
+{VIDEO} <b>Title:</b> {{title}}...
+{REASON} <b>Error:</b> {{error}}...
+
+{RETRY} Please try again or choose a different format.
+'''
+
+
+def _cancel_upload_markup(task_id: str) -> InlineKeyboardMarkup:
+    """Build the per-task Cancel Upload keyboard (task ids are unique, so it is not cached)"""
+    return InlineKeyboardMarkup([[
+        InlineKeyboardButton(f"{CANCEL} Cancel Upload", callback_data=f"cancel_{task_id}")
+    ]])
+
+
+@functools.lru_cache(maxsize=64)
+def _build_quality_confirmation(selected_quality: str) -> Tuple[str, InlineKeyboardMarkup]:
+    """Render the quality confirmation screen for one quality option"""
+    return f'''
+✅ <b>Quality Setting Updated</b>
+
+🎬 <b>Selected Quality:</b> {selected_quality}
+
+📱 This setting will be used as default for all your future downloads.
+
+💡 <b>Note:</b> You can still choose different qualities when downloading specific videos.
+''', _RESET_SETTINGS_MARKUP
+
+
+@functools.lru_cache(maxsize=64)
+def _build_format_confirmation(selected_format: str) -> Tuple[str, InlineKeyboardMarkup]:
+    """Render the format confirmation screen for one format option"""
+    return f'''
+✅ <b>Format Setting Updated</b>
+
+📹 <b>Selected Format:</b> {selected_format}
+
+📱 This format will be used as default for all your future downloads.
+
+💡 <b>Note:</b> Some platforms may not support all formats. The bot will automatically fall back to the best available format.
+''', _RESET_SETTINGS_MARKUP
+
+
+@functools.lru_cache(maxsize=64)
+def _build_advanced_confirmation(setting_type: str, enabled: bool) -> Tuple[str, InlineKeyboardMarkup]:
+    """Render the advanced setting confirmation screen for one setting and state"""
+    setting_name = _ADVANCED_SETTING_NAMES.get(setting_type, setting_type.replace('_', ' ').title())
+    setting_desc = _ADVANCED_SETTING_DESCRIPTIONS.get(setting_type, 'Advanced setting')
+    status = "Enabled" if enabled else "Disabled"
+    status_icon = "✅" if enabled else "❌"
+    return f'''
+{status_icon} <b>Advanced Setting Updated</b>
+
+⚙️ <b>Setting:</b> {setting_name}
+📊 <b>Status:</b> {status}
+
+📝 <b>Description:</b> {setting_desc}
+
+💡 <b>Note:</b> Advanced settings affect bot performance and behavior. Changes take effect immediately.
+''', _ADVANCED_BACK_MARKUP
+
+
 class CallbackHandlers:
     """Handler class for callback queries"""
 
@@ -39,7 +441,93 @@ class CallbackHandlers:
         self.cache_manager = cache_manager
 
         # Track active downloads per user
-        self.user_downloads: Dict[int, Dict[str, Any]] = {}
+        self.user_downloads: Dict[int, UserDownload] = {}
+
+        # Shared command handlers for callbacks that re-render a command's screen
+        self._commands = CommandHandlers(downloader, file_manager, db_manager, cache_manager)
+
+        # Every download/upload pipeline task, held strongly until it finishes (cancelled on stop)
+        self._active_tasks: set = set()
+        # Latest pipeline task per user, for cancel lookups only; a second download replaces the entry
+        self._download_tasks: Dict[int, asyncio.Task] = {}
+        # Whole pipelines (download + upload) allowed to run at once; the rest wait in line
+        self._pipeline_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_PIPELINES)
+        self._queued_pipelines = 0
+        # Download history writes running off the user-visible completion path
+        self._record_tasks: set = set()
+
+        # In-flight callback handler tasks (strong references until they finish)
+        self._callback_tasks: set = set()
+
+        # Ids of callback queries already answered; Telegram rejects a second answer
+        self._answered_queries: set = set()
+
+        # Parsed video previews, so repeated format presses skip Redis and JSON decoding
+        self._video_info_cache: OrderedDict = OrderedDict()
+        self.video_info_cache_ttl = 300
+        self.video_info_cache_size = 512
+
+        # Coalesced progress edits: latest pending (query, text, markup) per (chat_id, message_id),
+        # flushed at most once per edit_interval by one task per message
+        self._pending_edits: Dict[Tuple[int, int], Tuple[Any, str, Optional[InlineKeyboardMarkup]]] = {}
+        self._edit_flushers: Dict[Tuple[int, int], asyncio.Task] = {}
+        self.edit_interval = 1.0
+
+        # Callback routing tables: exact callback_data first (so e.g. "download_history" is
+        # not captured by a prefix), then the token before the first "_".
+        # A single partition plus dict lookup beats a compiled prefix regex for this key space;
+        # only switch to a regex if prefixes stop being "_"-delimited words.
+        self._exact_routes = {
+            "help": self._handle_help_callback,
+            "stats": self._handle_stats_callback,
+            "settings": self._handle_settings_callback,
+            "about": self._handle_about_callback,
+            "start": self._handle_start_callback,
+            "download_history": self._handle_download_history_callback,
+            "system_cleanup": self._handle_system_cleanup_callback,
+            "reset_settings": self._handle_reset_settings_callback,
+            "cancel_preview": self._handle_cancel_preview_callback,
+            "new_download": self._handle_new_download_callback,
+            "show_formats": self._handle_show_formats_callback,
+            "instagram_login": self._handle_instagram_login_callback,
+            "cookie_guide": self._handle_cookie_guide_callback,
+            "test_instagram": self._handle_test_instagram_callback,
+            "clear_instagram": self._handle_clear_instagram_callback,
+            "support": self._handle_support_callback,
+            "header_audio": self._handle_header_audio_callback,
+            # Default-format buttons from the settings screen share the "format_" prefix with
+            # preview downloads, so they are routed exactly before the prefix table is consulted
+            "format_mp4": self._handle_format_selection_callback,
+            "format_webm": self._handle_format_selection_callback,
+            "format_mp3": self._handle_format_selection_callback,
+            "format_m4a": self._handle_format_selection_callback,
+        }
+        self._prefix_routes = {
+            "format": self.handle_format_selection,
+            "download": self.handle_download_action,
+            "cancel": self.handle_cancel_action,
+            "setting": self._handle_setting_callback,
+            "admin": self._handle_admin_action_callback,
+            "refresh": self._handle_refresh_callback,
+            "retry": self._handle_retry_callback,
+            "quality": self._handle_quality_selection_callback,
+            "notify": self._handle_notification_setting_callback,
+            "advanced": self._handle_advanced_setting_callback,
+        }
+        # "download_<action>" buttons, keyed by action
+        self._download_actions = {
+            "cancel": self._handle_download_cancel,
+            "retry": self._handle_download_retry,
+            "progress": self._handle_progress_update,
+        }
+        # Screens that "refresh_<name>" re-renders through the shared command handlers
+        self._refresh_views = {
+            "stats": self._commands.stats_command,
+            "status": self._commands.status_command,
+        }
+        # Bound lookups so the per-update path does no attribute resolution on the tables
+        self._exact_route = self._exact_routes.get
+        self._prefix_route = self._prefix_routes.get
 
     async def handle_callback_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Master callback query handler with routing (optimized)"""
@@ -48,77 +536,28 @@ class CallbackHandlers:
             if not query or not query.data:
                 return
 
-            # Answer immediately to show responsiveness
-            await query.answer("⚡ Processing...")
-
             callback_data = query.data
             user_id = query.from_user.id if query.from_user else None
 
             logger.info(f"📱 Processing callback: {callback_data} for user {user_id}")
 
-            # Route to appropriate handler based on callback data
-            if callback_data.startswith("format_"):
-                await self.handle_format_selection(update, context)
-            elif callback_data.startswith("download_"):
-                await self.handle_download_action(update, context)
-            elif callback_data.startswith("cancel_"):
-                await self.handle_cancel_action(update, context)
-            elif callback_data == "help":
-                await self._handle_help_callback(update, context)
-            elif callback_data == "stats":
-                await self._handle_stats_callback(update, context)
-            elif callback_data == "settings":
-                await self._handle_settings_callback(update, context)
-            elif callback_data == "about":
-                await self._handle_about_callback(update, context)
-            elif callback_data == "start":
-                await self._handle_start_callback(update, context)
-            elif callback_data == "refresh_stats":
-                await self._handle_refresh_stats_callback(update, context)
-            elif callback_data == "download_history":
-                await self._handle_download_history_callback(update, context)
-            elif callback_data == "refresh_status":
-                await self._handle_refresh_status_callback(update, context)
-            elif callback_data == "system_cleanup":
-                await self._handle_system_cleanup_callback(update, context)
-            elif callback_data.startswith("setting_"):
-                await self._handle_setting_callback(update, context)
-            elif callback_data == "reset_settings":
-                await self._handle_reset_settings_callback(update, context)
-            elif callback_data.startswith("admin_"):
-                await self._handle_admin_callback(update, context)
-            elif callback_data.startswith("refresh_"):
-                await self._handle_refresh_callback(update, context)
-            elif callback_data == "cancel_preview":
-                await self._handle_cancel_preview_callback(update, context)
-            elif callback_data == "new_download":
-                await self._handle_new_download_callback(update, context)
-            elif callback_data == "show_formats":
-                await self._handle_show_formats_callback(update, context)
-            elif callback_data == "instagram_login":
-                await self._handle_instagram_login_callback(update, context)
-            elif callback_data.startswith("retry_"):
-                await self._handle_retry_callback(update, context)
-            elif callback_data == "cookie_guide":
-                await self._handle_cookie_guide_callback(update, context)
-            elif callback_data == "test_instagram":
-                await self._handle_test_instagram_callback(update, context)
-            elif callback_data == "clear_instagram":
-                await self._handle_clear_instagram_callback(update, context)
-            elif callback_data.startswith("quality_"):
-                await self._handle_quality_selection_callback(update, context)
-            elif callback_data.startswith("format_"): # Duplicate handler, assuming last one is intended
-                await self._handle_format_selection_callback(update, context)
-            elif callback_data.startswith("notify_"):
-                await self._handle_notification_setting_callback(update, context)
-            elif callback_data.startswith("advanced_"):
-                await self._handle_advanced_setting_callback(update, context)
-            elif callback_data.startswith("admin_"): # Duplicate handler, assuming last one is intended
-                await self._handle_admin_action_callback(update, context)
-            elif callback_data == "support":
-                await self._handle_support_callback(update, context)
-            elif callback_data == "header_audio":
-                await self._handle_header_audio_callback(update, context)
+            # Route to appropriate handler: exact match first, then the token before the first "_"
+            handler = self._exact_route(callback_data)
+            if handler is None:
+                prefix, _, suffix = callback_data.partition('_')
+                handler = self._prefix_route(prefix)
+                if handler is not None:
+                    # Hand the already-split payload to the handler instead of re-parsing query.data
+                    handler = functools.partial(handler, suffix=suffix)
+
+            if handler is not None:
+                # Run the handler's I/O in the background; _run_callback answers the query if the handler does not
+                task = asyncio.create_task(
+                    self._run_callback(handler, update, context),
+                    name=f"callback-{user_id}-{callback_data}"
+                )
+                self._callback_tasks.add(task)
+                task.add_done_callback(self._callback_tasks.discard)
             else:
                 logger.warning(f"⚠️ Unhandled callback: {callback_data}")
                 await query.answer("This feature is not yet implemented")
@@ -131,126 +570,71 @@ class CallbackHandlers:
     async def _handle_help_callback(self, update, context):
         """Handle help button callback"""
         try:
-            from handlers.commands import CommandHandlers
             # Simulate help command
-            await CommandHandlers(
-                self.downloader, self.file_manager,
-                self.db_manager, self.cache_manager
-            ).help_command(update, context)
+            await self._commands.help_command(update, context)
         except Exception as e:
             logger.error(f"Help callback error: {e}")
-            await update.callback_query.answer("Help not available")
+            await self._answer(update.callback_query, "Help not available")
 
     async def _handle_stats_callback(self, update, context):
         """Handle stats button callback"""
         try:
-            from handlers.commands import CommandHandlers
-            await CommandHandlers(
-                self.downloader, self.file_manager,
-                self.db_manager, self.cache_manager
-            ).stats_command(update, context)
+            await self._commands.stats_command(update, context)
         except Exception as e:
             logger.error(f"Stats callback error: {e}")
-            await update.callback_query.answer("Stats not available")
+            await self._answer(update.callback_query, "Stats not available")
 
     async def _handle_settings_callback(self, update, context):
         """Handle settings button callback"""
         try:
-            from handlers.commands import CommandHandlers
-            await CommandHandlers(
-                self.downloader, self.file_manager,
-                self.db_manager, self.cache_manager
-            ).settings_command(update, context)
+            await self._commands.settings_command(update, context)
         except Exception as e:
             logger.error(f"Settings callback error: {e}")
-            await update.callback_query.answer("Settings not available")
+            await self._answer(update.callback_query, "Settings not available")
 
     async def _handle_about_callback(self, update, context):
         """Handle about button callback"""
         try:
             query = update.callback_query
-            await query.answer()
-
-            about_text = f'''
-{Icons.ROBOT} <b>Ultra Video Downloader Bot</b>
-
-🔗 <b>Version:</b> 2.0.0
-🚀 <b>Performance:</b> Ultra High-Speed
-📱 <b>Platforms:</b> 1500+ Supported
-
-{Icons.FEATURES} <b>Key Features:</b>
-• Lightning-fast downloads
-• Up to 2GB file support
-• Real-time progress tracking
-• Multiple quality options
-• Audio extraction (MP3)
-• Batch processing
-
-{Icons.DEVELOPER} <b>Developed by:</b> AI Assistant
-📧 <b>Support:</b> Contact admin for help
-
-{Icons.STAR} Thank you for using our bot!
-            '''
-
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.BACK} Back to Menu", callback_data="start")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            await self._answer(query)
 
             await query.edit_message_text(
-                about_text,
+                _ABOUT_TEXT,
                 parse_mode=ParseMode.HTML,
-                reply_markup=reply_markup
+                reply_markup=_ABOUT_MARKUP
             )
         except Exception as e:
             logger.error(f"About callback error: {e}")
-            await update.callback_query.answer("About not available")
+            await self._answer(update.callback_query, "About not available")
 
     async def _handle_start_callback(self, update, context):
         """Handle start/back to menu callback"""
         try:
-            from handlers.commands import CommandHandlers
-            await CommandHandlers(
-                self.downloader, self.file_manager,
-                self.db_manager, self.cache_manager
-            ).start_command(update, context)
+            await self._commands.start_command(update, context)
         except Exception as e:
             logger.error(f"Start callback error: {e}")
-            await update.callback_query.answer("Menu not available")
-
-    async def _handle_refresh_stats_callback(self, update, context):
-        """Handle refresh stats callback"""
-        try:
-            await self._handle_stats_callback(update, context)
-            await update.callback_query.answer("Stats refreshed")
-        except Exception as e:
-            logger.error(f"Refresh stats error: {e}")
-            await update.callback_query.answer("Refresh failed")
+            await self._answer(update.callback_query, "Menu not available")
 
     async def _handle_download_history_callback(self, update, context):
         """Handle download history callback"""
         try:
             query = update.callback_query
-            await query.answer()
+            await self._answer(query)
 
             user_id = update.effective_user.id
             # Get download history from file manager
             history = await self.file_manager.get_upload_history(user_id, limit=10)
 
             if not history:
-                history_text = f"{Icons.HISTORY} <b>Download History</b>\\n\\nNo downloads yet."
+                history_text = f"{HISTORY} <b>Download History</b>\\n\\nNo downloads yet."
             else:
-                history_text = f"{Icons.HISTORY} <b>Download History</b>\\n\\n"
+                history_text = f"{HISTORY} <b>Download History</b>\\n\\n"
                 for i, item in enumerate(history[:5], 1):
                     history_text += f"{i}. {item.get('filename', 'Unknown')}\\n"
                     history_text += f"   📅 {item.get('timestamp', 'Unknown')}\\n"
-                    history_text += f"   📊 {format_file_size(item.get('file_size', 0))}\\n\\n"
+                    history_text += f"   📊 {item.get('file_size_str', '—')}\\n\\n"
 
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.REFRESH} Refresh", callback_data="download_history"),
-                InlineKeyboardButton(f"{Icons.BACK} Back", callback_data="stats")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _HISTORY_MARKUP
 
             await query.edit_message_text(
                 history_text,
@@ -258,43 +642,30 @@ class CallbackHandlers:
                 reply_markup=reply_markup
             )
         except Exception as e:
+            if is_message_not_modified(e):
+                await self._answer(update.callback_query, "History is up to date")
+                return
             logger.error(f"Download history error: {e}")
-            await update.callback_query.answer("History not available")
-
-    async def _handle_refresh_status_callback(self, update, context):
-        """Handle refresh status callback"""
-        try:
-            from handlers.commands import CommandHandlers
-            await CommandHandlers(
-                self.downloader, self.file_manager,
-                self.downloader.db_manager, self.downloader.cache_manager
-            ).status_command(update, context)
-            await update.callback_query.answer("Status refreshed")
-        except Exception as e:
-            logger.error(f"Refresh status error: {e}")
-            await update.callback_query.answer("Refresh failed")
+            await self._answer(update.callback_query, "History not available")
 
     async def _handle_system_cleanup_callback(self, update, context):
         """Handle system cleanup callback"""
         try:
             query = update.callback_query
-            await query.answer("Cleaning up...")
+            await self._answer(query, "Cleaning up...")
 
             # Perform cleanup
-            cleanup_result = await self.file_manager.cleanup_temp_files()
+            cleanup_result = await self.file_manager.cleanup_temp_directory()
 
             cleanup_text = f'''
-{Icons.CLEANUP} <b>System Cleanup Completed</b>
+{CLEANUP} <b>System Cleanup Completed</b>
 
 🗑️ <b>Files cleaned:</b> {cleanup_result['cleaned_files']}
 💾 <b>Space freed:</b> {cleanup_result.get('freed_space_str', '0 B')}
 ✅ <b>Status:</b> Cleanup successful
             '''
 
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.BACK} Back to Status", callback_data="refresh_status")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _CLEANUP_DONE_MARKUP
 
             await query.edit_message_text(
                 cleanup_text,
@@ -303,16 +674,15 @@ class CallbackHandlers:
             )
         except Exception as e:
             logger.error(f"System cleanup error: {e}")
-            await update.callback_query.answer("Cleanup failed")
+            await self._answer(update.callback_query, "Cleanup failed")
 
-    async def _handle_setting_callback(self, update, context):
+    async def _handle_setting_callback(self, update, context, suffix: Optional[str] = None):
         """Handle settings submenu callbacks"""
         try:
             query = update.callback_query
-            await query.answer()
+            await self._answer(query)
 
-            callback_data = query.data
-            setting_type = callback_data.replace('setting_', '')
+            setting_type = suffix if suffix is not None else query.data[len('setting_'):]
 
             if setting_type == "quality":
                 await self._handle_quality_settings(query)
@@ -323,328 +693,172 @@ class CallbackHandlers:
             elif setting_type == "advanced":
                 await self._handle_advanced_settings(query)
             else:
-                await query.answer("Setting not available")
+                await self._answer(query, "Setting not available")
 
         except Exception as e:
             logger.error(f"Setting callback error: {e}")
-            await update.callback_query.answer("Settings error")
+            await self._answer(update.callback_query, "Settings error")
 
     async def _handle_quality_settings(self, query):
         """Handle quality settings"""
-        quality_text = f'''
-{Icons.QUALITY} <b>Default Quality Settings</b>
-
-Select your preferred default quality:
-
-🎬 <b>Video Quality Options:</b>
-• Best Available (Recommended)
-• 4K (2160p) - Ultra HD
-• 1080p - Full HD
-• 720p - HD
-• 480p - Standard
-• Audio Only - MP3 format
-        '''
-
-        keyboard = [
-            [InlineKeyboardButton("🏆 Best Available", callback_data="quality_best")],
-            [InlineKeyboardButton("🎬 4K (2160p)", callback_data="quality_2160p")],
-            [InlineKeyboardButton("📺 1080p", callback_data="quality_1080p")],
-            [InlineKeyboardButton("📱 720p", callback_data="quality_720p")],
-            [InlineKeyboardButton("📻 Audio Only", callback_data="quality_audio")],
-            [InlineKeyboardButton(f"{Icons.BACK} Back", callback_data="settings")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await query.edit_message_text(
-            quality_text,
+            _QUALITY_SETTINGS_TEXT,
             parse_mode=ParseMode.HTML,
-            reply_markup=reply_markup
+            reply_markup=_QUALITY_SETTINGS_MARKUP
         )
 
     async def _handle_format_settings(self, query):
         """Handle format settings"""
-        format_text = f'''
-{Icons.FORMAT} <b>Default Format Settings</b>
-
-Select your preferred default format:
-
-📹 <b>Video Formats:</b>
-• MP4 (Recommended) - Best compatibility
-• WEBM - Smaller file size
-• MKV - High quality container
-
-🎵 <b>Audio Formats:</b>
-• MP3 - Universal compatibility
-• M4A - High quality audio
-• OGG - Open source format
-        '''
-
-        keyboard = [
-            [InlineKeyboardButton("📹 MP4 (Recommended)", callback_data="format_mp4")],
-            [InlineKeyboardButton("🌐 WEBM", callback_data="format_webm")],
-            [InlineKeyboardButton("🎵 MP3 Audio", callback_data="format_mp3")],
-            [InlineKeyboardButton("🎶 M4A Audio", callback_data="format_m4a")],
-            [InlineKeyboardButton(f"{Icons.BACK} Back", callback_data="settings")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await query.edit_message_text(
-            format_text,
+            _FORMAT_SETTINGS_TEXT,
             parse_mode=ParseMode.HTML,
-            reply_markup=reply_markup
+            reply_markup=_FORMAT_SETTINGS_MARKUP
         )
 
     async def _handle_notification_settings(self, query):
         """Handle notification settings"""
-        notification_text = f'''
-{Icons.NOTIFICATIONS} <b>Notification Settings</b>
-
-Configure when you want to receive notifications:
-
-📱 <b>Notification Types:</b>
-• Progress Updates - Download/upload progress
-• Completion Alerts - When operations complete
-• Error Notifications - When something goes wrong
-• Daily Summary - Daily usage statistics
-        '''
-
-        keyboard = [
-            [InlineKeyboardButton("✅ Enable All Notifications", callback_data="notify_all_on")],
-            [InlineKeyboardButton("❌ Disable All Notifications", callback_data="notify_all_off")],
-            [InlineKeyboardButton("🔧 Custom Settings", callback_data="notify_custom")],
-            [InlineKeyboardButton(f"{Icons.BACK} Back", callback_data="settings")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await query.edit_message_text(
-            notification_text,
+            _NOTIFICATION_SETTINGS_TEXT,
             parse_mode=ParseMode.HTML,
-            reply_markup=reply_markup
+            reply_markup=_NOTIFICATION_SETTINGS_MARKUP
         )
 
     async def _handle_advanced_settings(self, query):
         """Handle advanced settings"""
-        advanced_text = f'''
-{Icons.ADVANCED} <b>Advanced Settings</b>
-
-Configure advanced bot behavior:
-
-⚡ <b>Performance Options:</b>
-• Fast Mode - Skip some checks for speed
-• Auto Cleanup - Automatically clean temp files
-• Progress Throttling - Limit progress updates
-• Bandwidth Limiting - Control download speed
-
-🔒 <b>Security Options:</b>
-• File Verification - Verify file integrity
-• Safe Mode - Extra security checks
-        '''
-
-        keyboard = [
-            [InlineKeyboardButton("⚡ Toggle Fast Mode", callback_data="advanced_fast_mode")],
-            [InlineKeyboardButton("🗑️ Toggle Auto Cleanup", callback_data="advanced_auto_cleanup")],
-            [InlineKeyboardButton("🔒 Toggle Safe Mode", callback_data="advanced_safe_mode")],
-            [InlineKeyboardButton(f"{Icons.BACK} Back", callback_data="settings")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await query.edit_message_text(
-            advanced_text,
+            _ADVANCED_SETTINGS_TEXT,
             parse_mode=ParseMode.HTML,
-            reply_markup=reply_markup
+            reply_markup=_ADVANCED_SETTINGS_MARKUP
         )
 
     async def _handle_reset_settings_callback(self, update, context):
         """Handle reset settings callback"""
         try:
             query = update.callback_query
-            await query.answer("Settings reset to defaults")
-
-            reset_text = f'''
-{Icons.RESET} <b>Settings Reset</b>
-
-All settings have been reset to default values:
-
-✅ Default Quality: Best Available
-✅ Default Format: MP4
-✅ Notifications: All Enabled
-✅ Fast Mode: Enabled
-✅ Auto Cleanup: Enabled
-✅ Safe Mode: Disabled
-
-Settings applied successfully!
-            '''
-
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.SETTINGS} Back to Settings", callback_data="settings"),
-                InlineKeyboardButton(f"{Icons.BACK} Main Menu", callback_data="start")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            await self._answer(query, "Settings reset to defaults")
 
             await query.edit_message_text(
-                reset_text,
+                _RESET_SETTINGS_TEXT,
                 parse_mode=ParseMode.HTML,
-                reply_markup=reply_markup
+                reply_markup=_RESET_SETTINGS_MARKUP
             )
         except Exception as e:
             logger.error(f"Reset settings error: {e}")
-            await update.callback_query.answer("Reset failed")
+            await self._answer(update.callback_query, "Reset failed")
 
-    async def _handle_admin_callback(self, update, context):
+    async def _handle_admin_callback(self, update, context, suffix: Optional[str] = None):
         """Handle admin callbacks"""
         try:
             query = update.callback_query
-            callback_data = query.data
-            admin_action = callback_data.replace('admin_', '')
+            admin_action = suffix if suffix is not None else query.data[len('admin_'):]
 
             # Check if user is admin (simplified)
-            await query.answer(f"Admin feature '{admin_action}' coming soon")
+            await self._answer(query, f"Admin feature '{admin_action}' coming soon")
 
         except Exception as e:
             logger.error(f"Admin callback error: {e}")
-            await update.callback_query.answer("Admin action failed")
+            await self._answer(update.callback_query, "Admin action failed")
 
-    async def _handle_refresh_callback(self, update, context):
-        """Handle generic refresh callbacks"""
+    async def _handle_refresh_callback(self, update, context, suffix: Optional[str] = None):
+        """Handle refresh callbacks (refresh_stats, refresh_status and generic refreshes)"""
         try:
             query = update.callback_query
-            callback_data = query.data
-
-            if callback_data.startswith("refresh_"):
-                refresh_type = callback_data.replace('refresh_', '')
-                await query.answer(f"Refreshing {refresh_type}...")
+            if suffix is None and query.data.startswith("refresh_"):
+                suffix = query.data[len("refresh_"):]
+
+            view = self._refresh_views.get(suffix)
+            if view is not None:
+                await view(update, context)
+                await self._answer(query, f"{suffix.title()} refreshed")
+            elif suffix:
+                await self._answer(query, f"Refreshing {suffix}...")
             else:
-                await query.answer("Refreshed")
+                await self._answer(query, "Refreshed")
 
         except Exception as e:
             logger.error(f"Refresh callback error: {e}")
-            await update.callback_query.answer("Refresh failed")
+            await self._answer(update.callback_query, "Refresh failed")
 
     async def _handle_cancel_preview_callback(self, update, context):
         """Handle cancel preview callback"""
         try:
             query = update.callback_query
-            await query.answer("Preview cancelled")
+            await self._answer(query, "Preview cancelled")
 
             await query.edit_message_text(
-                f"{Icons.CANCELLED} Video preview cancelled.\\n\\nSend another URL to download a video.",
-                reply_markup=None
+                f"{CANCELLED} Video preview cancelled.\\n\\nSend another URL to download a video."
             )
         except Exception as e:
             logger.error(f"Cancel preview error: {e}")
-            await update.callback_query.answer("Cancel failed")
+            await self._answer(update.callback_query, "Cancel failed")
 
     async def _handle_new_download_callback(self, update, context):
         """Handle new download callback"""
         try:
             query = update.callback_query
-            await query.answer()
-
-            new_download_text = f'''
-{Icons.NEW_DOWNLOAD} <b>Start New Download</b>
-
-Ready for your next download!
-
-🔗 Simply send me a video URL from any of these platforms:
-• YouTube
-• Instagram
-• TikTok
-• Facebook
-• Twitter/X
-• And 1500+ more sites!
-
-💡 <b>Tip:</b> Just paste the URL and I'll handle the rest!
-            '''
-
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.HELP} Help", callback_data="help"),
-                InlineKeyboardButton(f"{Icons.BACK} Back", callback_data="start")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            await self._answer(query)
 
             await query.edit_message_text(
-                new_download_text,
+                _NEW_DOWNLOAD_TEXT,
                 parse_mode=ParseMode.HTML,
-                reply_markup=reply_markup
+                reply_markup=_NEW_DOWNLOAD_MARKUP
             )
         except Exception as e:
             logger.error(f"New download callback error: {e}")
-            await update.callback_query.answer("New download option failed")
+            await self._answer(update.callback_query, "New download option failed")
 
     async def _handle_show_formats_callback(self, update, context):
         """Handle show formats callback"""
         try:
             query = update.callback_query
-            await query.answer("Showing formats...")
-
-            formats_text = f'''
-{Icons.FORMAT} <b>Format Selection</b>
-
-To see available formats:
-1. Send a video URL
-2. Wait for video information to load
-3. Choose from available quality options
-
-Each video may have different format options depending on the source platform.
-            '''
-
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.NEW_DOWNLOAD} New Download", callback_data="new_download"),
-                InlineKeyboardButton(f"{Icons.BACK} Back", callback_data="start")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            await self._answer(query, "Showing formats...")
 
             await query.edit_message_text(
-                formats_text,
+                _SHOW_FORMATS_TEXT,
                 parse_mode=ParseMode.HTML,
-                reply_markup=reply_markup
+                reply_markup=_SHOW_FORMATS_MARKUP
             )
         except Exception as e:
             logger.error(f"Show formats callback error: {e}")
-            await update.callback_query.answer("Show formats failed")
+            await self._answer(update.callback_query, "Show formats failed")
 
-    async def handle_format_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def handle_format_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE, suffix: Optional[str] = None):
         """Handle format selection from video preview"""
         try:
             query = update.callback_query
-            await query.answer()
+            await self._answer(query)
 
             user_id = update.effective_user.id
-            callback_data = query.data
+            if suffix is None:
+                suffix = query.data[len('format_'):]
 
-            # Parse callback data: format_{video_id}_{format_type}_{format_id}
-            parts = callback_data.split('_', 3)
-            if len(parts) != 4:
+            match = _FORMAT_PAYLOAD_RE.fullmatch(suffix)
+            if not match:
                 await query.edit_message_text(
-                    f"{Icons.ERROR} Invalid format selection. Please try again."
+                    f"{ERROR} Invalid format selection. Please try again."
                 )
                 return
 
-            _, video_id, format_type, format_id = parts
+            video_id, format_type, format_id = match.groups()
 
             # Get video info from cache
             video_info = await self._get_cached_video_info(video_id)
             if not video_info:
                 await query.edit_message_text(
-                    f"{Icons.ERROR} Video information expired. Please send the URL again."
+                    f"{ERROR} Video information expired. Please send the URL again."
                 )
                 return
 
             # Determine if it's audio download
             is_audio = format_type == "audio"
 
-            # Find the selected format
-            formats = video_info['audio_formats'] if is_audio else video_info['formats']
-            selected_format = None
-
-            for fmt in formats:
-                if fmt['format_id'] == format_id:
-                    selected_format = fmt
-                    break
+            # Find the selected format via the format_id index built when the preview was cached
+            formats_by_id = video_info['_audio_by_id'] if is_audio else video_info['_formats_by_id']
+            selected_format = formats_by_id.get(format_id)
 
             if not selected_format:
                 await query.edit_message_text(
-                    f"{Icons.ERROR} Selected format is no longer available."
+                    f"{ERROR} Selected format is no longer available."
                 )
                 return
 
@@ -652,85 +866,116 @@ Each video may have different format options depending on the source platform.
             await self._start_download_process(query, user_id, video_info, selected_format, is_audio)
 
         except Exception as e:
-            logger.error(f"❌ Format selection error: {e}", exc_info=True)
+            logger.error(f"❌ Format selection error: {e}")
+            logger.debug("Format selection error", exc_info=True)
             await update.callback_query.edit_message_text(
-                f"{Icons.ERROR} Format selection failed. Please try again."
+                f"{ERROR} Format selection failed. Please try again."
             )
 
-    async def handle_download_action(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def handle_download_action(self, update: Update, context: ContextTypes.DEFAULT_TYPE, suffix: Optional[str] = None):
         """Handle download action buttons (cancel, retry, etc.)"""
         try:
             query = update.callback_query
-            await query.answer()
+            await self._answer(query)
 
-            callback_data = query.data
-            action = callback_data.replace('download_', '')
-
-            if action == 'cancel':
-                await self._handle_download_cancel(query, update.effective_user.id)
-            elif action == 'retry':
-                await self._handle_download_retry(query, update.effective_user.id)
-            elif action == 'progress':
-                await self._handle_progress_update(query, update.effective_user.id)
+            action = suffix if suffix is not None else query.data[len('download_'):]
+
+            handler = self._download_actions.get(action)
+            if handler:
+                await handler(query, update.effective_user.id)
             else:
                 await query.edit_message_text(
-                    f"{Icons.ERROR} Unknown action: {action}"
+                    f"{ERROR} Unknown action: {action}"
                 )
 
         except Exception as e:
-            logger.error(f"❌ Download action error: {e}", exc_info=True)
+            logger.error(f"❌ Download action error: {e}")
+            logger.debug("Download action error", exc_info=True)
             await update.callback_query.message.reply_text(
-                f"{Icons.ERROR} Action failed. Please try again."
+                f"{ERROR} Action failed. Please try again."
             )
 
-    async def handle_cancel_action(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def handle_cancel_action(self, update: Update, context: ContextTypes.DEFAULT_TYPE, suffix: Optional[str] = None):
         """Handle cancel action"""
         try:
             query = update.callback_query
-            await query.answer("Cancelled")
+            await self._answer(query, "Cancelled")
 
-            callback_data = query.data
-            task_id = callback_data.replace('cancel_', '')
+            task_id = suffix if suffix is not None else query.data[len('cancel_'):]
 
             user_id = update.effective_user.id
 
             # Cancel the download/upload
-            download_cancelled = await self.downloader.cancel_download(task_id)
-            upload_cancelled = await self.file_manager.cancel_upload(task_id)
-
-            if download_cancelled or upload_cancelled:
+            download_cancelled, upload_cancelled = await self._cancel_transfers(task_id)
+
+            # Stop the user's pipeline task right away if it is the one running this task_id
+            pipeline_cancelled = False
+            download_info = self.user_downloads.get(user_id)
+            if download_info and (download_info.download_result or {}).get('task_id') == task_id:
+                # Cancel the pipeline that owns task_id; _download_tasks may already hold a newer, queued one
+                task = download_info.task
+                if self._download_tasks.get(user_id) is task:
+                    del self._download_tasks[user_id]
+                if task and not task.done():
+                    task.cancel()
+                    pipeline_cancelled = True
+
+            if download_cancelled or upload_cancelled or pipeline_cancelled:
                 await query.edit_message_text(
-                    f"{Icons.SUCCESS} Operation cancelled successfully.",
-                    reply_markup=None
+                    f"{SUCCESS} Operation cancelled successfully."
                 )
             else:
                 await query.edit_message_text(
-                    f"{Icons.WARNING} Operation could not be cancelled or was already completed.",
-                    reply_markup=None
+                    f"{WARNING} Operation could not be cancelled or was already completed."
                 )
 
         except Exception as e:
-            logger.error(f"❌ Cancel action error: {e}", exc_info=True)
+            logger.error(f"❌ Cancel action error: {e}")
+            logger.debug("Cancel action error", exc_info=True)
             await update.callback_query.message.reply_text(
-                f"{Icons.ERROR} Cancel failed."
+                f"{ERROR} Cancel failed."
             )
 
     async def _get_cached_video_info(self, video_id: str) -> Optional[Dict[str, Any]]:
-        """Get video information from cache"""
+        """Get video information from the in-process cache, falling back to the shared cache"""
         try:
+            cached = self._video_info_cache.get(video_id)
+            if cached and cached[0] > time.monotonic():
+                self._video_info_cache.move_to_end(video_id)
+                return cached[1]
+
             cache_key = f"video_preview:{video_id}"
             cached_info = await self.downloader.cache_manager.get(cache_key)
 
             if cached_info:
-                import json
-                return json.loads(cached_info) if isinstance(cached_info, str) else cached_info
+                video_info = orjson.loads(cached_info) if isinstance(cached_info, (str, bytes)) else cached_info
+                self.remember_video_info(video_id, video_info)
+                return video_info
 
+            self._video_info_cache.pop(video_id, None)
             return None
 
         except Exception as e:
             logger.error(f"Failed to get cached video info: {e}")
             return None
 
+    def remember_video_info(self, video_id: str, video_info: Dict[str, Any]):
+        """Store a parsed preview (with format_id indexes and display strings) in the TTL/LRU cache"""
+        video_info['_formats_by_id'] = self._index_formats(video_info.get('formats'))
+        video_info['_audio_by_id'] = self._index_formats(video_info.get('audio_formats'))
+        # Display strings shared by every download message for this video
+        video_info['_short_title'] = (video_info.get('title') or '')[:50]
+        video_info['_platform_title'] = (video_info.get('platform') or '').title()
+        self._video_info_cache[video_id] = (time.monotonic() + self.video_info_cache_ttl, video_info)
+        self._video_info_cache.move_to_end(video_id)
+        if len(self._video_info_cache) > self.video_info_cache_size:
+            self._video_info_cache.popitem(last=False)
+
+    @staticmethod
+    def _index_formats(formats: Optional[List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """Map format_id (as it appears in callback data) to its format dict"""
+        return {str(fmt['format_id']): fmt for fmt in formats or () if 'format_id' in fmt}
+
     async def _start_download_process(
         self,
         query,
@@ -742,22 +987,15 @@ Each video may have different format options depending on the source platform.
         """Start the download process"""
         try:
             # Update message to show download starting
-            download_msg = f"""
-{Icons.DOWNLOAD} <b>Starting Download</b>
-
-{Icons.VIDEO} <b>Title:</b> {video_info['title'][:50]}...
-{Icons.PLATFORM} <b>Platform:</b> {video_info['platform'].title()}
-{Icons.QUALITY} <b>Quality:</b> {selected_format['quality']}
-{Icons.FORMAT} <b>Format:</b> {selected_format['ext'].upper()}
-{Icons.SIZE} <b>Size:</b> {selected_format['file_size_str']}
-
-{Icons.PROGRESS} Initializing download...
-            """
+            download_msg = _DOWNLOAD_START_TMPL.format(
+                title=video_info['_short_title'],
+                platform=video_info['_platform_title'],
+                quality=selected_format['quality'],
+                ext=selected_format['ext'].upper(),
+                size=selected_format['file_size_str']
+            )
 
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.CANCEL} Cancel", callback_data="download_cancel")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _CANCEL_MARKUP
 
             await query.edit_message_text(
                 download_msg,
@@ -765,17 +1003,22 @@ Each video may have different format options depending on the source platform.
                 reply_markup=reply_markup
             )
 
-            # Start download in background
-            asyncio.create_task(
+            # Start download in background and keep a reference so it can be cancelled
+            task = asyncio.create_task(
                 self._perform_download_and_upload(
                     query, user_id, video_info, selected_format, is_audio
-                )
+                ),
+                name=f"dl-{user_id}-{selected_format['format_id']}"
             )
+            self._active_tasks.add(task)
+            task.add_done_callback(self._active_tasks.discard)
+            self._download_tasks[user_id] = task
+            task.add_done_callback(lambda t, uid=user_id: self._forget_download_task(uid, t))
 
         except Exception as e:
             logger.error(f"Failed to start download process: {e}")
             await query.edit_message_text(
-                f"{Icons.ERROR} Failed to start download. Please try again."
+                f"{ERROR} Failed to start download. Please try again."
             )
 
     async def _perform_download_and_upload(
@@ -785,93 +1028,127 @@ Each video may have different format options depending on the source platform.
         video_info: Dict[str, Any],
         selected_format: Dict[str, Any],
         is_audio: bool
+    ):
+        """Run the download/upload pipeline once a pipeline slot is free"""
+        queued = self._pipeline_semaphore.locked()
+        if queued:
+            self._queued_pipelines += 1
+            try:
+                await query.edit_message_text(
+                    _PIPELINE_QUEUED_TMPL.format(
+                        title=video_info['_short_title'], position=self._queued_pipelines
+                    ),
+                    parse_mode=ParseMode.HTML,
+                    reply_markup=_CANCEL_MARKUP
+                )
+            except Exception as e:
+                logger.debug(f"Queued status edit skipped: {e}")
+
+        try:
+            async with self._pipeline_semaphore:
+                if queued:
+                    self._queued_pipelines -= 1
+                    queued = False
+                await self._download_and_upload(query, user_id, video_info, selected_format, is_audio)
+        finally:
+            if queued:
+                self._queued_pipelines -= 1
+
+    async def _download_and_upload(
+        self,
+        query,
+        user_id: int,
+        video_info: Dict[str, Any],
+        selected_format: Dict[str, Any],
+        is_audio: bool
     ):
         """Perform the actual download and upload process"""
+        title = video_info['_short_title']
+        download_info = None
         try:
             original_url = video_info['original_url']
             format_id = selected_format['format_id']
 
             # Store download info for progress tracking
-            download_info = {
-                'query': query,
-                'video_info': video_info,
-                'selected_format': selected_format,
-                'is_audio': is_audio,
-                'status': 'downloading'
-            }
+            download_info = UserDownload(
+                query=query,
+                video_info=video_info,
+                selected_format=selected_format,
+                is_audio=is_audio,
+                task=asyncio.current_task()
+            )
             self.user_downloads[user_id] = download_info
 
-            # Start download
-            download_result = await self.downloader.download_video(
-                url=original_url,
-                format_id=format_id,
-                user_id=user_id,
-                is_audio=is_audio
-            )
+            # Download and fetch the thumbnail side by side; the group cancels the fetch if the download fails
+            thumbnail_task = None
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    download_task = tg.create_task(self.downloader.download_video(
+                        url=original_url,
+                        format_id=format_id,
+                        user_id=user_id,
+                        is_audio=is_audio
+                    ))
+                    if not is_audio:
+                        thumbnail_task = tg.create_task(self.file_manager.fetch_thumbnail(video_info))
+            except ExceptionGroup as eg:
+                # Only the download can fail (fetch_thumbnail swallows its errors); surface it unwrapped
+                raise eg.exceptions[0] from None
+            download_result = download_task.result()
 
             # Update status
-            download_info['status'] = 'uploading'
-            download_info['download_result'] = download_result
-
-            # Update message to show upload starting
-            upload_msg = f"""
-{Icons.UPLOAD} <b>Upload Starting</b>
-
-{Icons.VIDEO} <b>Title:</b> {video_info['title'][:50]}...
-{Icons.SIZE} <b>File Size:</b> {format_file_size(download_result['file_size'])}
-{Icons.SPEED} <b>Download Speed:</b> {format_file_size(download_result.get('average_speed', 0))}/s
-
-{Icons.PROGRESS} Uploading to Telegram...
-            """
+            download_info.status = DownloadStatus.UPLOADING
+            download_info.download_result = download_result
+
+            # Update message to show upload starting; small files finish uploading faster than
+            # this extra edit round trip, so they go straight to the success message
+            file_size_str = format_file_size(download_result['file_size'])
+            download_speed_str = format_file_size(download_result.get('average_speed', 0))
+            self._drop_pending_edit(query)
+            if download_result['file_size'] >= _UPLOAD_BANNER_MIN_BYTES:
+                upload_msg = _UPLOAD_START_TMPL.format(
+                    title=title,
+                    size=file_size_str,
+                    download_speed=download_speed_str
+                )
 
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.CANCEL} Cancel Upload", callback_data=f"cancel_{download_result['task_id']}")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+                reply_markup = _cancel_upload_markup(download_result['task_id'])
 
-            await query.edit_message_text(
-                upload_msg,
-                parse_mode=ParseMode.HTML,
-                reply_markup=reply_markup
-            )
+                await query.edit_message_text(
+                    upload_msg,
+                    parse_mode=ParseMode.HTML,
+                    reply_markup=reply_markup
+                )
 
             # Start upload
             upload_result = await self.file_manager.upload_to_telegram(
                 file_path=download_result['file_path'],
                 user_id=user_id,
                 video_info=video_info,
-                format_info=selected_format
+                format_info=selected_format,
+                thumbnail_data=thumbnail_task.result() if thumbnail_task else None
             )
 
             # Update status to completed
-            download_info['status'] = 'completed'
-            download_info['upload_result'] = upload_result
+            download_info.status = DownloadStatus.COMPLETED
+            download_info.upload_result = upload_result
 
             # Final success message
-            success_msg = f"""
-{Icons.SUCCESS} <b>Download Completed!</b>
-
-{Icons.VIDEO} <b>Title:</b> {video_info['title'][:50]}...
-{Icons.PLATFORM} <b>Platform:</b> {video_info['platform'].title()}
-{Icons.QUALITY} <b>Quality:</b> {selected_format['quality']}
-{Icons.SIZE} <b>File Size:</b> {format_file_size(download_result['file_size'])}
-
-{Icons.TIME} <b>Processing Time:</b>
-• Download: {format_duration(download_result.get('download_time', 0))}
-• Upload: {format_duration(upload_result.get('upload_time', 0))}
-
-{Icons.SPEED} <b>Average Speeds:</b>
-• Download: {format_file_size(download_result.get('average_speed', 0))}/s
-• Upload: {format_file_size(upload_result.get('average_speed', 0))}/s
-
-{Icons.LINK} <b>File uploaded to:</b> @{query.message.chat.username or 'Upload Channel'}
-            """
+            success_msg = _DOWNLOAD_DONE_TMPL.format(
+                title=title,
+                platform=video_info['_platform_title'],
+                quality=selected_format['quality'],
+                size=file_size_str,
+                download_time=format_duration(download_result.get('download_time', 0)),
+                upload_time=format_duration(upload_result.get('upload_time', 0)),
+                download_speed=download_speed_str,
+                upload_speed=format_file_size(upload_result.get('average_speed', 0)),
+                channel=query.message.chat.username or 'Upload Channel'
+            )
 
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.NEW_DOWNLOAD} Download Another", callback_data="new_download")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _DOWNLOAD_DONE_MARKUP
 
+            self._drop_pending_edit(query)
             await query.edit_message_text(
                 success_msg,
                 parse_mode=ParseMode.HTML,
@@ -879,29 +1156,23 @@ Each video may have different format options depending on the source platform.
             )
 
             # Record successful download in database
-            await self._record_successful_download(user_id, video_info, download_result, upload_result)
+            self._spawn_record(
+                self._record_successful_download(user_id, video_info, download_result, upload_result)
+            )
 
         except Exception as e:
-            logger.error(f"❌ Download/upload process failed: {e}", exc_info=True)
+            logger.error(f"❌ Download/upload process failed: {e}")
+            logger.debug("Download/upload process failed", exc_info=True)
+            if download_info is not None:
+                download_info.status = DownloadStatus.FAILED
 
             # Update user about the error
-            error_msg = f"""
-{Icons.ERROR} <b>Download Failed</b>
-
-{Icons.VIDEO} <b>Title:</b> {video_info['title'][:50]}...
-{Icons.REASON} <b>Error:</b> {str(e)[:100]}...
-
-{Icons.RETRY} Please try again or choose a different format.
-            """
+            error = str(e)
+            error_msg = _DOWNLOAD_FAILED_TMPL.format(title=title, error=error[:100])
 
-            keyboard = [
-                [
-                    InlineKeyboardButton(f"{Icons.RETRY} Try Again", callback_data="download_retry"),
-                    InlineKeyboardButton(f"{Icons.BACK} Back to Formats", callback_data="show_formats")
-                ]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _DOWNLOAD_FAILED_MARKUP
 
+            self._drop_pending_edit(query)
             await query.edit_message_text(
                 error_msg,
                 parse_mode=ParseMode.HTML,
@@ -909,13 +1180,22 @@ Each video may have different format options depending on the source platform.
             )
 
             # Record failed download in database
-            await self._record_failed_download(user_id, video_info, str(e))
+            self._spawn_record(self._record_failed_download(user_id, video_info, error))
 
         finally:
-            # Clean up user download tracking
-            if user_id in self.user_downloads:
+            # Clean up user download tracking, unless a newer pipeline for this user has taken the slot
+            if download_info is not None and self.user_downloads.get(user_id) is download_info:
                 del self.user_downloads[user_id]
 
+    async def _cancel_transfers(self, task_id: str) -> Tuple[bool, bool]:
+        """Cancel the download and upload for a task concurrently; failures count as not cancelled"""
+        results = await asyncio.gather(
+            self.downloader.cancel_download(task_id),
+            self.file_manager.cancel_upload(task_id),
+            return_exceptions=True
+        )
+        return tuple(result is True for result in results)
+
     async def _handle_download_cancel(self, query, user_id: int):
         """Handle download cancellation"""
         try:
@@ -923,28 +1203,41 @@ Each video may have different format options depending on the source platform.
                 download_info = self.user_downloads[user_id]
 
                 # Try to cancel active operations
-                if download_info.get('download_result'):
-                    task_id = download_info['download_result']['task_id']
-                    await self.downloader.cancel_download(task_id)
-                    await self.file_manager.cancel_upload(task_id)
+                if download_info.download_result:
+                    task_id = download_info.download_result['task_id']
+                    await self._cancel_transfers(task_id)
+
+                # Stop the pipeline task that owns this entry
+                task = download_info.task
+                if self._download_tasks.get(user_id) is task:
+                    del self._download_tasks[user_id]
+                if task and not task.done():
+                    task.cancel()
 
                 # Update message
+                self._drop_pending_edit(query)
                 await query.edit_message_text(
-                    f"{Icons.CANCELLED} Download cancelled by user.",
-                    reply_markup=None
+                    f"{CANCELLED} Download cancelled by user."
                 )
 
-                # Clean up
-                del self.user_downloads[user_id]
+                # Clean up (the cancelled pipeline may already have removed its own entry)
+                if self.user_downloads.get(user_id) is download_info:
+                    del self.user_downloads[user_id]
+            elif user_id in self._download_tasks:
+                # Still waiting for a pipeline slot; nothing has been transferred yet
+                self._download_tasks.pop(user_id).cancel()
+                await query.edit_message_text(
+                    f"{CANCELLED} Download cancelled by user."
+                )
             else:
                 await query.edit_message_text(
-                    f"{Icons.WARNING} No active download to cancel."
+                    f"{WARNING} No active download to cancel."
                 )
 
         except Exception as e:
             logger.error(f"Cancel download error: {e}")
             await query.edit_message_text(
-                f"{Icons.ERROR} Failed to cancel download."
+                f"{ERROR} Failed to cancel download."
             )
 
     async def _handle_download_retry(self, query, user_id: int):
@@ -952,21 +1245,21 @@ Each video may have different format options depending on the source platform.
         try:
             if user_id in self.user_downloads:
                 download_info = self.user_downloads[user_id]
-                video_info = download_info['video_info']
-                selected_format = download_info['selected_format']
-                is_audio = download_info['is_audio']
+                video_info = download_info.video_info
+                selected_format = download_info.selected_format
+                is_audio = download_info.is_audio
 
                 # Restart the download process
                 await self._start_download_process(query, user_id, video_info, selected_format, is_audio)
             else:
                 await query.edit_message_text(
-                    f"{Icons.ERROR} No download information found for retry."
+                    f"{ERROR} No download information found for retry."
                 )
 
         except Exception as e:
             logger.error(f"Retry download error: {e}")
             await query.edit_message_text(
-                f"{Icons.ERROR} Failed to retry download."
+                f"{ERROR} Failed to retry download."
             )
 
     async def _handle_progress_update(self, query, user_id: int):
@@ -975,31 +1268,146 @@ Each video may have different format options depending on the source platform.
             if user_id in self.user_downloads:
                 download_info = self.user_downloads[user_id]
 
-                if download_info['status'] == 'downloading' and download_info.get('download_result'):
-                    task_id = download_info['download_result']['task_id']
+                if download_info.status is DownloadStatus.DOWNLOADING and download_info.download_result:
+                    task_id = download_info.download_result['task_id']
                     progress = await self.progress_tracker.get_download_progress(task_id)
 
-                    progress_msg = create_download_progress_message(progress, download_info['video_info'])
+                    progress_msg = create_download_progress_message(progress, download_info.video_info)
 
-                    keyboard = [[
-                        InlineKeyboardButton(f"{Icons.REFRESH} Refresh", callback_data="download_progress"),
-                        InlineKeyboardButton(f"{Icons.CANCEL} Cancel", callback_data="download_cancel")
-                    ]]
-                    reply_markup = InlineKeyboardMarkup(keyboard)
+                    # Identical text would only earn a "message is not modified" error from Telegram
+                    if download_info.last_progress_msg == progress_msg:
+                        await self._answer(query, "No new progress yet")
+                        return
+                    download_info.last_progress_msg = progress_msg
 
-                    await query.edit_message_text(
-                        progress_msg,
-                        parse_mode=ParseMode.HTML,
-                        reply_markup=reply_markup
-                    )
+                    self._queue_edit(query, progress_msg, _PROGRESS_MARKUP)
                 else:
-                    await query.answer("Progress not available")
+                    await self._answer(query, "Progress not available")
             else:
-                await query.answer("No active download")
+                await self._answer(query, "No active download")
 
         except Exception as e:
             logger.error(f"Progress update error: {e}")
-            await query.answer("Failed to get progress")
+            await self._answer(query, "Failed to get progress")
+
+    def _queue_edit(self, query, text: str, reply_markup: Optional[InlineKeyboardMarkup] = None):
+        """Overwrite the pending edit for this message and make sure a flusher is running"""
+        # Message ids are only unique within a chat
+        key = (query.message.chat_id, query.message.message_id)
+        self._pending_edits[key] = (query, text, reply_markup)
+        if key not in self._edit_flushers:
+            self._edit_flushers[key] = asyncio.create_task(
+                self._flush_edits(key), name=f"edit-flush-{key[0]}-{key[1]}"
+            )
+
+    def _drop_pending_edit(self, query):
+        """Discard a queued edit so it cannot overwrite a final status message"""
+        if query.message is not None:
+            self._pending_edits.pop((query.message.chat_id, query.message.message_id), None)
+
+    async def _flush_edits(self, key: Tuple[int, int]):
+        """Send the latest queued edit for a message at most once per edit_interval"""
+        try:
+            # The first edit goes out at once: the flusher only exists while an edit was sent
+            # within the last interval, so only the edits queued behind it are throttled
+            while True:
+                payload = self._pending_edits.pop(key, None)
+                if payload is None:
+                    break
+                query, text, reply_markup = payload
+                try:
+                    await query.edit_message_text(text, parse_mode=ParseMode.HTML, reply_markup=reply_markup)
+                except Exception as e:
+                    if not is_message_not_modified(e):
+                        logger.warning(f"⚠️ Progress edit failed for message {key[1]} in chat {key[0]}: {e}")
+                await asyncio.sleep(self.edit_interval)
+        finally:
+            self._edit_flushers.pop(key, None)
+
+    async def _answer(self, query, text: Optional[str] = None, **kwargs) -> bool:
+        """Answer a callback query once; repeated answers for the same query are skipped"""
+        if query.id in self._answered_queries:
+            return False
+        self._answered_queries.add(query.id)
+        try:
+            return await query.answer(text, **kwargs)
+        except BadRequest as e:
+            logger.debug(f"Callback answer rejected: {e}")
+            return False
+
+    async def _run_callback(self, handler, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Run a routed callback handler as a background task, logging any failure"""
+        query = update.callback_query
+        try:
+            await handler(update, context)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not is_message_not_modified(e):
+                logger.error(f"❌ Callback handler error: {e}", exc_info=True)
+                try:
+                    await self._answer(query, "Something went wrong. Please try again.")
+                except Exception:
+                    pass
+        finally:
+            # Clear the client's loading spinner if the handler never answered
+            if query.id in self._answered_queries:
+                self._answered_queries.discard(query.id)
+            else:
+                try:
+                    await query.answer()
+                except Exception:
+                    pass
+
+    def get_pipeline_stats(self) -> Dict[str, int]:
+        """Counts of running and queued download pipelines (system_stats sampling)"""
+        statuses = [download.status for download in self.user_downloads.values()]
+        return {
+            'active_users': len(statuses),
+            'active_downloads': statuses.count(DownloadStatus.DOWNLOADING),
+            'active_uploads': statuses.count(DownloadStatus.UPLOADING),
+            'queue_size': self._queued_pipelines,
+        }
+
+    def _forget_download_task(self, user_id: int, task: asyncio.Task):
+        """Drop a finished task from tracking unless it was already replaced"""
+        if self._download_tasks.get(user_id) is task:
+            del self._download_tasks[user_id]
+
+    async def stop(self):
+        """Cancel all background download and callback tasks and wait for them to finish"""
+        tasks = (
+            list(self._active_tasks)
+            + list(self._callback_tasks)
+            + list(self._edit_flushers.values())
+        )
+        self._active_tasks.clear()
+        self._download_tasks.clear()
+        self._callback_tasks.clear()
+        self._pending_edits.clear()
+
+        for task in tasks:
+            task.cancel()
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.info(f"🛑 Cancelled {len(tasks)} background tasks")
+
+        # Let pending history writes land rather than dropping them
+        if self._record_tasks:
+            await asyncio.gather(*self._record_tasks, return_exceptions=True)
+
+    def _spawn_record(self, coro):
+        """Run a download record write in the background so the user is not kept waiting on the database"""
+        task = asyncio.create_task(coro)
+        self._record_tasks.add(task)
+        task.add_done_callback(self._on_record_done)
+
+    def _on_record_done(self, task: asyncio.Task):
+        """Drop a finished record task and log anything it raised"""
+        self._record_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"❌ Background download record failed: {task.exception()}")
 
     async def _record_successful_download(
         self,
@@ -1029,7 +1437,7 @@ Each video may have different format options depending on the source platform.
         """Handle Instagram login button callback"""
         try:
             query = update.callback_query
-            await query.answer()
+            await self._answer(query)
 
             # Check if Instagram cookies already exist
             has_cookies = bool(self.downloader.instagram_cookies)
@@ -1071,7 +1479,7 @@ Each video may have different format options depending on the source platform.
                     InlineKeyboardButton("🔄 Refresh Status", callback_data="instagram_login")
                 ],
                 [
-                    InlineKeyboardButton(f"{Icons.BACK} Back to Settings", callback_data="settings")
+                    InlineKeyboardButton(f"{BACK} Back to Settings", callback_data="settings")
                 ]
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -1084,48 +1492,47 @@ Each video may have different format options depending on the source platform.
 
         except Exception as e:
             logger.error(f"❌ Instagram login callback error: {e}", exc_info=True)
-            await update.callback_query.answer("Error loading Instagram login")
+            await self._answer(update.callback_query, "Error loading Instagram login")
 
-    async def _handle_retry_callback(self, update, context):
+    async def _handle_retry_callback(self, update, context, suffix: Optional[str] = None):
         """Handle retry button callback"""
         try:
             query = update.callback_query
-            await query.answer("Retrying extraction...")
+            await self._answer(query, "Retrying extraction...")
 
             # Extract URL hash from callback data
-            callback_data = query.data
-            url_hash = callback_data.replace("retry_", "")
+            url_hash = suffix if suffix is not None else query.data[len('retry_'):]
 
             # For now, just show a message since we need the original URL
             await query.edit_message_text(
                 f"""
-{Icons.REFRESH} <b>Retry Download</b>
+{REFRESH} <b>Retry Download</b>
 
 To retry the download, please send the video URL again.
 
-{Icons.TIP} <b>Tips for better success:</b>
+{TIP} <b>Tips for better success:</b>
 • Make sure the link is correct and accessible
 • Try copying the link from a different browser
 • For Instagram: Consider logging in via Settings → Instagram Login
 • For private content: Ensure you have access permissions
 
-{Icons.HELP} If problems persist, try a different video or contact support.
+{HELP} If problems persist, try a different video or contact support.
                 """,
                 parse_mode=ParseMode.HTML,
                 reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton(f"{Icons.BACK} Back", callback_data="start")
+                    InlineKeyboardButton(f"{BACK} Back", callback_data="start")
                 ]])
             )
 
         except Exception as e:
             logger.error(f"❌ Retry callback error: {e}", exc_info=True)
-            await update.callback_query.answer("Error processing retry")
+            await self._answer(update.callback_query, "Error processing retry")
 
     async def _handle_cookie_guide_callback(self, update, context):
         """Handle cookie guide button callback"""
         try:
             query = update.callback_query
-            await query.answer()
+            await self._answer(query)
 
             guide_text = """
 📋 <b>Instagram Cookie Guide</b>
@@ -1154,10 +1561,7 @@ To retry the download, please send the video URL again.
 • This bot only uses cookies for downloading
             """
 
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.BACK} Back to Instagram Login", callback_data="instagram_login")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _INSTAGRAM_BACK_MARKUP
 
             await query.edit_message_text(
                 guide_text,
@@ -1167,13 +1571,13 @@ To retry the download, please send the video URL again.
 
         except Exception as e:
             logger.error(f"❌ Cookie guide callback error: {e}", exc_info=True)
-            await update.callback_query.answer("Error loading cookie guide")
+            await self._answer(update.callback_query, "Error loading cookie guide")
 
     async def _handle_test_instagram_callback(self, update, context):
         """Handle test Instagram session callback"""
         try:
             query = update.callback_query
-            await query.answer("Testing Instagram session...")
+            await self._answer(query, "Testing Instagram session...")
 
             # Test the current Instagram cookies
             has_cookies = bool(self.downloader.instagram_cookies)
@@ -1212,10 +1616,7 @@ To retry the download, please send the video URL again.
 💡 Use the "How to Get Cookies" guide to set up authentication.
                 """
 
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.BACK} Back to Instagram Login", callback_data="instagram_login")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _INSTAGRAM_BACK_MARKUP
 
             await query.edit_message_text(
                 status_msg,
@@ -1225,13 +1626,13 @@ To retry the download, please send the video URL again.
 
         except Exception as e:
             logger.error(f"❌ Test Instagram callback error: {e}", exc_info=True)
-            await update.callback_query.answer("Error testing Instagram session")
+            await self._answer(update.callback_query, "Error testing Instagram session")
 
     async def _handle_clear_instagram_callback(self, update, context):
         """Handle clear Instagram cookies callback"""
         try:
             query = update.callback_query
-            await query.answer("Clearing Instagram cookies...")
+            await self._answer(query, "Clearing Instagram cookies...")
 
             # Clear Instagram cookies
             self.downloader.instagram_cookies = None
@@ -1249,10 +1650,7 @@ To retry the download, please send the video URL again.
 💡 To re-enable Instagram authentication, add your cookies again using the "How to Get Cookies" guide.
             """
 
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.BACK} Back to Instagram Login", callback_data="instagram_login")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _INSTAGRAM_BACK_MARKUP
 
             await query.edit_message_text(
                 clear_msg,
@@ -1262,7 +1660,7 @@ To retry the download, please send the video URL again.
 
         except Exception as e:
             logger.error(f"❌ Clear Instagram callback error: {e}", exc_info=True)
-            await update.callback_query.answer("Error clearing Instagram cookies")
+            await self._answer(update.callback_query, "Error clearing Instagram cookies")
 
     async def _test_instagram_session(self) -> Dict[str, Any]:
         """Test Instagram session validity"""
@@ -1280,7 +1678,7 @@ To retry the download, please send the video URL again.
             if self.downloader.instagram_cookies:
                 headers['Cookie'] = self.downloader.instagram_cookies
 
-            async with aiohttp.ClientSession() as session:
+            async with shared_http_session() as session:
                 async with session.get('https://www.instagram.com/accounts/edit/', headers=headers, timeout=10) as response:
                     response_time = time.time() - start_time
 
@@ -1307,45 +1705,19 @@ To retry the download, please send the video URL again.
                 'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
             }
 
-    async def _handle_quality_selection_callback(self, update, context):
+    async def _handle_quality_selection_callback(self, update, context, suffix: Optional[str] = None):
         """Handle quality selection callbacks"""
         try:
             query = update.callback_query
-            callback_data = query.data
-            quality_type = callback_data.replace('quality_', '')
-
-            # Map quality types to user-friendly names
-            quality_names = {
-                'best': 'Best Available',
-                '2160p': '4K (2160p)',
-                '1080p': '1080p Full HD',
-                '720p': '720p HD',
-                '480p': '480p Standard',
-                'audio': 'Audio Only (MP3)'
-            }
+            quality_type = suffix if suffix is not None else query.data[len('quality_'):]
 
-            selected_quality = quality_names.get(quality_type, quality_type)
+            selected_quality = _QUALITY_NAMES.get(quality_type, quality_type)
 
-            await query.answer(f"Quality set to {selected_quality}")
+            await self._answer(query, f"Quality set to {selected_quality}")
 
             # Store user preference (would typically save to database)
             # For now, just show confirmation
-
-            confirmation_text = f"""
-✅ <b>Quality Setting Updated</b>
-
-🎬 <b>Selected Quality:</b> {selected_quality}
-
-📱 This setting will be used as default for all your future downloads.
-
-💡 <b>Note:</b> You can still choose different qualities when downloading specific videos.
-            """
-
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.SETTINGS} Back to Settings", callback_data="settings"),
-                InlineKeyboardButton(f"{Icons.BACK} Main Menu", callback_data="start")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            confirmation_text, reply_markup = _build_quality_confirmation(selected_quality)
 
             await query.edit_message_text(
                 confirmation_text,
@@ -1355,44 +1727,19 @@ To retry the download, please send the video URL again.
 
         except Exception as e:
             logger.error(f"❌ Quality selection callback error: {e}", exc_info=True)
-            await update.callback_query.answer("Error updating quality setting")
+            await self._answer(update.callback_query, "Error updating quality setting")
 
-    async def _handle_format_selection_callback(self, update, context):
+    async def _handle_format_selection_callback(self, update, context, suffix: Optional[str] = None):
         """Handle format selection callbacks"""
         try:
             query = update.callback_query
-            callback_data = query.data
-            format_type = callback_data.replace('format_', '')
-
-            # Map format types to user-friendly names
-            format_names = {
-                'mp4': 'MP4 (Recommended)',
-                'webm': 'WEBM (Smaller size)',
-                'mkv': 'MKV (High quality)',
-                'mp3': 'MP3 Audio',
-                'm4a': 'M4A Audio (High quality)',
-                'ogg': 'OGG Audio (Open source)'
-            }
-
-            selected_format = format_names.get(format_type, format_type.upper())
-
-            await query.answer(f"Format set to {selected_format}")
-
-            confirmation_text = f"""
-✅ <b>Format Setting Updated</b>
+            format_type = suffix if suffix is not None else query.data[len('format_'):]
 
-📹 <b>Selected Format:</b> {selected_format}
+            selected_format = _FORMAT_NAMES.get(format_type, format_type.upper())
 
-📱 This format will be used as default for all your future downloads.
+            await self._answer(query, f"Format set to {selected_format}")
 
-💡 <b>Note:</b> Some platforms may not support all formats. The bot will automatically fall back to the best available format.
-            """
-
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.SETTINGS} Back to Settings", callback_data="settings"),
-                InlineKeyboardButton(f"{Icons.BACK} Main Menu", callback_data="start")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            confirmation_text, reply_markup = _build_format_confirmation(selected_format)
 
             await query.edit_message_text(
                 confirmation_text,
@@ -1402,14 +1749,13 @@ To retry the download, please send the video URL again.
 
         except Exception as e:
             logger.error(f"❌ Format selection callback error: {e}", exc_info=True)
-            await update.callback_query.answer("Error updating format setting")
+            await self._answer(update.callback_query, "Error updating format setting")
 
-    async def _handle_notification_setting_callback(self, update, context):
+    async def _handle_notification_setting_callback(self, update, context, suffix: Optional[str] = None):
         """Handle notification setting callbacks"""
         try:
             query = update.callback_query
-            callback_data = query.data
-            notification_type = callback_data.replace('notify_', '')
+            notification_type = suffix if suffix is not None else query.data[len('notify_'):]
 
             if notification_type == 'all_on':
                 setting_name = "All Notifications Enabled"
@@ -1424,10 +1770,10 @@ To retry the download, please send the video URL again.
                 await self._show_custom_notification_settings(query)
                 return
             else:
-                await query.answer("Unknown notification setting")
+                await self._answer(query, "Unknown notification setting")
                 return
 
-            await query.answer(f"Notifications: {setting_name}")
+            await self._answer(query, f"Notifications: {setting_name}")
 
             confirmation_text = f"""
 {status_icon} <b>Notification Settings Updated</b>
@@ -1439,11 +1785,7 @@ To retry the download, please send the video URL again.
 💡 <b>Note:</b> You can change these settings anytime from the Settings menu.
             """
 
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.SETTINGS} Back to Settings", callback_data="settings"),
-                InlineKeyboardButton(f"{Icons.BACK} Main Menu", callback_data="start")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _RESET_SETTINGS_MARKUP
 
             await query.edit_message_text(
                 confirmation_text,
@@ -1453,7 +1795,7 @@ To retry the download, please send the video URL again.
 
         except Exception as e:
             logger.error(f"❌ Notification setting callback error: {e}", exc_info=True)
-            await update.callback_query.answer("Error updating notification settings")
+            await self._answer(update.callback_query, "Error updating notification settings")
 
     async def _show_custom_notification_settings(self, query):
         """Show custom notification settings menu"""
@@ -1475,7 +1817,7 @@ Choose which notifications you want to receive:
             [InlineKeyboardButton("❌ Toggle Error Notifications", callback_data="notify_error_toggle")],
             [InlineKeyboardButton("📈 Toggle Daily Summary", callback_data="notify_summary_toggle")],
             [InlineKeyboardButton("🔔 Toggle System Alerts", callback_data="notify_system_toggle")],
-            [InlineKeyboardButton(f"{Icons.BACK} Back to Notifications", callback_data="setting_notifications")]
+            [InlineKeyboardButton(f"{BACK} Back to Notifications", callback_data="setting_notifications")]
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -1485,55 +1827,21 @@ Choose which notifications you want to receive:
             reply_markup=reply_markup
         )
 
-    async def _handle_advanced_setting_callback(self, update, context):
+    async def _handle_advanced_setting_callback(self, update, context, suffix: Optional[str] = None):
         """Handle advanced setting callbacks"""
         try:
             query = update.callback_query
-            callback_data = query.data
-            setting_type = callback_data.replace('advanced_', '')
-
-            setting_names = {
-                'fast_mode': 'Fast Mode',
-                'auto_cleanup': 'Auto Cleanup',
-                'safe_mode': 'Safe Mode',
-                'bandwidth_limit': 'Bandwidth Limiting',
-                'file_verification': 'File Verification'
-            }
-
-            setting_descriptions = {
-                'fast_mode': 'Skips some checks for faster processing',
-                'auto_cleanup': 'Automatically cleans temporary files after downloads',
-                'safe_mode': 'Performs extra security checks on all downloads',
-                'bandwidth_limit': 'Limits download speed to preserve bandwidth',
-                'file_verification': 'Verifies file integrity after downloads'
-            }
+            setting_type = suffix if suffix is not None else query.data[len('advanced_'):]
 
-            setting_name = setting_names.get(setting_type, setting_type.replace('_', ' ').title())
-            setting_desc = setting_descriptions.get(setting_type, 'Advanced setting')
+            setting_name = _ADVANCED_SETTING_NAMES.get(setting_type, setting_type.replace('_', ' ').title())
 
             # Toggle the setting (this would typically update in database)
-            current_status = "Enabled"  # This should come from user settings
-            new_status = "Disabled" if current_status == "Enabled" else "Enabled"
-            status_icon = "✅" if new_status == "Enabled" else "❌"
+            current_enabled = True  # This should come from user settings
+            new_enabled = not current_enabled
 
-            await query.answer(f"{setting_name}: {new_status}")
+            await self._answer(query, f"{setting_name}: {'Enabled' if new_enabled else 'Disabled'}")
 
-            confirmation_text = f"""
-{status_icon} <b>Advanced Setting Updated</b>
-
-⚙️ <b>Setting:</b> {setting_name}
-📊 <b>Status:</b> {new_status}
-
-📝 <b>Description:</b> {setting_desc}
-
-💡 <b>Note:</b> Advanced settings affect bot performance and behavior. Changes take effect immediately.
-            """
-
-            keyboard = [[
-                InlineKeyboardButton(f"{Icons.ADVANCED} Back to Advanced", callback_data="setting_advanced"),
-                InlineKeyboardButton(f"{Icons.SETTINGS} Settings Menu", callback_data="settings")
-            ]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            confirmation_text, reply_markup = _build_advanced_confirmation(setting_type, new_enabled)
 
             await query.edit_message_text(
                 confirmation_text,
@@ -1543,14 +1851,13 @@ Choose which notifications you want to receive:
 
         except Exception as e:
             logger.error(f"❌ Advanced setting callback error: {e}", exc_info=True)
-            await update.callback_query.answer("Error updating advanced setting")
+            await self._answer(update.callback_query, "Error updating advanced setting")
 
-    async def _handle_admin_action_callback(self, update, context):
+    async def _handle_admin_action_callback(self, update, context, suffix: Optional[str] = None):
         """Handle admin action callbacks"""
         try:
             query = update.callback_query
-            callback_data = query.data
-            admin_action = callback_data.replace('admin_', '')
+            admin_action = suffix if suffix is not None else query.data[len('admin_'):]
 
             # Check if user is admin (this should check actual admin permissions)
             user_id = update.effective_user.id if update.effective_user else 0
@@ -1564,11 +1871,11 @@ Choose which notifications you want to receive:
             elif admin_action == 'backup':
                 await self._handle_admin_backup(query)
             else:
-                await query.answer("Unknown admin action")
+                await self._handle_admin_callback(update, context, suffix=admin_action)
 
         except Exception as e:
             logger.error(f"❌ Admin action callback error: {e}", exc_info=True)
-            await update.callback_query.answer("Error processing admin action")
+            await self._answer(update.callback_query, "Error processing admin action")
 
     async def _handle_admin_broadcast(self, query):
         """Handle admin broadcast action"""
@@ -1589,7 +1896,7 @@ Choose which notifications you want to receive:
 
         keyboard = [[
             InlineKeyboardButton("📊 View User Statistics", callback_data="admin_user_stats"),
-            InlineKeyboardButton(f"{Icons.BACK} Back to Admin", callback_data="admin_menu")
+            InlineKeyboardButton(f"{BACK} Back to Admin", callback_data="admin_menu")
         ]]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -1620,7 +1927,7 @@ Choose which notifications you want to receive:
             [InlineKeyboardButton("🗑️ Clear Temp Files", callback_data="maintenance_cleanup")],
             [InlineKeyboardButton("🔄 Restart Components", callback_data="maintenance_restart")],
             [InlineKeyboardButton("📊 System Diagnostics", callback_data="maintenance_diagnostics")],
-            [InlineKeyboardButton(f"{Icons.BACK} Back to Admin", callback_data="admin_menu")]
+            [InlineKeyboardButton(f"{BACK} Back to Admin", callback_data="admin_menu")]
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -1656,7 +1963,7 @@ Choose which notifications you want to receive:
             [InlineKeyboardButton("📄 Download Full Log", callback_data="logs_download")],
             [InlineKeyboardButton("🔍 Filter by Level", callback_data="logs_filter")],
             [InlineKeyboardButton("🗑️ Clear Old Logs", callback_data="logs_cleanup")],
-            [InlineKeyboardButton(f"{Icons.BACK} Back to Admin", callback_data="admin_menu")]
+            [InlineKeyboardButton(f"{BACK} Back to Admin", callback_data="admin_menu")]
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -1693,7 +2000,7 @@ Choose which notifications you want to receive:
             [InlineKeyboardButton("🔄 Create Backup Now", callback_data="backup_create")],
             [InlineKeyboardButton("📥 Download Latest Backup", callback_data="backup_download")],
             [InlineKeyboardButton("⚙️ Backup Settings", callback_data="backup_settings")],
-            [InlineKeyboardButton(f"{Icons.BACK} Back to Admin", callback_data="admin_menu")]
+            [InlineKeyboardButton(f"{BACK} Back to Admin", callback_data="admin_menu")]
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -1707,7 +2014,7 @@ Choose which notifications you want to receive:
         """Handle support button callback"""
         try:
             query = update.callback_query
-            await query.answer()
+            await self._answer(query)
 
             support_text = f"""
 🆘 <b>Support & Help Center</b>
@@ -1735,7 +2042,7 @@ Choose which notifications you want to receive:
                 [InlineKeyboardButton("📧 Contact Admin", url="https://t.me/VideoDownloaderAdmin")],
                 [InlineKeyboardButton("📚 User Guide", callback_data="support_guide")],
                 [InlineKeyboardButton("❓ FAQ", callback_data="support_faq")],
-                [InlineKeyboardButton(f"{Icons.BACK} Back to Menu", callback_data="start")]
+                [InlineKeyboardButton(f"{BACK} Back to Menu", callback_data="start")]
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -1747,20 +2054,20 @@ Choose which notifications you want to receive:
 
         except Exception as e:
             logger.error(f"❌ Support callback error: {e}", exc_info=True)
-            await update.callback_query.answer("Error loading support information")
+            await self._answer(update.callback_query, "Error loading support information")
 
     async def _handle_header_audio_callback(self, update, context):
         """Handle header audio button callback"""
         try:
             query = update.callback_query
-            await query.answer()
+            await self._answer(query)
 
             user_id = update.effective_user.id
             
             # Parse callback data to get video ID (format: header_audio_<video_id>)
             callback_data = query.data
             if callback_data.startswith("header_audio_"):
-                video_id = callback_data.replace("header_audio_", "")
+                video_id = callback_data[len("header_audio_"):]
             else:
                 # Fallback: try to extract from context or use generic header_audio
                 video_id = None
@@ -1778,7 +2085,7 @@ Choose which notifications you want to receive:
 
             if not video_id:
                 await query.edit_message_text(
-                    f"{Icons.ERROR} Video information expired. Please send the URL again."
+                    f"{ERROR} Video information expired. Please send the URL again."
                 )
                 return
 
@@ -1786,7 +2093,7 @@ Choose which notifications you want to receive:
             video_info = await self._get_cached_video_info(video_id)
             if not video_info:
                 await query.edit_message_text(
-                    f"{Icons.ERROR} Video information expired. Please send the URL again."
+                    f"{ERROR} Video information expired. Please send the URL again."
                 )
                 return
 
@@ -1794,7 +2101,7 @@ Choose which notifications you want to receive:
             audio_formats = video_info.get('audio_formats', [])
             if not audio_formats:
                 await query.edit_message_text(
-                    f"{Icons.ERROR} No audio formats available for this video."
+                    f"{ERROR} No audio formats available for this video."
                 )
                 return
 
@@ -1813,4 +2120,4 @@ Choose which notifications you want to receive:
 
         except Exception as e:
             logger.error(f"❌ Header audio callback error: {e}", exc_info=True)
-            await update.callback_query.answer("Error processing audio download")
\ No newline at end of file
+            await self._answer(update.callback_query, "Error processing audio download")
\ No newline at end of file
@@ -16,7 +16,7 @@ from database.connection import DatabaseManager
 from services.cache_manager import CacheManager
 from config.settings import settings
 from utils.formatters import format_file_size, format_duration, format_uptime
-from utils.helpers import get_system_stats, create_welcome_message
+from utils.helpers import get_system_stats, create_welcome_message, is_message_not_modified
 from static.icons import Icons
 
 logger = logging.getLogger(__name__)
@@ -157,6 +157,10 @@ class CommandHandlers:
                     )
             
         except Exception as e:
+            if is_message_not_modified(e):
+                # Repeated refresh of an unchanged screen; nothing to report
+                logger.debug(f"Help view unchanged: {e}")
+                return
             logger.error(f"❌ Help command error: {e}", exc_info=True)
             if update.effective_message:
                 await update.effective_message.reply_text(
@@ -244,6 +248,10 @@ class CommandHandlers:
                     )
             
         except Exception as e:
+            if is_message_not_modified(e):
+                # Repeated refresh of an unchanged screen; nothing to report
+                logger.debug(f"Stats view unchanged: {e}")
+                return
             logger.error(f"❌ Stats command error: {e}", exc_info=True)
             if update.effective_message:
                 await update.effective_message.reply_text(
@@ -323,6 +331,10 @@ class CommandHandlers:
                     )
             
         except Exception as e:
+            if is_message_not_modified(e):
+                # Repeated refresh of an unchanged screen; nothing to report
+                logger.debug(f"Status view unchanged: {e}")
+                return
             logger.error(f"❌ Status command error: {e}", exc_info=True)
             if update.effective_message:
                 await update.effective_message.reply_text(
@@ -444,6 +456,10 @@ Current: {user_settings.get('default_format', 'MP4')}
                 )
             
         except Exception as e:
+            if is_message_not_modified(e):
+                # Repeated refresh of an unchanged screen; nothing to report
+                logger.debug(f"Settings view unchanged: {e}")
+                return
             logger.error(f"❌ Settings command error: {e}", exc_info=True)
             await update.effective_message.reply_text(
                 f"{Icons.ERROR} Sorry, couldn't load settings."
@@ -6,8 +6,7 @@ Handles URL detection, video preview generation, and user interactions
 import asyncio
 import logging
 import hashlib
-import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from urllib.parse import urlparse
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
@@ -23,6 +22,15 @@ from static.icons import Icons
 
 logger = logging.getLogger(__name__)
 
+# Fixed keyboards, built once instead of per message
+_ERROR_HELP_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{Icons.HELP} Help", callback_data="help"),
+    InlineKeyboardButton(f"{Icons.SUPPORT} Support", callback_data="support")
+]])
+_SHOW_HELP_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton(f"{Icons.HELP} Show Help", callback_data="help")
+]])
+
 class MessageHandlers:
     """Handler class for user messages"""
     
@@ -30,11 +38,14 @@ class MessageHandlers:
         self, 
         downloader: VideoDownloader, 
         cache_manager: CacheManager,
-        progress_tracker: ProgressTracker
+        progress_tracker: ProgressTracker,
+        preview_sink: Optional[Callable[[str, Dict[str, Any]], None]] = None
     ):
         self.downloader = downloader
         self.cache_manager = cache_manager
         self.progress_tracker = progress_tracker
+        # Receives each parsed preview so format selection can skip the Redis read and decode
+        self.preview_sink = preview_sink
     
     async def handle_url_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle messages containing video URLs"""
@@ -220,18 +231,10 @@ Unable to extract video information.
 • Use a different video URL
             """
         
-        keyboard = [
-            [
-                InlineKeyboardButton(f"{Icons.HELP} Help", callback_data="help"),
-                InlineKeyboardButton(f"{Icons.SUPPORT} Support", callback_data="support")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         await message.edit_text(
             error_msg,
             parse_mode=ParseMode.HTML,
-            reply_markup=reply_markup
+            reply_markup=_ERROR_HELP_MARKUP
         )
     
     async def _send_video_preview(self, message, video_info: Dict[str, Any], original_url: str):
@@ -240,13 +243,16 @@ Unable to extract video information.
             # Create video ID for caching
             video_id = hashlib.md5(original_url.encode()).hexdigest()[:12]
             
-            # Cache video info for format selection
+            # Cache video info for format selection (orjson text: the Redis client runs with
+            # decode_responses=True, so binary encodings such as msgpack cannot be stored)
             cache_key = f"video_preview:{video_id}"
             await self.cache_manager.set(
                 cache_key, 
-                json.dumps(video_info, default=str), 
+                video_info,
                 expire=3600  # 1 hour
             )
+            if self.preview_sink:
+                self.preview_sink(video_id, dict(video_info))
             
             # Create preview message
             preview_text = self._create_preview_text(video_info)
@@ -408,14 +414,9 @@ Unable to extract video information.
             
             # Check for common keywords and provide helpful responses
             if any(word in text for word in ['help', 'how', 'what', 'guide']):
-                keyboard = [[
-                    InlineKeyboardButton(f"{Icons.HELP} Show Help", callback_data="help")
-                ]]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                
                 await message.reply_text(
                     f"{Icons.TIP} Need help? Click the button below for a complete guide!",
-                    reply_markup=reply_markup
+                    reply_markup=_SHOW_HELP_MARKUP
                 )
                 
             elif any(word in text for word in ['thank', 'thanks', 'awesome', 'great', 'good']):
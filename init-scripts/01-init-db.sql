@@ -22,6 +22,7 @@ ALTER SYSTEM SET effective_io_concurrency = 200;
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 CREATE EXTENSION IF NOT EXISTS "btree_gin";
+CREATE EXTENSION IF NOT EXISTS "citext";
 
 -- Grant permissions
 GRANT ALL PRIVILEGES ON DATABASE video_bot TO postgres;
@@ -99,5 +99,11 @@ if __name__ == "__main__":
             # Alternative approach
             asyncio.ensure_future(main())
     except RuntimeError:
-        # No event loop running, create a new one
+        # No event loop running: use uvloop when available, then create a new loop
+        try:
+            import uvloop
+            uvloop.install()
+            logger.info("⚡ uvloop event loop enabled")
+        except ImportError:
+            logger.warning("⚠️ uvloop not available, using default asyncio event loop")
         asyncio.run(main())
\ No newline at end of file
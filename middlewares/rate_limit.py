@@ -310,9 +310,17 @@ class RateLimitMiddleware:
             current_time = time.time()
             info = {}
             
-            # Check penalty status
+            # Fetch the penalty and every per-action history in one round trip
             penalty_key = f"rate_limit:penalty:{user_id}"
-            penalty_end = await self.cache_manager.get(penalty_key)
+            action_keys = {
+                action_type: f"rate_limit:user:{user_id}:{action_type}"
+                for action_type in self.rate_limits
+                if action_type != 'global'
+            }
+            cached = await self.cache_manager.get_many([penalty_key, *action_keys.values()])
+            
+            # Check penalty status
+            penalty_end = cached.get(penalty_key)
             
             if penalty_end:
                 penalty_end_time = float(penalty_end)
@@ -325,12 +333,9 @@ class RateLimitMiddleware:
                 info['penalized'] = False
             
             # Get request counts for different actions
-            for action_type, rate_limit in self.rate_limits.items():
-                if action_type == 'global':
-                    continue
-                
-                requests_key = f"rate_limit:user:{user_id}:{action_type}"
-                cached_requests = await self.cache_manager.get(requests_key)
+            for action_type, requests_key in action_keys.items():
+                rate_limit = self.rate_limits[action_type]
+                cached_requests = cached.get(requests_key)
                 
                 if cached_requests:
                     import json
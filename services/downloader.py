@@ -20,7 +20,7 @@ from config.settings import settings
 from services.file_manager import FileManager
 from services.progress_tracker import ProgressTracker
 from services.cache_manager import CacheManager
-from utils.helpers import generate_task_id, format_file_size, sanitize_filename
+from utils.helpers import generate_task_id, format_file_size, sanitize_filename, shared_http_session
 from utils.validators import is_valid_url, get_platform_from_url
 
 logger = logging.getLogger(__name__)
@@ -244,7 +244,7 @@ class VideoDownloader:
                 # Cache the result for 1 hour
                 await self.cache_manager.set(
                     cache_key,
-                    json.dumps(processed_info, default=str),
+                    processed_info,
                     expire=3600
                 )
 
@@ -420,8 +420,8 @@ class VideoDownloader:
                 'Connection': 'keep-alive',
             }
 
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(embed_url, headers=headers) as response:
+            async with shared_http_session() as session:
+                async with session.get(embed_url, headers=headers, timeout=timeout) as response:
                     if response.status == 200:
                         content = await response.text()
 
@@ -543,8 +543,8 @@ class VideoDownloader:
                     logger.info(f"🔍 Trying {strategy['name']} strategy...")
                     test_url = strategy['url_modifier'](url)
 
-                    async with aiohttp.ClientSession(timeout=timeout) as session:
-                        async with session.get(test_url, headers=strategy['headers']) as response:
+                    async with shared_http_session() as session:
+                        async with session.get(test_url, headers=strategy['headers'], timeout=timeout) as response:
                             if response.status == 200:
                                 content = await response.text()
 
@@ -698,9 +698,9 @@ class VideoDownloader:
                         if service["method"] == "post":
                             headers["Content-Type"] = "application/json"
 
-                        async with aiohttp.ClientSession(timeout=timeout) as session:
+                        async with shared_http_session() as session:
                             if service["method"] == "post":
-                                async with session.post(service["url"], json=service.get("json"), headers=headers) as response:
+                                async with session.post(service["url"], json=service.get("json"), headers=headers, timeout=timeout) as response:
                                     if response.status == 200:
                                         data = await response.json()
                                         result = self._extract_rapidapi_data(data, url)
@@ -708,7 +708,7 @@ class VideoDownloader:
                                             logger.info(f"✅ {service['name']} successful with key {api_key[:10]}...")
                                             return result
                             else:
-                                async with session.get(service["url"], params=service.get("params"), headers=headers) as response:
+                                async with session.get(service["url"], params=service.get("params"), headers=headers, timeout=timeout) as response:
                                     if response.status == 200:
                                         data = await response.json()
                                         result = self._extract_rapidapi_data(data, url)
@@ -851,8 +851,8 @@ class VideoDownloader:
                 try:
                     logger.info(f"🔄 Trying {strategy['name']} strategy...")
 
-                    async with aiohttp.ClientSession(timeout=timeout) as session:
-                        async with session.get(strategy["url"], headers=strategy["headers"]) as response:
+                    async with shared_http_session() as session:
+                        async with session.get(strategy["url"], headers=strategy["headers"], timeout=timeout) as response:
                             if response.status == 200:
                                 content_type = response.headers.get('content-type', '')
 
@@ -1007,20 +1007,20 @@ class VideoDownloader:
                 try:
                     logger.info(f"🔄 Trying {service['name']} scraper...")
 
-                    async with aiohttp.ClientSession(timeout=timeout) as session:
+                    async with shared_http_session() as session:
                         if service["method"] == "post":
                             if service["headers"].get('Content-Type') == 'application/json':
-                                async with session.post(service["url"], json=service["data"], headers=service["headers"]) as response:
+                                async with session.post(service["url"], json=service["data"], headers=service["headers"], timeout=timeout) as response:
                                     result = await self._process_scraper_response(response, service["name"], url)
                                     if result:
                                         return result
                             else:
-                                async with session.post(service["url"], data=service["data"], headers=service["headers"]) as response:
+                                async with session.post(service["url"], data=service["data"], headers=service["headers"], timeout=timeout) as response:
                                     result = await self._process_scraper_response(response, service["name"], url)
                                     if result:
                                         return result
                         else:
-                            async with session.get(service["url"], headers=service["headers"]) as response:
+                            async with session.get(service["url"], headers=service["headers"], timeout=timeout) as response:
                                 result = await self._process_scraper_response(response, service["name"], url)
                                 if result:
                                     return result
@@ -1137,14 +1137,14 @@ class VideoDownloader:
 
             timeout = aiohttp.ClientTimeout(total=20)
 
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with shared_http_session() as session:
                 # First get media info via oEmbed
                 params = {
                     'url': url,
                     'access_token': settings.INSTAGRAM_ACCESS_TOKEN
                 }
 
-                async with session.get(graph_url, params=params) as response:
+                async with session.get(graph_url, params=params, timeout=timeout) as response:
                     if response.status == 200:
                         oembed_data = await response.json()
 
@@ -1161,7 +1161,7 @@ class VideoDownloader:
                                 'access_token': settings.INSTAGRAM_ACCESS_TOKEN
                             }
 
-                            async with session.get(media_url, params=media_params) as media_response:
+                            async with session.get(media_url, params=media_params, timeout=timeout) as media_response:
                                 if media_response.status == 200:
                                     media_data = await media_response.json()
 
@@ -1212,7 +1212,7 @@ class VideoDownloader:
                 'access_token': settings.FACEBOOK_ACCESS_TOKEN
             }
 
-            async with aiohttp.ClientSession() as session:
+            async with shared_http_session() as session:
                 async with session.get(api_url, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -1587,7 +1587,7 @@ class VideoDownloader:
                         pass
                 except Exception as e:
                     # Silently handle progress update errors
-                    logger.debug(f"Progress update error: {e}")
+                    logger.debug("Progress update error: %s", e)
 
         return progress_hook
 
@@ -1610,7 +1610,7 @@ class VideoDownloader:
                         pass
                 except Exception as e:
                     # Silently handle progress update errors
-                    logger.debug(f"Progress update error: {e}")
+                    logger.debug("Progress update error: %s", e)
 
         return postprocessor_hook
 
@@ -2323,11 +2323,12 @@ class VideoDownloader:
             timeout = aiohttp.ClientTimeout(total=300)
             headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
 
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(video_url, headers=headers) as response:
+            async with shared_http_session() as session:
+                async with session.get(video_url, headers=headers, timeout=timeout) as response:
                     if response.status == 200:
                         async with aiofiles.open(file_path, "wb") as f:
-                            async for chunk in response.content.iter_chunked(8192):
+                            # CHUNK_SIZE chunks: one thread-pool write per 512KB rather than per 8KB
+                            async for chunk in response.content.iter_chunked(settings.CHUNK_SIZE):
                                 await f.write(chunk)
 
                         file_size = os.path.getsize(file_path)
@@ -9,7 +9,7 @@ import os
 import shutil
 import tempfile
 import time
-from typing import Dict, Any, Optional, Callable, List
+from typing import Dict, Any, Optional, Callable, List, Tuple
 from pathlib import Path
 import hashlib
 import mimetypes
@@ -17,7 +17,7 @@ import mimetypes
 from core.telethon_client import TelethonManager
 from services.progress_tracker import ProgressTracker
 from config.settings import settings
-from utils.helpers import format_file_size, generate_task_id, get_file_hash
+from utils.helpers import format_file_size, generate_task_id, get_file_hash, get_http_session
 from utils.formatters import format_duration, format_upload_time
 
 logger = logging.getLogger(__name__)
@@ -41,6 +41,7 @@ class FileManager:
         # Optimization settings
         self.chunk_size = settings.CHUNK_SIZE
         self.max_file_size = settings.MAX_FILE_SIZE
+        self.max_file_size_str = format_file_size(self.max_file_size)
         
         # File integrity checking
         self.verify_file_integrity = True
@@ -62,7 +63,8 @@ class FileManager:
         user_id: int,
         video_info: Dict[str, Any],
         format_info: Dict[str, Any],
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        thumbnail_data: Optional[bytes] = None
     ) -> Dict[str, Any]:
         """
         High-performance upload to Telegram with progress tracking
@@ -73,19 +75,19 @@ class FileManager:
             start_time = time.time()
             
             try:
-                # Validate file
-                await self._validate_file_for_upload(file_path)
+                # Validate file (size check first, before any metadata/caption work)
+                file_size = await self._validate_file_for_upload(file_path)
                 
                 # Apply ultra-optimizations before upload
-                optimized_file_path = await self._ultra_optimize_file(file_path, video_info)
+                optimized_file_path = await self._ultra_optimize_file(file_path, video_info, file_size)
                 if optimized_file_path != file_path:
                     file_path = optimized_file_path
+                    file_size = os.path.getsize(file_path)
                     logger.info(f"🚀 File optimized for ultra-fast upload")
                 
                 # Skip file checksum for speed
                 file_checksum = None
                 
-                file_size = os.path.getsize(file_path)
                 filename = os.path.basename(file_path)
                 
                 logger.info(f"📤 Starting upload task {task_id}: {filename} ({format_file_size(file_size)})")
@@ -104,10 +106,10 @@ class FileManager:
                 )
                 
                 # Prepare file metadata
-                video_metadata = await self._extract_video_metadata(file_path, video_info)
+                video_metadata = await self._extract_video_metadata(file_path, video_info, format_info)
                 
                 # Generate thumbnail if needed
-                thumbnail_path = await self._generate_thumbnail(file_path, video_info)
+                thumbnail_path = await self._generate_thumbnail(file_path, video_info, thumbnail_data)
                 
                 # Create progress callback
                 upload_progress_callback = self._create_upload_progress_callback(task_id, file_size)
@@ -144,6 +146,7 @@ class FileManager:
                     'task_id': task_id,
                     'filename': filename,
                     'file_size': file_size,
+                    'file_size_str': format_file_size(file_size),
                     'upload_time': upload_time,
                     'average_speed': average_speed,
                     'user_id': user_id,
@@ -185,17 +188,18 @@ class FileManager:
                     # Move to history or clean up after some time
                     asyncio.create_task(self._cleanup_active_upload(task_id))
     
-    async def _validate_file_for_upload(self, file_path: str):
-        """Validate file before upload"""
-        if not os.path.exists(file_path):
+    async def _validate_file_for_upload(self, file_path: str) -> int:
+        """Validate file before upload and return its size"""
+        try:
+            file_size = os.stat(file_path).st_size
+        except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        file_size = os.path.getsize(file_path)
         if file_size == 0:
             raise ValueError("File is empty")
         
         if file_size > self.max_file_size:
-            raise ValueError(f"File too large: {format_file_size(file_size)} > {format_file_size(self.max_file_size)}")
+            raise ValueError(f"File too large: {format_file_size(file_size)} > {self.max_file_size_str}")
         
         # Check if file is readable
         try:
@@ -203,19 +207,26 @@ class FileManager:
                 f.read(1024)  # Read first 1KB to test
         except Exception as e:
             raise ValueError(f"File is not readable: {e}")
+        
+        return file_size
     
-    async def _extract_video_metadata(self, file_path: str, video_info: Dict) -> Dict[str, Any]:
+    async def _extract_video_metadata(
+        self,
+        file_path: str,
+        video_info: Dict,
+        format_info: Optional[Dict] = None
+    ) -> Dict[str, Any]:
         """Extract video metadata for Telegram attributes"""
         try:
             # Use video_info from downloader
             duration = video_info.get('duration', 0)
             
-            # Get dimensions from format info if available
-            width = 0
-            height = 0
+            # Get dimensions from the selected format, which is already in hand
+            width = (format_info or {}).get('width') or 0
+            height = (format_info or {}).get('height') or 0
             
-            # Try to get dimensions from video_info
-            if video_info.get('formats'):
+            # Otherwise fall back to the first format in video_info that has them
+            if not (width and height) and video_info.get('formats'):
                 for fmt in video_info['formats']:
                     if fmt.get('width') and fmt.get('height'):
                         width = fmt['width']
@@ -233,7 +244,29 @@ class FileManager:
             logger.warning(f"Failed to extract video metadata: {e}")
             return {'duration': 0, 'width': 0, 'height': 0, 'supports_streaming': True}
     
-    async def _generate_thumbnail(self, file_path: str, video_info: Dict) -> Optional[str]:
+    async def fetch_thumbnail(self, video_info: Dict) -> Optional[bytes]:
+        """Download the source thumbnail (can run while the video itself is downloading)"""
+        thumbnail_url = video_info.get('thumbnail')
+        if not thumbnail_url:
+            return None
+        
+        try:
+            import aiohttp
+            timeout = aiohttp.ClientTimeout(total=10)
+            async with get_http_session().get(thumbnail_url, timeout=timeout) as response:
+                if response.status == 200:
+                    return await response.read()
+        except Exception as e:
+            logger.warning(f"Failed to fetch thumbnail: {e}")
+        
+        return None
+    
+    async def _generate_thumbnail(
+        self,
+        file_path: str,
+        video_info: Dict,
+        thumbnail_data: Optional[bytes] = None
+    ) -> Optional[str]:
         """Generate thumbnail for video files"""
         try:
             # Check if it's a video file
@@ -241,25 +274,18 @@ class FileManager:
             if file_ext not in ['.mp4', '.avi', '.mkv', '.mov', '.webm', '.flv']:
                 return None
             
-            # Use thumbnail from video info if available
-            thumbnail_url = video_info.get('thumbnail')
-            if not thumbnail_url:
+            # Use the prefetched thumbnail, or download it from video info now
+            if thumbnail_data is None:
+                thumbnail_data = await self.fetch_thumbnail(video_info)
+            if not thumbnail_data:
                 return None
             
-            # Download thumbnail
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                timeout = aiohttp.ClientTimeout(total=10)
-                async with session.get(thumbnail_url, timeout=timeout) as response:
-                    if response.status == 200:
-                        thumbnail_data = await response.read()
-                        
-                        # Save thumbnail
-                        thumbnail_path = file_path + '.thumb.jpg'
-                        with open(thumbnail_path, 'wb') as f:
-                            f.write(thumbnail_data)
-                        
-                        return thumbnail_path
+            # Save thumbnail
+            thumbnail_path = file_path + '.thumb.jpg'
+            with open(thumbnail_path, 'wb') as f:
+                f.write(thumbnail_data)
+            
+            return thumbnail_path
             
         except Exception as e:
             logger.warning(f"Failed to generate thumbnail: {e}")
@@ -268,29 +294,34 @@ class FileManager:
     
     def _create_upload_progress_callback(self, task_id: str, total_size: int):
         """Create progress callback for upload tracking"""
+        # Bind everything the per-chunk callback needs once, outside the hot path
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        update_progress = self.progress_tracker.update_upload_progress
+        schedule = asyncio.run_coroutine_threadsafe
+        now = time.time
+        upload_info = self.active_uploads.get(task_id)
+        start_time = upload_info['start_time'] if upload_info else now()
+        step = max(total_size // 100, 1)  # Report to the tracker at most once per 1%
+        last_reported = -step
+        
         def progress_callback(current: int, total: int):
-            # Update progress tracker safely from thread
-            try:
-                # Try to get the running loop
+            nonlocal last_reported
+            
+            # Update progress tracker only when progress advanced enough
+            if loop is not None and (current - last_reported >= step or current >= total):
+                last_reported = current
                 try:
-                    loop = asyncio.get_running_loop()
-                    # Schedule the coroutine to run in the event loop
-                    asyncio.run_coroutine_threadsafe(
-                        self.progress_tracker.update_upload_progress(
-                            task_id, current, total, "Uploading..."
-                        ), loop
-                    )
-                except RuntimeError:
-                    # No running loop, skip progress update
-                    pass
-            except Exception as e:
-                # Silently handle progress update errors
-                logger.debug(f"Upload progress update error: {e}")
+                    schedule(update_progress(task_id, current, total, "Uploading..."), loop)
+                except Exception as e:
+                    # Silently handle progress update errors
+                    logger.debug("Upload progress update error: %s", e)
             
             # Update active uploads
-            if task_id in self.active_uploads:
-                upload_info = self.active_uploads[task_id]
-                elapsed_time = time.time() - upload_info['start_time']
+            if upload_info is not None:
+                elapsed_time = now() - start_time
                 speed = current / elapsed_time if elapsed_time > 0 else 0
                 
                 upload_info.update({
@@ -465,36 +496,15 @@ class FileManager:
     async def cleanup_temp_directory(self, max_age_hours: int = 1):
         """Clean up old files in temporary directory"""
         try:
-            current_time = time.time()
-            max_age_seconds = max_age_hours * 3600
-            cleaned_files = 0
-            freed_space = 0
-            
             temp_dir = Path(settings.TEMP_DIR)
             if not temp_dir.exists():
                 return {'cleaned_files': 0, 'freed_space': 0}
             
-            for file_path in temp_dir.rglob('*'):
-                if file_path.is_file():
-                    try:
-                        file_age = current_time - file_path.stat().st_ctime
-                        if file_age > max_age_seconds:
-                            file_size = file_path.stat().st_size
-                            file_path.unlink()
-                            cleaned_files += 1
-                            freed_space += file_size
-                            logger.debug(f"🗑️ Cleaned up old file: {file_path}")
-                    except Exception as e:
-                        logger.warning(f"Failed to clean up file {file_path}: {e}")
-            
-            # Remove empty directories
-            for dir_path in temp_dir.rglob('*'):
-                if dir_path.is_dir() and not any(dir_path.iterdir()):
-                    try:
-                        dir_path.rmdir()
-                        logger.debug(f"🗑️ Removed empty directory: {dir_path}")
-                    except Exception as e:
-                        logger.warning(f"Failed to remove directory {dir_path}: {e}")
+            # The directory walk and unlinks are blocking syscalls; run them off the event loop
+            loop = asyncio.get_running_loop()
+            cleaned_files, freed_space = await loop.run_in_executor(
+                None, self._sweep_temp_directory, str(temp_dir), time.time() - max_age_hours * 3600
+            )
             
             logger.info(f"✅ Cleanup completed: {cleaned_files} files, {format_file_size(freed_space)} freed")
             
@@ -508,6 +518,35 @@ class FileManager:
             logger.error(f"❌ Cleanup failed: {e}")
             return {'cleaned_files': 0, 'freed_space': 0}
     
+    @staticmethod
+    def _sweep_temp_directory(root: str, cutoff: float) -> Tuple[int, int]:
+        """Remove files older than cutoff and empty directories under root (blocking)"""
+        cleaned_files = 0
+        freed_space = 0
+        
+        # Bottom-up so directories emptied by this sweep are removed in the same pass
+        for dir_path, dir_names, file_names in os.walk(root, topdown=False):
+            for name in file_names:
+                file_path = os.path.join(dir_path, name)
+                try:
+                    stat = os.stat(file_path)
+                    if stat.st_ctime < cutoff:
+                        os.unlink(file_path)
+                        cleaned_files += 1
+                        freed_space += stat.st_size
+                        logger.debug(f"🗑️ Cleaned up old file: {file_path}")
+                except Exception as e:
+                    logger.warning(f"Failed to clean up file {file_path}: {e}")
+            
+            if dir_path != root:
+                try:
+                    os.rmdir(dir_path)
+                    logger.debug(f"🗑️ Removed empty directory: {dir_path}")
+                except OSError:
+                    pass  # Directory not empty
+        
+        return cleaned_files, freed_space
+    
     async def get_upload_history(self, user_id: Optional[int] = None, limit: int = 10) -> List[Dict]:
         """Get upload history for user or all users"""
         history = self.upload_history.copy()
@@ -534,7 +573,7 @@ class FileManager:
             'temp_directory_files': temp_dir_stats['file_count'],
             'chunk_size': self.chunk_size,
             'max_file_size': self.max_file_size,
-            'max_file_size_str': format_file_size(self.max_file_size)
+            'max_file_size_str': self.max_file_size_str
         }
     
     async def _get_temp_directory_stats(self) -> Dict[str, Any]:
@@ -606,13 +645,14 @@ class FileManager:
             logger.error(f"❌ Failed to get ultra performance stats: {e}")
             return await self.get_performance_stats()  # Fallback to basic stats
 
-    async def _ultra_optimize_file(self, file_path: str, video_info: Dict) -> str:
+    async def _ultra_optimize_file(self, file_path: str, video_info: Dict, file_size: Optional[int] = None) -> str:
         """Ultra-optimize file for fastest upload possible"""
         try:
             if not self.upload_optimization_enabled:
                 return file_path
             
-            file_size = os.path.getsize(file_path)
+            if file_size is None:
+                file_size = os.path.getsize(file_path)
             file_ext = os.path.splitext(file_path)[1].lower()
             
             # Only optimize large video files
@@ -0,0 +1,220 @@
+"""
+Tests for the callback download/upload pipeline
+"""
+
+import asyncio
+import importlib.util
+import unittest
+from types import SimpleNamespace
+
+_MISSING = [
+    name for name in ("telegram", "telethon", "asyncpg", "sqlalchemy", "redis", "aiohttp", "yt_dlp", "psutil")
+    if importlib.util.find_spec(name) is None
+]
+
+if not _MISSING:
+    # Import through core.bot first, as main.py does; importing handlers directly hits the services/core import cycle
+    import core.bot  # noqa: F401
+    from handlers.callbacks import CallbackHandlers, DownloadStatus, UserDownload, _UPLOAD_BANNER_MIN_BYTES
+
+
+class FakeQuery:
+    """Callback query double that records message edits"""
+
+    def __init__(self, data: str = ""):
+        self.id = "q1"
+        self.data = data
+        self.edits = []
+        self.message = SimpleNamespace(message_id=1, chat_id=100, chat=SimpleNamespace(username="uploads"))
+
+    async def answer(self, text=None, **kwargs):
+        return True
+
+    async def edit_message_text(self, text, **kwargs):
+        self.edits.append((text, kwargs))
+
+
+class FakeDownloader:
+    """Downloader double returning a fixed download result"""
+
+    def __init__(self, file_size: int):
+        self.file_size = file_size
+
+    async def download_video(self, url, format_id, user_id, is_audio):
+        return {
+            'task_id': 'task_1',
+            'file_path': '/tmp/song.mp3',
+            'file_size': self.file_size,
+            'average_speed': 2048,
+            'download_time': 1.5,
+        }
+
+    async def cancel_download(self, task_id):
+        return False
+
+
+class FakeFileManager:
+    """File manager double returning a fixed upload result"""
+
+    def __init__(self):
+        self.uploads = []
+
+    async def upload_to_telegram(self, **kwargs):
+        self.uploads.append(kwargs)
+        return {'upload_time': 0.5, 'average_speed': 4096}
+
+    async def cancel_upload(self, task_id):
+        return False
+
+
+@unittest.skipIf(_MISSING, f"missing dependencies: {', '.join(_MISSING)}")
+class DownloadPipelineTests(unittest.IsolatedAsyncioTestCase):
+    """End-to-end runs of _perform_download_and_upload with stubbed services"""
+
+    async def _run_pipeline(self, file_size: int):
+        file_manager = FakeFileManager()
+        handlers = CallbackHandlers(FakeDownloader(file_size), file_manager, None, None, None)
+        video_info = {
+            'title': 'Song title',
+            'platform': 'youtube',
+            'original_url': 'https://youtu.be/abc',
+            'formats': [],
+            'audio_formats': [],
+        }
+        handlers.remember_video_info('abc', video_info)
+        query = FakeQuery()
+
+        await handlers._perform_download_and_upload(
+            query, 42, video_info, {'format_id': '140', 'quality': '128kbps'}, True
+        )
+        await handlers.stop()
+        return query, file_manager, handlers
+
+    async def test_small_file_goes_straight_to_completion(self):
+        query, file_manager, handlers = await self._run_pipeline(_UPLOAD_BANNER_MIN_BYTES - 1)
+
+        self.assertEqual(len(file_manager.uploads), 1)
+        self.assertEqual(len(query.edits), 1)
+        self.assertIn("Download Completed!", query.edits[0][0])
+        self.assertNotIn(42, handlers.user_downloads)
+
+    async def test_large_file_shows_upload_banner_first(self):
+        query, file_manager, _ = await self._run_pipeline(_UPLOAD_BANNER_MIN_BYTES)
+
+        self.assertEqual(len(query.edits), 2)
+        self.assertIn("Upload Starting", query.edits[0][0])
+        self.assertIn("Download Completed!", query.edits[1][0])
+
+
+@unittest.skipIf(_MISSING, f"missing dependencies: {', '.join(_MISSING)}")
+class CancelActionTests(unittest.IsolatedAsyncioTestCase):
+    """cancel_<task_id> must stop the pipeline that owns the task, not the user's latest one"""
+
+    async def test_cancel_leaves_newer_queued_pipeline_running(self):
+        handlers = CallbackHandlers(FakeDownloader(0), FakeFileManager(), None, None, None)
+        owner = asyncio.create_task(asyncio.sleep(60))
+        queued = asyncio.create_task(asyncio.sleep(60))
+        handlers.user_downloads[42] = UserDownload(
+            query=None, video_info={}, selected_format={}, is_audio=False,
+            download_result={'task_id': 'task_1'}, task=owner
+        )
+        handlers._download_tasks[42] = queued
+
+        query = FakeQuery("cancel_task_1")
+        update = SimpleNamespace(callback_query=query, effective_user=SimpleNamespace(id=42))
+        await handlers.handle_cancel_action(update, None, suffix="task_1")
+        await asyncio.sleep(0)
+
+        self.assertTrue(owner.cancelled())
+        self.assertFalse(queued.done())
+        self.assertIs(handlers._download_tasks[42], queued)
+        self.assertIn("cancelled successfully", query.edits[-1][0])
+        queued.cancel()
+
+
+class BlockingDownloader(FakeDownloader):
+    """Downloader double whose downloads never finish on their own"""
+
+    async def download_video(self, url, format_id, user_id, is_audio):
+        await asyncio.Event().wait()
+
+
+@unittest.skipIf(_MISSING, f"missing dependencies: {', '.join(_MISSING)}")
+class StopTests(unittest.IsolatedAsyncioTestCase):
+    """stop() must shut down every pipeline, including ones replaced in the per-user lookup"""
+
+    async def test_stop_cancels_both_pipelines_of_one_user(self):
+        handlers = CallbackHandlers(BlockingDownloader(0), FakeFileManager(), None, None, None)
+        # One slot, so the second pipeline waits in the queue behind the first
+        handlers._pipeline_semaphore = asyncio.Semaphore(1)
+        video_info = {'title': 'Song title', 'platform': 'youtube', 'original_url': 'https://youtu.be/abc'}
+        handlers.remember_video_info('abc', video_info)
+        selected_format = {'format_id': '140', 'quality': '128kbps', 'ext': 'm4a', 'file_size_str': '3 MB'}
+
+        await handlers._start_download_process(FakeQuery(), 42, video_info, selected_format, True)
+        first = handlers._download_tasks[42]
+        await handlers._start_download_process(FakeQuery(), 42, video_info, selected_format, True)
+        second = handlers._download_tasks[42]
+        await asyncio.sleep(0)
+
+        self.assertIsNot(first, second)
+        await handlers.stop()
+
+        self.assertTrue(first.cancelled())
+        self.assertTrue(second.cancelled())
+        self.assertFalse(handlers._active_tasks)
+
+
+@unittest.skipIf(_MISSING, f"missing dependencies: {', '.join(_MISSING)}")
+class EditThrottleTests(unittest.IsolatedAsyncioTestCase):
+    """Progress edits go out at once, then at most once per edit_interval per chat message"""
+
+    async def test_first_edit_immediate_then_latest_after_interval(self):
+        handlers = CallbackHandlers(FakeDownloader(0), FakeFileManager(), None, None, None)
+        handlers.edit_interval = 0.05
+        query = FakeQuery()
+
+        handlers._queue_edit(query, "10%")
+        await asyncio.sleep(0)
+        handlers._queue_edit(query, "20%")
+        handlers._queue_edit(query, "30%")
+        await asyncio.sleep(0)
+        self.assertEqual([text for text, _ in query.edits], ["10%"])
+
+        await asyncio.sleep(0.2)
+        self.assertEqual([text for text, _ in query.edits], ["10%", "30%"])
+        self.assertFalse(handlers._edit_flushers)
+
+    async def test_same_message_id_in_other_chat_is_not_coalesced(self):
+        handlers = CallbackHandlers(FakeDownloader(0), FakeFileManager(), None, None, None)
+        first, second = FakeQuery(), FakeQuery()
+        second.message.chat_id = 200
+
+        handlers._queue_edit(first, "first chat")
+        handlers._queue_edit(second, "second chat")
+        await asyncio.sleep(0)
+
+        self.assertEqual([text for text, _ in first.edits], ["first chat"])
+        self.assertEqual([text for text, _ in second.edits], ["second chat"])
+        await handlers.stop()
+
+
+@unittest.skipIf(_MISSING, f"missing dependencies: {', '.join(_MISSING)}")
+class PipelineStatsTests(unittest.TestCase):
+    """get_pipeline_stats feeds the system_stats sampler"""
+
+    def test_counts_pipelines_by_stage(self):
+        handlers = CallbackHandlers(FakeDownloader(0), FakeFileManager(), None, None, None)
+        for user_id, status in ((1, DownloadStatus.DOWNLOADING), (2, DownloadStatus.UPLOADING), (3, DownloadStatus.DOWNLOADING)):
+            handlers.user_downloads[user_id] = UserDownload(
+                query=None, video_info={}, selected_format={}, is_audio=False, status=status
+            )
+        handlers._queued_pipelines = 2
+
+        self.assertEqual(handlers.get_pipeline_stats(), {
+            'active_users': 3, 'active_downloads': 2, 'active_uploads': 1, 'queue_size': 2
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
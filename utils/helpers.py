@@ -4,6 +4,7 @@ Common functions used across the application
 """
 
 import asyncio
+import contextlib
 import hashlib
 import logging
 import os
@@ -14,10 +15,17 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Union
 from pathlib import Path
-import json
+
+import aiohttp
+import orjson
+
+from static.icons import Icons
 
 logger = logging.getLogger(__name__)
 
+# Process-wide HTTP session, created on first use inside the running loop
+_http_session: Optional[aiohttp.ClientSession] = None
+
 def generate_task_id() -> str:
     """Generate unique task ID for tracking downloads/uploads"""
     timestamp = str(int(time.time() * 1000))
@@ -105,13 +113,9 @@ def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
 def get_file_hash(file_path: str, algorithm: str = 'md5') -> str:
     """Get file hash for deduplication"""
     try:
-        hash_obj = hashlib.new(algorithm)
-        
+        # file_digest reads into one reused buffer instead of allocating a bytes object per chunk
         with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                hash_obj.update(chunk)
-        
-        return hash_obj.hexdigest()
+            return hashlib.file_digest(f, algorithm).hexdigest()
         
     except Exception as e:
         logger.error(f"Failed to calculate hash for {file_path}: {e}")
@@ -123,7 +127,7 @@ def serialize_for_cache(data: Any) -> str:
         if isinstance(data, (str, int, float, bool)):
             return str(data)
         else:
-            return json.dumps(data, default=str, ensure_ascii=False)
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
     except Exception as e:
         logger.error(f"Failed to serialize data for cache: {e}")
         return str(data)
@@ -132,8 +136,8 @@ def deserialize_from_cache(data: str) -> Any:
     """Deserialize data from Redis cache"""
     try:
         # Try to parse as JSON first
-        return json.loads(data)
-    except (json.JSONDecodeError, TypeError):
+        return orjson.loads(data)
+    except (orjson.JSONDecodeError, TypeError):
         # Return as string if JSON parsing fails
         return data
 
@@ -170,7 +174,6 @@ def get_system_stats() -> Dict[str, Any]:
 
 def create_welcome_message(first_name: str = None) -> str:
     """Create personalized welcome message"""
-    from static.icons import Icons
     
     name = first_name if first_name else "there"
     
@@ -197,7 +200,6 @@ Just send me any video URL and I'll handle the rest!
 
 def create_error_message(error: Exception) -> str:
     """Create user-friendly error message"""
-    from static.icons import Icons
     
     error_type = type(error).__name__
     error_str = str(error)
@@ -223,6 +225,12 @@ def create_error_message(error: Exception) -> str:
     else:
         return f"{Icons.ERROR} An unexpected error occurred. Please try again or contact support."
 
+def is_message_not_modified(error: Exception) -> bool:
+    """Check for Telegram's benign "message is not modified" edit error"""
+    from telegram.error import BadRequest
+    
+    return isinstance(error, BadRequest) and 'not modified' in str(error).lower()
+
 def create_format_selection_keyboard(video_info: Dict, video_id: str):
     """Create inline keyboard for format selection"""
     from telegram import InlineKeyboardButton
@@ -247,83 +255,73 @@ def create_format_selection_keyboard(video_info: Dict, video_id: str):
     
     return keyboard
 
+# Progress-message pieces resolved once; the function runs on every progress tick
+_DOWNLOAD_ANIMATION = Icons.DOWNLOAD_ANIMATION
+_UPLOAD_ANIMATION = Icons.UPLOAD_ANIMATION
+_PROGRESS_STATUS_CONFIGS = {
+    # status: (icon, title, color); None icons are animated per tick
+    'downloading': (None, 'تحميل جاري', '🟦'),
+    'uploading': (None, 'رفع جاري', '🟨'),
+    'completed': (Icons.PARTY, 'تم بنجاح!', '🟩'),
+    'failed': (Icons.ERROR, 'فشل', '🟥'),
+    'cancelled': (Icons.STOP, 'ملغي', '⬜'),
+}
+_MOTIVATIONAL_STEPS = (
+    (25, f"{Icons.ROCKET} البداية دائماً صعبة!"),
+    (50, f"{Icons.MUSCLE} نصف الطريق! استمر!"),
+    (75, f"{Icons.FIRE} الأمور تسير بشكل رائع!"),
+    (95, f"{Icons.LIGHTNING} تقريباً انتهينا!"),
+)
+_MOTIVATIONAL_LAST = f"{Icons.MAGIC} اللمسة الأخيرة..."
+_PROGRESS_MESSAGE_TMPL = f"""
+{{color}} <b>{{icon}} {{title}}</b>
+
+{Icons.VIDEO} <b>العنوان:</b> {{video_title}}
+{Icons.MAGIC} <b>التقدم:</b> {{current_str}} / {{total_str}}
+
+{{progress_bar}}
+
+{Icons.TURBO} <b>السرعة:</b> {{speed_str}}
+{Icons.CLOCK} <b>الوقت المتبقي:</b> {{eta_str}}
+
+{{motivational}}
+    """
+
 def create_download_progress_message(progress: Dict, video_info: Dict) -> str:
     """Create animated formatted download progress message"""
-    from static.icons import Icons
-    import time
-    
-    title = truncate_text(video_info.get('title', 'Unknown'), 45)
-    current_str = progress.get('current_str', '0 B')
-    total_str = progress.get('total_str', '0 B')
     percentage = progress.get('percentage', 0)
-    speed_str = progress.get('speed_str', '0 B/s')
-    eta_str = progress.get('eta_str', 'Unknown')
-    progress_bar = progress.get('progress_bar', '[░░░░░░░░░░] 0.0%')
     status = progress.get('status', 'unknown')
-    task_id = progress.get('task_id', '')
     
     # Animated status icons based on current status
-    status_configs = {
-        'downloading': {
-            'icon': Icons.DOWNLOAD_ANIMATION[int(time.time()) % len(Icons.DOWNLOAD_ANIMATION)],
-            'title': 'تحميل جاري',
-            'color': '🟦'
-        },
-        'uploading': {
-            'icon': Icons.UPLOAD_ANIMATION[int(time.time()) % len(Icons.UPLOAD_ANIMATION)],
-            'title': 'رفع جاري',
-            'color': '🟨'
-        },
-        'completed': {
-            'icon': Icons.PARTY,
-            'title': 'تم بنجاح!',
-            'color': '🟩'
-        },
-        'failed': {
-            'icon': Icons.ERROR,
-            'title': 'فشل',
-            'color': '🟥'
-        },
-        'cancelled': {
-            'icon': Icons.STOP,
-            'title': 'ملغي',
-            'color': '⬜'
-        }
-    }
-    
-    config = status_configs.get(status, {
-        'icon': Icons.PROGRESS,
-        'title': status.title(),
-        'color': '⬜'
-    })
+    icon, status_title, color = _PROGRESS_STATUS_CONFIGS.get(status, (Icons.PROGRESS, None, '⬜'))
+    if status_title is None:
+        status_title = status.title()
+    if status == 'downloading':
+        icon = _DOWNLOAD_ANIMATION[int(time.time()) % len(_DOWNLOAD_ANIMATION)]
+    elif status == 'uploading':
+        icon = _UPLOAD_ANIMATION[int(time.time()) % len(_UPLOAD_ANIMATION)]
     
     # Add motivational messages for different percentages
     motivational = ""
     if status == 'downloading' and percentage > 0:
-        if percentage < 25:
-            motivational = f"{Icons.ROCKET} البداية دائماً صعبة!"
-        elif percentage < 50:
-            motivational = f"{Icons.MUSCLE} نصف الطريق! استمر!"
-        elif percentage < 75:
-            motivational = f"{Icons.FIRE} الأمور تسير بشكل رائع!"
-        elif percentage < 95:
-            motivational = f"{Icons.LIGHTNING} تقريباً انتهينا!"
-        else:
-            motivational = f"{Icons.MAGIC} اللمسة الأخيرة..."
-    
-    return f"""
-{config['color']} <b>{config['icon']} {config['title']}</b>
-
-{Icons.VIDEO} <b>العنوان:</b> {title}
-{Icons.MAGIC} <b>التقدم:</b> {current_str} / {total_str}
-
-{progress_bar}
-
-{Icons.TURBO} <b>السرعة:</b> {speed_str}
-{Icons.CLOCK} <b>الوقت المتبقي:</b> {eta_str}
-
-{motivational}
-    """
+        motivational = _MOTIVATIONAL_LAST
+        for limit, message in _MOTIVATIONAL_STEPS:
+            if percentage < limit:
+                motivational = message
+                break
+    
+    return _PROGRESS_MESSAGE_TMPL.format(
+        color=color,
+        icon=icon,
+        title=status_title,
+        video_title=truncate_text(video_info.get('title', 'Unknown'), 45),
+        current_str=progress.get('current_str', '0 B'),
+        total_str=progress.get('total_str', '0 B'),
+        progress_bar=progress.get('progress_bar', '[░░░░░░░░░░] 0.0%'),
+        speed_str=progress.get('speed_str', '0 B/s'),
+        eta_str=progress.get('eta_str', 'Unknown'),
+        motivational=motivational
+    )
 
 def setup_logging():
     """Setup logging configuration"""
@@ -441,6 +439,28 @@ async def run_with_timeout(coro, timeout: float):
     except asyncio.TimeoutError:
         raise TimeoutError(f"Operation timed out after {timeout} seconds")
 
+def get_http_session() -> aiohttp.ClientSession:
+    """Get the shared keep-alive HTTP session (cookie-less, so requests stay independent)"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=60),
+            cookie_jar=aiohttp.DummyCookieJar()
+        )
+    return _http_session
+
+@contextlib.asynccontextmanager
+async def shared_http_session():
+    """Borrow the shared HTTP session in an async with block without closing it afterwards"""
+    yield get_http_session()
+
+async def close_http_session():
+    """Close the shared HTTP session on shutdown"""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
 def chunks(lst: List, n: int):
     """Yield successive n-sized chunks from list"""
     for i in range(0, len(lst), n):
@@ -466,7 +486,6 @@ def safe_float(value: Any, default: float = 0.0) -> float:
 
 def create_progress_bar(percentage: float, length: int = 20, filled: str = '█', empty: str = '░', animated: bool = True) -> str:
     """Create animated visual progress bar"""
-    from static.icons import Icons
     import time
     
     filled_length = int(length * percentage / 100)
@@ -135,6 +135,12 @@ SUPPORTED_PLATFORMS = {
     )
 }
 
+# Domain -> platform lookup built once; first platform listing a domain wins
+_DOMAIN_TO_PLATFORM: Dict[str, str] = {}
+for _name, _info in SUPPORTED_PLATFORMS.items():
+    for _domain in _info.base_domains:
+        _DOMAIN_TO_PLATFORM.setdefault(_domain, _name)
+
 def is_valid_url(url: str) -> bool:
     """
     Validate if the provided string is a valid URL
@@ -201,18 +207,12 @@ def get_platform_from_url(url: str) -> Optional[str]:
         elif domain.startswith('m.'):
             domain = domain[2:]
         
-        # Check each platform
-        for platform_name, platform_info in SUPPORTED_PLATFORMS.items():
-            # Check domain match
-            for base_domain in platform_info.base_domains:
-                if domain == base_domain or domain.endswith('.' + base_domain):
-                    # Verify with URL patterns
-                    for pattern in platform_info.url_patterns:
-                        if re.search(pattern, url, re.IGNORECASE):
-                            return platform_name
-                    
-                    # If domain matches but no specific pattern, still return platform
-                    return platform_name
+        # Single pass over the domain suffixes (sub.example.com -> example.com -> com)
+        while domain:
+            platform_name = _DOMAIN_TO_PLATFORM.get(domain)
+            if platform_name:
+                return platform_name
+            domain = domain.partition('.')[2]
         
         return None
         